@@ -0,0 +1,158 @@
+"""Load test for the reading cadence of concurrent tossups.
+
+Plays N tossups at once with `play_tossup`, each in its own fake channel, and checks that every
+one of them keeps revealing at the configured reading speed (5 words every 0.8 seconds by
+default). One more game is played alongside them, where the player buzzes early and then sits on
+the answer window until it times out, so a reader or buzz lock shared between channels shows up
+as stalled reveals in all the other games.
+
+Run from the repository root:
+
+    python bench/cadence.py --games 1 10 100 500
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "bot"))
+
+from exts.tossup import Tossup  # noqa: E402
+from lib.consts import READING_SPEED  # noqa: E402
+from lib.editor import EditScheduler  # noqa: E402
+from lib.prepared import PreparedTossup  # noqa: E402
+from lib.router import MessageRouter  # noqa: E402
+from lib.ticker import RevealTicker  # noqa: E402
+from simulate import FakeChannel, FakeContext, FakeUser, ScaledLoop, StubQBReader  # noqa: E402
+
+
+class Bot:
+    """The parts of the bot `play_tossup` uses."""
+
+    def __init__(self, speed: float):
+        self.router = MessageRouter()
+        self.editor = EditScheduler(per=5 / speed)  # the bucket refills in real time
+        self.ticker = RevealTicker()
+
+
+class Recorder:
+    """Record when each reveal of a game shows up, standing in for a channel listener."""
+
+    def __init__(self, run: "Run", channel: FakeChannel, player: FakeUser, stall: bool):
+        self.run = run
+        self.channel = channel
+        self.player = player
+        self.stall = stall
+        self.last: tuple[float, int] | None = None
+        self.reveals = 0
+
+    def put_nowait(self, event: tuple) -> None:  # noqa: D102
+        kind, _, title, description, now = event
+        if title != "Tossup" or kind != "edit" or description is None:
+            return
+
+        self.reveals += 1
+        if self.stall and self.reveals == 2:  # buzz, then never answer
+            self.run.loop.call_soon(self.channel.say, self.player, "buzz")
+
+        words = len(description.split())
+        if not self.stall and self.last is not None and words > self.last[1]:
+            expected = (words - self.last[1]) / self.run.speed
+            self.run.intervals.append(now - self.last[0])
+            self.run.lateness.append(now - self.last[0] - expected)
+        self.last = (now, words)
+
+
+class Run:
+    """A cadence run with a number of concurrent games.
+
+    Parameters
+    ----------
+        args : `argparse.Namespace`
+            Command line arguments.
+        loop : `ScaledLoop`
+            The loop the games run on.
+        games : `int`
+            Number of games to play at once.
+    """
+
+    def __init__(self, args: argparse.Namespace, loop: ScaledLoop, games: int):
+        self.args = args
+        self.loop = loop
+        self.games = games
+        self.bot = Bot(args.speed)
+        self.speed = READING_SPEED
+        self.edit_latency = args.edit_latency
+        self.send_latency = args.send_latency
+        self.intervals: list[float] = []
+        self.lateness: list[float] = []
+
+    async def run(self) -> dict:
+        """Play every game to the end and summarize the reveal intervals."""
+        stub = StubQBReader(random.Random(self.args.seed), self.args.words)
+        cog = Tossup(self.bot)
+        games = []
+        for i in range(self.games + 1):
+            channel = FakeChannel(self, 10 + i)
+            player = FakeUser(1000 + i)
+            channel.listeners.append(Recorder(self, channel, player, stall=i == 0))
+            tossup = await PreparedTossup.prepare(stub.tossup())
+            games.append(cog.play_tossup(FakeContext(channel, player, "tu"), tossup))
+
+        await asyncio.gather(*games)
+        cog.cog_unload()
+        self.bot.ticker.close()
+
+        expected = 5 / self.speed
+        cuts = statistics.quantiles(self.intervals, n=20, method="inclusive")
+        return {
+            "games": self.games,
+            "expected_interval": round(expected, 3),
+            "interval_p50": round(cuts[9], 3),
+            "interval_p95": round(cuts[18], 3),
+            "interval_max": round(max(self.intervals), 3),
+            "late_reveals": sum(late > self.args.tolerance for late in self.lateness),
+            "reveals": len(self.intervals),
+        }
+
+
+def main() -> None:  # noqa: D103
+    parser = argparse.ArgumentParser(description="check the reveal cadence of concurrent games")
+    parser.add_argument("--games", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--words", type=int, default=80, help="words per tossup")
+    parser.add_argument("--speed", type=float, default=10.0, help="game seconds per real second")
+    parser.add_argument(
+        "--tolerance", type=float, default=0.2, help="seconds a reveal can be late by"
+    )
+    parser.add_argument("--edit-latency", type=float, default=0.05, help="fake edit time (s)")
+    parser.add_argument("--send-latency", type=float, default=0.05, help="fake send time (s)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    results = []
+    for games in args.games:
+        loop = ScaledLoop(args.speed)
+        try:
+            results.append(loop.run_until_complete(Run(args, loop, games).run()))
+        finally:
+            loop.close()
+
+    if args.json:
+        print(json.dumps(results))
+        return
+
+    print("  ".join(f"{key:>17}" for key in results[0]))
+    for result in results:
+        print("  ".join(f"{value:>17}" for value in result.values()))
+
+    if any(result["late_reveals"] for result in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""Benchmark of parsing categories and aliases.
+
+Compares `parse_subcats` with the version it replaced, which scanned every alias of every
+category for each word and searched the list of all aliases to join multi-word ones. Both parse
+every category and alias one at a time, then every category and alias in a single argument list,
+leaving out the few aliases the old version couldn't parse.
+The new resolver is timed both without and with its memo.
+
+Run from the repository root:
+
+    python bench/categories.py
+"""
+
+import argparse
+import json
+import os
+import sys
+import timeit
+
+os.environ.setdefault("TOKEN", "benchmark")  # lib.consts exits without one
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "bot"))
+
+from lib.consts import ALIASES, ALL_ALIASES, CATEGORIES, SUBCATEGORIES  # noqa: E402
+from lib.utils import _resolve_subcats, parse_subcats  # noqa: E402
+
+
+def parse_subcats_scan(subcats: list[str]) -> list[str]:
+    """Parse categories the way `parse_subcats` did before the alias map and trie."""
+    for index, cat in enumerate(subcats):  # join together strings that are aliases
+        try:
+            while (
+                expanded_cat := " ".join([cat] + subcats[index + 1 : index + 2])  # noqa: E203
+            ) in ALL_ALIASES:
+                cat = expanded_cat
+                subcats.pop(index + 1)
+        except IndexError:
+            pass
+        subcats[index] = cat
+
+    def parse(s: str) -> list[str]:  # replace aliases with actual names
+        for cat, aliases in ALIASES.items():
+            if s.lower().replace(" ", "") == cat.lower().replace(" ", "") or s.lower().replace(
+                " ", ""
+            ) in [alias.lower().replace(" ", "") for alias in aliases]:
+                # maximum matching, ignores spaces and casing
+                if cat in CATEGORIES:
+                    return SUBCATEGORIES[cat]
+                else:
+                    return [cat]
+        raise ValueError(f"Invalid category: {s}")
+
+    return sorted(set(sum(map(parse, subcats), [])))
+
+
+def vocabulary() -> list[list[str]]:
+    """Get every category and alias as the words a user would type.
+
+    Category names are typed without spaces, multi-word names weren't joined before the trie.
+    """
+    return [[name.replace(" ", "")] for name in ALIASES] + [
+        alias.split(" ") for alias in ALL_ALIASES
+    ]
+
+
+def main() -> None:  # noqa: D103
+    parser = argparse.ArgumentParser(description="time parsing categories and aliases")
+    parser.add_argument("--number", type=int, default=200, help="runs per measurement")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    words = []
+    for argv in vocabulary():
+        try:
+            expected = parse_subcats_scan(list(argv))
+        except ValueError:  # e.g. "vis fine art", "vis fine" isn't an alias to join on
+            continue
+        assert parse_subcats(list(argv)) == expected, argv
+        words.append(argv)
+    everything = [word for argv in words for word in argv]
+
+    resolve = _resolve_subcats.__wrapped__  # without the memo
+    cases = {
+        "each alias": (
+            lambda: [parse_subcats_scan(list(argv)) for argv in words],
+            lambda: [resolve(tuple(argv)) for argv in words],
+            lambda: [parse_subcats(argv) for argv in words],
+        ),
+        "all at once": (
+            lambda: parse_subcats_scan(list(everything)),
+            lambda: resolve(tuple(everything)),
+            lambda: parse_subcats(everything),
+        ),
+    }
+
+    results = []
+    for case, funcs in cases.items():
+        calls = len(words) if case == "each alias" else 1
+        times = [timeit.timeit(f, number=args.number) / args.number / calls for f in funcs]
+        results.append(
+            {
+                "case": case,
+                "scan_us": round(times[0] * 1e6, 2),
+                "resolver_us": round(times[1] * 1e6, 2),
+                "memoized_us": round(times[2] * 1e6, 2),
+                "speedup": round(times[0] / times[1], 1),
+            }
+        )
+
+    if args.json:
+        print(json.dumps(results))
+        return
+
+    print(f"{len(words)} categories and aliases, {len(everything)} words, per parse:")
+    print("  ".join(f"{key:>12}" for key in results[0]))
+    for result in results:
+        print("  ".join(f"{value:>12}" for value in result.values()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""Microbenchmark of message dispatch to waiting games.
+
+Compares `MessageRouter.dispatch` with how `bot.wait_for` listeners were dispatched, where
+discord.py runs the check of every pending listener on every message. Every session waits on a
+buzz from its player and on the session's `end` poll, and the messages dispatched are chat in
+the sessions' channels that no listener accepts, so nothing is resolved and every run sees the
+same listeners.
+
+Run from the repository root:
+
+    python bench/dispatch.py --sessions 10 100 1000 10000
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "bot"))
+
+from lib.router import MessageRouter  # noqa: E402
+from simulate import FakeMessage, FakeUser  # noqa: E402
+
+PREFIX = ">"
+
+
+class Channel:
+    """Stand-in for a text channel, only its ID is used."""
+
+    def __init__(self, id: int):
+        self.id = id
+
+
+def wait_for_listeners(sessions: int, loop: asyncio.AbstractEventLoop) -> list:
+    """Build the listeners `bot.wait_for` used to keep, in the order discord.py checks them."""
+    listeners = []
+    for i in range(sessions):
+        channel, player = Channel(10 + i), FakeUser(1000 + i)
+
+        def buzz(message, channel=channel, player=player):
+            return message.channel == channel and message.author == player
+
+        def end(message, channel=channel, player=player):
+            return (
+                message.channel == channel
+                and message.author == player
+                and message.content == f"{PREFIX}end"
+            )
+
+        listeners.append((loop.create_future(), buzz))
+        listeners.append((loop.create_future(), end))
+    return listeners
+
+
+def dispatch_wait_for(listeners: list, message: FakeMessage) -> None:
+    """Dispatch a message the way discord.py dispatches to `wait_for` listeners."""
+    removed = []
+    for i, (future, check) in enumerate(listeners):
+        if future.cancelled():
+            removed.append(i)
+            continue
+        if check(message):
+            future.set_result(message)
+            removed.append(i)
+    for i in reversed(removed):
+        del listeners[i]
+
+
+async def router_listeners(sessions: int) -> tuple[MessageRouter, list[asyncio.Task]]:
+    """Start every session's waits on a router."""
+    router = MessageRouter()
+    waits = []
+    for i in range(sessions):
+        channel, player = Channel(10 + i), FakeUser(1000 + i)
+        waits.append(asyncio.create_task(router.wait_for(channel, player)))
+        waits.append(
+            asyncio.create_task(
+                router.wait_for(
+                    channel, player, check=lambda message: message.content == f"{PREFIX}end"
+                )
+            )
+        )
+    await asyncio.sleep(0)  # let every wait register
+    return router, waits
+
+
+async def measure(sessions: int, number: int) -> dict:
+    """Time dispatching chat messages with a number of sessions waiting."""
+    loop = asyncio.get_running_loop()
+    spectator = FakeUser(1)
+    messages = [
+        FakeMessage(Channel(10 + i % sessions), spectator, "nice buzz") for i in range(number)
+    ]
+
+    listeners = wait_for_listeners(sessions, loop)
+    chat = iter(messages * 2)
+    wait_for = timeit.timeit(lambda: dispatch_wait_for(listeners, next(chat)), number=number)
+
+    router, waits = await router_listeners(sessions)
+    chat = iter(messages * 2)
+    routed = timeit.timeit(lambda: router.dispatch(next(chat)), number=number)
+    assert len(router) == 2 * sessions  # nothing was resolved
+
+    for wait in waits:
+        wait.cancel()
+    await asyncio.gather(*waits, return_exceptions=True)
+
+    return {
+        "sessions": sessions,
+        "wait_for_us": round(wait_for / number * 1e6, 2),
+        "router_us": round(routed / number * 1e6, 2),
+    }
+
+
+async def run(args: argparse.Namespace) -> list[dict]:  # noqa: D103
+    return [await measure(sessions, args.number) for sessions in args.sessions]
+
+
+def main() -> None:  # noqa: D103
+    parser = argparse.ArgumentParser(description="time dispatching a message to waiting games")
+    parser.add_argument("--sessions", type=int, nargs="+", default=[10, 100, 1000, 10000])
+    parser.add_argument("--number", type=int, default=2000, help="messages per measurement")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+
+    if args.json:
+        print(json.dumps(results))
+        return
+
+    print(f"{'sessions':>10}{'wait_for (us)':>16}{'router (us)':>14}")
+    for result in results:
+        print(f"{result['sessions']:>10}{result['wait_for_us']:>16}{result['router_us']:>14}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+"""Memory benchmark of the client profiles.
+
+Feeds the gateway events a bot in a few large guilds receives into discord.py's connection
+state, set up with each profile from `lib.profiles`, and measures what ends up cached. Nothing
+connects to Discord: the guilds are a synthetic fixture of members, presences and chat, and
+events are only fed in if the profile's intents would have Discord send them.
+
+Guilds are added with every member already in them, as they are once chunking has finished.
+
+Run from the repository root:
+
+    python bench/memory.py --guilds 5 --members 5000 --messages 2000
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import os
+import sys
+import tracemalloc
+
+os.environ.setdefault("TOKEN", "benchmark")  # lib.consts exits without one
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "bot"))
+
+import discord  # noqa: E402
+from lib.profiles import PROFILES, client_options  # noqa: E402
+
+BOT_ID = 10**17
+GUILD_ID = 10**18
+JOINED_AT = "2020-01-01T00:00:00+00:00"
+
+
+def user_payload(i: int) -> dict:
+    """Get a user, the bot itself is user 0."""
+    return {
+        "id": str(BOT_ID + i),
+        "username": f"user{i}",
+        "discriminator": "0",
+        "global_name": None,
+        "avatar": None,
+    }
+
+
+def presence_payload(guild_id: int, i: int, status: str = "online") -> dict:
+    """Get a member's presence, playing something on desktop."""
+    return {
+        "guild_id": str(guild_id),
+        "user": {"id": str(BOT_ID + i)},
+        "status": status,
+        "activities": [{"name": f"game {i % 50}", "type": 0}],
+        "client_status": {"desktop": status},
+    }
+
+
+def guild_payload(n: int, members: int, channels: int, intents: discord.Intents) -> dict:
+    """Get a GUILD_CREATE for a synthetic guild, as Discord would send it with some intents.
+
+    Members other than the bot are only included with the members intent, and presences only
+    with the presences intent.
+    """
+    guild_id = GUILD_ID + n * 1000
+    return {
+        "id": str(guild_id),
+        "name": f"guild {n}",
+        "icon": None,
+        "owner_id": str(BOT_ID + 1),
+        "member_count": members,
+        "large": members > 250,
+        "features": [],
+        "emojis": [],
+        "stickers": [],
+        "threads": [],
+        "voice_states": [],
+        "mfa_level": 0,
+        "verification_level": 0,
+        "explicit_content_filter": 0,
+        "default_message_notifications": 0,
+        "system_channel_flags": 0,
+        "premium_tier": 0,
+        "nsfw_level": 0,
+        "preferred_locale": "en-US",
+        "premium_progress_bar_enabled": False,
+        "roles": [
+            {
+                "id": str(guild_id),
+                "name": "@everyone",
+                "permissions": "0",
+                "position": 0,
+                "color": 0,
+                "hoist": False,
+                "managed": False,
+                "mentionable": False,
+            }
+        ],
+        "channels": [
+            {
+                "id": str(guild_id + 1 + c),
+                "guild_id": str(guild_id),
+                "type": 0,
+                "name": f"channel-{c}",
+                "position": c,
+                "permission_overwrites": [],
+            }
+            for c in range(channels)
+        ],
+        "members": [
+            {
+                "user": user_payload(i),
+                "roles": [],
+                "joined_at": JOINED_AT,
+                "deaf": False,
+                "mute": False,
+                "flags": 0,
+            }
+            for i in range(members if intents.members else 1)
+        ],
+        "presences": (
+            [presence_payload(guild_id, i) for i in range(1, members)] if intents.presences else []
+        ),
+    }
+
+
+def message_payload(guild: dict, n: int, members: int) -> dict:
+    """Get a MESSAGE_CREATE of chat in one of a guild's channels."""
+    author = 1 + n % (members - 1)
+    return {
+        "id": str(int(guild["id"]) * 10 + n),
+        "guild_id": guild["id"],
+        "channel_id": guild["channels"][n % len(guild["channels"])]["id"],
+        "author": user_payload(author),
+        "member": {
+            "roles": [],
+            "joined_at": JOINED_AT,
+            "deaf": False,
+            "mute": False,
+            "flags": 0,
+        },
+        "content": f"message {n} with some words in it",
+        "timestamp": JOINED_AT,
+        "edited_timestamp": None,
+        "tts": False,
+        "mention_everyone": False,
+        "mentions": [],
+        "mention_roles": [],
+        "attachments": [],
+        "embeds": [],
+        "pinned": False,
+        "type": 0,
+    }
+
+
+async def measure(profile: str, args: argparse.Namespace) -> dict:
+    """Measure what a client with a profile keeps after the fixture's events."""
+    options = client_options(profile)
+    intents = options["intents"]
+    client = discord.Client(**options)
+    state = client._connection
+    state.user = discord.ClientUser(state=state, data=user_payload(0))
+
+    guilds = [guild_payload(n, args.members, args.channels, intents) for n in range(args.guilds)]
+    # discord.py keeps parts of payloads in them, so events are made as they're fed in and
+    # dropped after, like the gateway's
+    messages = (
+        message_payload(guild, n, args.members) for guild in guilds for n in range(args.messages)
+    )
+    presences = (
+        presence_payload(int(guild["id"]), 1 + n % (args.members - 1), "idle")
+        for guild in guilds
+        for n in range(args.messages)
+    )
+
+    tracemalloc.start()
+    results = {"profile": profile}
+    baseline = tracemalloc.get_traced_memory()[0]
+
+    for guild in guilds:
+        state._add_guild_from_data(guild)
+    results["guilds_kib"] = round((tracemalloc.get_traced_memory()[0] - baseline) / 1024)
+
+    if intents.guild_messages:
+        for message in messages:
+            state.parse_message_create(message)
+    if intents.presences:
+        for presence in presences:
+            state.parse_presence_update(presence)
+
+    gc.collect()  # messages nothing kept are garbage, but in reference cycles
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    results["total_kib"] = round((current - baseline) / 1024)
+    results["peak_kib"] = round((peak - baseline) / 1024)
+    results["cached_members"] = sum(len(guild.members) for guild in client.guilds)
+    results["cached_messages"] = len(client.cached_messages)
+
+    await client.close()
+    return results
+
+
+async def run(args: argparse.Namespace) -> list[dict]:  # noqa: D103
+    return [await measure(profile, args) for profile in args.profiles]
+
+
+def main() -> None:  # noqa: D103
+    parser = argparse.ArgumentParser(description="compare the memory of the client profiles")
+    parser.add_argument("--profiles", nargs="+", choices=PROFILES, default=list(PROFILES))
+    parser.add_argument("--guilds", type=int, default=5)
+    parser.add_argument("--members", type=int, default=5000, help="members per guild")
+    parser.add_argument("--channels", type=int, default=20, help="text channels per guild")
+    parser.add_argument("--messages", type=int, default=2000, help="messages per guild")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+
+    if args.json:
+        print(json.dumps(results))
+        return
+
+    print("  ".join(f"{key:>15}" for key in results[0]))
+    for result in results:
+        print("  ".join(f"{value:>15}" for value in result.values()))
+
+
+if __name__ == "__main__":
+    main()
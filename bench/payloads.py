@@ -0,0 +1,154 @@
+"""Benchmark of the work done on every tossup reveal.
+
+Compares revealing prepared tossups, which patch the description of one shared embed, with how
+`play_tossup` used to reveal them: a new embed with its footer set for every reveal, from lines
+generated when the tossup was fetched. Each reveal is handed to a fake edit that keeps what it's
+given, so the objects a reveal allocates are still around to be counted by `tracemalloc`.
+
+Work that only happens once per tossup, when it's fetched, is measured separately from the
+reveals. Old reveals show lines that were all generated up front, so their text is counted
+there instead.
+
+Run from the repository root:
+
+    python bench/payloads.py --tossups 200 --words 150
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+os.environ.setdefault("TOKEN", "benchmark")  # lib.consts exits without one
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "bot"))
+
+import discord  # noqa: E402
+from lib.consts import C_NEUTRAL  # noqa: E402
+from lib.prepared import PreparedTossup  # noqa: E402
+from reveal import generate_lines  # noqa: E402
+from simulate import StubQBReader  # noqa: E402
+
+
+def prepare_old(tossup: dict) -> tuple[list[str], str]:
+    """Do what `play_tossup` used to do once per tossup."""
+    lines = generate_lines(tossup["question"], 5)
+    footer = " | ".join(
+        [
+            tossup["setName"],
+            f"Packet {tossup['packetNumber']}",
+            f"Tossup {tossup['questionNumber']}",
+            f"Difficulty {tossup['difficulty']}",
+        ]
+    )
+    return lines, footer
+
+
+def reveal_old(prepared: tuple[list[str], str], sent: list) -> None:
+    """Reveal a tossup the way `play_tossup` used to."""
+    lines, footer = prepared
+    can_power = True
+    for part in lines:
+        embed = discord.Embed(title="Tossup", description=part, color=C_NEUTRAL)
+        embed = embed.set_footer(text=footer)
+        sent.append((embed, embed.description))
+        if can_power and "*" in part and not part.endswith("(*)"):
+            can_power = False
+
+
+def reveal_new(tossup: PreparedTossup, sent: list) -> None:
+    """Reveal a tossup the way `Tossup.read_tossup` does."""
+    can_power = True
+    text = tossup.text
+    for end in tossup.reveals:
+        on_power_mark = text.endswith("(*)", 0, end)
+        embed = tossup.show(end)
+        sent.append((embed, embed.description))
+        if can_power and -1 < tossup.star < end and not on_power_mark:
+            can_power = False
+
+
+async def allocated(func) -> tuple[object, int, int]:
+    """Await a function and get what it returned and the blocks and bytes it left allocated."""
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    result = await func()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    diff = after.compare_to(before, "lineno")
+    blocks = sum(stat.count_diff for stat in diff if stat.count_diff > 0)
+    size = sum(stat.size_diff for stat in diff if stat.size_diff > 0)
+    return result, blocks, size
+
+
+async def run(args: argparse.Namespace) -> list[dict]:
+    """Measure both ways on the same generated tossups."""
+    stub = StubQBReader(random.Random(args.seed), args.words)
+    tossups = [stub.tossup() for _ in range(args.tossups)]
+    await PreparedTossup.prepare(tossups[0])  # start the markdown worker threads up front
+
+    async def prepare_all_old():
+        return [prepare_old(tossup) for tossup in tossups]
+
+    async def prepare_all_new():
+        return [await PreparedTossup.prepare(tossup) for tossup in tossups]
+
+    results = []
+    for name, prepare_all, reveal in (
+        ("per-reveal embeds", prepare_all_old, reveal_old),
+        ("prepared", prepare_all_new, reveal_new),
+    ):
+        prepared, prepare_blocks, prepare_size = await allocated(prepare_all)
+
+        sent = []
+
+        async def reveal_all():
+            for tossup in prepared:
+                reveal(tossup, sent)
+
+        _, blocks, size = await allocated(reveal_all)
+        reveals = len(sent)
+
+        sent.clear()
+        start = time.perf_counter()
+        await reveal_all()
+        elapsed = time.perf_counter() - start
+
+        results.append(
+            {
+                "reveals": name,
+                "blocks_per_reveal": round(blocks / reveals, 1),
+                "bytes_per_reveal": round(size / reveals),
+                "us_per_reveal": round(elapsed / reveals * 1e6, 2),
+                "blocks_per_tossup": round(prepare_blocks / len(tossups), 1),
+                "bytes_per_tossup": round(prepare_size / len(tossups)),
+            }
+        )
+    return results
+
+
+def main() -> None:  # noqa: D103
+    parser = argparse.ArgumentParser(description="count what each tossup reveal allocates")
+    parser.add_argument("--tossups", type=int, default=200)
+    parser.add_argument("--words", type=int, default=150, help="words per tossup")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+
+    if args.json:
+        print(json.dumps(results))
+        return
+
+    print("  ".join(f"{key:>18}" for key in results[0]))
+    for result in results:
+        print("  ".join(f"{value:>18}" for value in result.values()))
+
+
+if __name__ == "__main__":
+    main()
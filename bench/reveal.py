@@ -0,0 +1,92 @@
+"""Benchmark of working out tossup reveals.
+
+Compares `reveal_offsets` with the `generate_lines` it replaced, which rebuilt every reveal from
+a list of words and kept all of them alive for the whole tossup. Both are timed on generated
+tossups of college length and longer, with the power mark a bit past the middle. `lines_kib` is
+how much text the old lines kept alive per tossup, offsets only take a few bytes per reveal.
+
+Run from the repository root:
+
+    python bench/reveal.py --words 150 250 500 1000
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import timeit
+
+os.environ.setdefault("TOKEN", "benchmark")  # lib.consts exits without one
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "bot"))
+
+from lib.prepared import reveal_offsets  # noqa: E402
+from simulate import WORDS  # noqa: E402
+
+
+def generate_lines(text: str, chunk_size: int, watch_power: bool = True) -> list[str]:
+    """Reveal a tossup the way `Tossup.generate_lines` did before `reveal_offsets`."""
+    words = text.strip().replace("\n", " ").split(" ")
+    chunks = []
+    seen_power = False
+
+    for i in range(0, len(words), chunk_size):
+        next_read = words[: i + chunk_size]
+
+        if watch_power and not seen_power and "(*)" in next_read:
+            if not next_read[-1].endswith("(*)"):
+                power_chunk = next_read[: next_read.index("(*)") + 1]
+                chunks.append(" ".join(power_chunk))
+
+            seen_power = True
+
+        chunks.append(" ".join(next_read))
+
+    return chunks
+
+
+def tossup(rng: random.Random, words: int) -> str:
+    """Generate a tossup with the power mark 60% of the way through."""
+    text = rng.choices(WORDS, k=words)
+    text.insert(int(words * 0.6), "(*)")
+    return " ".join(text)
+
+
+def measure(rng: random.Random, words: int, number: int) -> dict:
+    """Time both on a tossup of some length."""
+    text = tossup(rng, words)
+    assert [text[:end] for end in reveal_offsets(text, 5)] == generate_lines(text, 5)
+
+    lines = timeit.timeit(lambda: generate_lines(text, 5), number=number)
+    offsets = timeit.timeit(lambda: reveal_offsets(text, 5), number=number)
+    return {
+        "words": words,
+        "generate_lines_us": round(lines / number * 1e6, 1),
+        "reveal_offsets_us": round(offsets / number * 1e6, 1),
+        "speedup": round(lines / offsets, 1),
+        "lines_kib": round(sum(len(line) for line in generate_lines(text, 5)) / 1024, 1),
+    }
+
+
+def main() -> None:  # noqa: D103
+    parser = argparse.ArgumentParser(description="time working out tossup reveals")
+    parser.add_argument("--words", type=int, nargs="+", default=[150, 250, 500, 1000])
+    parser.add_argument("--number", type=int, default=500, help="runs per measurement")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    results = [measure(rng, words, args.number) for words in args.words]
+
+    if args.json:
+        print(json.dumps(results))
+        return
+
+    print("  ".join(f"{key:>17}" for key in results[0]))
+    for result in results:
+        print("  ".join(f"{value:>17}" for value in result.values()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,494 @@
+"""Headless load simulator for tk and mtk sessions.
+
+Runs the real tossup cog against fake Discord channels and a stub qbreader server on localhost,
+with simulated players buzzing, answering and ending sessions. Nothing connects to Discord or
+qbreader, so it runs anywhere the bot's dependencies are installed.
+
+Game time can be sped up: the event loop's clock and selector are scaled, so every sleep and
+timeout in the bot (reveals, buzz windows, answer timeouts) runs `--speed` times faster while the
+code under test is unchanged. Timings are reported in game seconds, and CPU time spent in the bot
+counts `--speed` times more than it would in a real game, so a faster run is a harsher one.
+
+Run from the repository root:
+
+    python bench/simulate.py --mode tk --sessions 50 --tossups 3
+    python bench/simulate.py --mode mtk --sessions 10 --players 4 --json
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import random
+import selectors
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+os.environ.setdefault("TOKEN", "simulator")  # lib.consts exits without one
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "bot"))
+
+import discord  # noqa: E402
+import lib.api  # noqa: E402
+from aiohttp import web  # noqa: E402
+from discord.utils import snowflake_time, time_snowflake  # noqa: E402
+from exts.tossup import Tossup  # noqa: E402
+from lib.api import QBReaderClient  # noqa: E402
+from lib.consts import READING_SPEED  # noqa: E402
+from lib.editor import EditScheduler  # noqa: E402
+from lib.router import MessageRouter  # noqa: E402
+from lib.stats import StatsStore  # noqa: E402
+from lib.ticker import RevealTicker  # noqa: E402
+
+PREFIX = ">"
+RESULTS = ("Power", "Correct", "Neg", "Incorrect, DT")  # tk results
+FINAL_RESULTS = ("Power by", "Correct by", "Dead Tossup")  # mtk results that end a tossup
+WORDS = "the this these author novel element war king composer painting equation".split()
+
+
+class ScaledSelector(selectors.DefaultSelector):
+    """Selector that waits `speed` times less than asked."""
+
+    def __init__(self, speed: float):
+        super().__init__()
+        self.speed = speed
+
+    def select(self, timeout=None):  # noqa: D102
+        return super().select(None if timeout is None else timeout / self.speed)
+
+
+class ScaledLoop(asyncio.SelectorEventLoop):
+    """Event loop whose clock runs `speed` times faster than real time."""
+
+    def __init__(self, speed: float):
+        super().__init__(ScaledSelector(speed))
+        self.speed = speed
+        self._epoch = time.monotonic()
+
+    def time(self) -> float:  # noqa: D102
+        return self._epoch + (time.monotonic() - self._epoch) * self.speed
+
+
+_ids = itertools.count()
+
+
+def snowflake() -> int:
+    """Get a unique snowflake for the current time, increasing like Discord's."""
+    return time_snowflake(datetime.now(timezone.utc)) + next(_ids) % 4096
+
+
+class FakeUser:
+    """Stand-in for `discord.User`."""
+
+    def __init__(self, id: int):
+        self.id = id
+        self.mention = f"<@{id}>"
+        self.display_name = f"player{id}"
+        self.bot = False
+
+
+class FakeMessage:
+    """Stand-in for `discord.Message`, sent either by the bot or by a player."""
+
+    def __init__(self, channel: "FakeChannel", author: FakeUser | None, content: str = ""):
+        self.id = snowflake()
+        self.channel = channel
+        self.author = author
+        self.content = content
+
+    @property
+    def created_at(self) -> datetime:  # noqa: D102
+        return snowflake_time(self.id)
+
+    async def edit(self, embed: discord.Embed | None = None, **_) -> None:  # noqa: D102
+        await asyncio.sleep(self.channel.sim.edit_latency)
+        self.channel.emit("edit", self, embed)
+
+
+class FakeChannel:
+    """Stand-in for a text channel, recording everything the bot sends to it."""
+
+    def __init__(self, sim: "Simulation", id: int):
+        self.sim = sim
+        self.id = id
+        self.listeners: list[asyncio.Queue] = []
+
+    def emit(self, kind: str, message: FakeMessage, embed: discord.Embed | None) -> None:
+        """Pass a message the bot sent or edited on to the players watching the channel."""
+        # embeds are reused between edits, so only what they show right now is passed on
+        title = embed.title if embed is not None else None
+        description = embed.description if embed is not None else None
+        for queue in self.listeners:
+            queue.put_nowait((kind, message, title, description, self.sim.loop.time()))
+
+    async def send(self, content=None, *, embed=None, **_) -> FakeMessage:  # noqa: D102
+        await asyncio.sleep(self.sim.send_latency)
+        message = FakeMessage(self, None, content or "")
+        self.emit("send", message, embed)
+        return message
+
+    def say(self, player: FakeUser, content: str) -> None:
+        """Send a message as a player, as if it came in through the gateway."""
+        self.sim.bot.router.dispatch(FakeMessage(self, player, content))
+
+
+class FakeContext:
+    """Stand-in for `discord.ext.commands.Context` of a command sent in a fake channel."""
+
+    def __init__(self, channel: FakeChannel, author: FakeUser, command: str):
+        self.channel = channel
+        self.author = author
+        self.prefix = PREFIX
+        self.message = FakeMessage(channel, author, f"{PREFIX}{command}")
+
+    async def send(self, *args, **kwargs) -> FakeMessage:  # noqa: D102
+        return await self.channel.send(*args, **kwargs)
+
+
+class StubQBReader:
+    """Local HTTP server answering the qbreader endpoints the games use."""
+
+    def __init__(self, rng: random.Random, words: int):
+        self.rng = rng
+        self.words = words
+        self._ids = itertools.count()
+        self._runner: web.AppRunner | None = None
+
+    def tossup(self) -> dict:  # noqa: D102
+        n = next(self._ids)
+        words = [f"id{n}"] + self.rng.choices(WORDS, k=self.words - 1)
+        words.insert(int(self.words * self.rng.uniform(0.4, 0.7)), "(*)")
+        return {
+            "question": " ".join(words),
+            "answer": f"answer {n}",
+            "formatted_answer": f"<b><u>answer {n}</u></b>",
+            "category": "Science",
+            "subcategory": "Physics",
+            "setName": "Simulated Set",
+            "packetNumber": 1,
+            "questionNumber": n,
+            "difficulty": 5,
+        }
+
+    async def random_tossup(self, request: web.Request) -> web.Response:  # noqa: D102
+        number = int(request.query.get("number", 1))
+        return web.json_response({"tossups": [self.tossup() for _ in range(number)]})
+
+    async def check_answer(self, request: web.Request) -> web.Response:  # noqa: D102
+        # exact answers never get here, the local checker accepts them
+        return web.json_response({"directive": "reject", "directedPrompt": None})
+
+    async def start(self) -> str:
+        """Start the server and get its base URL."""
+        app = web.Application()
+        app.router.add_get("/random-tossup", self.random_tossup)
+        app.router.add_get("/check-answer", self.check_answer)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        host, port = self._runner.addresses[0][:2]
+        return f"http://{host}:{port}"
+
+    async def close(self) -> None:  # noqa: D102
+        await self._runner.cleanup()
+
+
+class Bot:
+    """The parts of the bot the cogs use, wired up the same way as in `__main__`."""
+
+    def __init__(self, speed: float, stats_path: str):
+        self.api = QBReaderClient()
+        self.router = MessageRouter()
+        self.editor = EditScheduler(per=5 / speed)  # the bucket refills in real time
+        self.ticker = RevealTicker()
+        self.stats = StatsStore(stats_path)
+
+
+class Simulation:
+    """A load simulation run.
+
+    Parameters
+    ----------
+        args : `argparse.Namespace`
+            Command line arguments.
+        loop : `ScaledLoop`
+            The loop the simulation runs on.
+    """
+
+    def __init__(self, args: argparse.Namespace, loop: ScaledLoop):
+        self.args = args
+        self.rng = random.Random(args.seed)
+        self.loop = loop
+        self.edit_latency = args.edit_latency
+        self.send_latency = args.send_latency
+        self.speed = args.reading_speed or READING_SPEED
+        self.command_args = (f"{args.reading_speed}wps",) if args.reading_speed else ()
+
+        self.bot: Bot | None = None
+        self.tossups = 0
+        self.reveal_intervals: list[float] = []
+        self.reveal_jitter: list[float] = []
+        self.verdict_latencies: list[float] = []
+        self.memory_samples: list[int] = []
+
+    def _record_reveal(
+        self, last: dict | None, message: FakeMessage, shown: str, now: float
+    ) -> None:
+        # only count reveals that follow each other, `last` is None while someone is answering so
+        # edits that were already on their way and the final edit aren't counted
+        if last is None:
+            return
+        words = len(shown.split())
+        if message.id in last and words > last[message.id][1]:
+            interval = now - last[message.id][0]
+            self.reveal_intervals.append(interval)
+            self.reveal_jitter.append(abs(interval - (words - last[message.id][1]) / self.speed))
+        last[message.id] = (now, words)
+
+    def _buzz_point(self, description: str) -> tuple[int | None, str]:
+        # which reveal to buzz on (None never buzzes) and what to answer
+        answer = f"answer {description.split()[0][2:]}"
+        if self.rng.random() < self.args.dead_rate:
+            return None, answer
+        buzz_at = self.rng.randint(1, self.args.words // 5)
+        if self.rng.random() >= self.args.accuracy:
+            answer = "something wrong"
+        return buzz_at, answer
+
+    async def _react(self) -> None:
+        await asyncio.sleep(self.rng.uniform(0.5, 1.5) * self.args.reaction)
+
+    async def tk_player(self, channel: FakeChannel, player: FakeUser, events: asyncio.Queue):
+        """Play a tk session as a single player until `--tossups` tossups have been read."""
+        last_reveal = {}
+        reveals = 0
+        buzz_at, answer = None, ""
+        answered_at = None
+        played = 0
+
+        while True:
+            kind, message, title, description, now = await events.get()
+
+            if title == "Tossup" and kind == "send":
+                reveals = 0
+                last_reveal = {}
+                buzz_at = None
+            elif title == "Tossup" and kind == "edit":
+                self._record_reveal(last_reveal, message, description, now)
+                reveals += 1
+                if reveals == 1:
+                    buzz_at, answer = self._buzz_point(description)
+                if reveals == buzz_at:
+                    await self._react()
+                    channel.say(player, "buzz")
+            elif title == "Buzz":
+                last_reveal = None
+                await self._react()
+                answered_at = self.loop.time()
+                channel.say(player, answer)
+            elif title in RESULTS:
+                if answered_at is not None:
+                    self.verdict_latencies.append(now - answered_at)
+                answered_at = None
+                self.tossups += 1
+                played += 1
+                if played >= self.args.tossups:
+                    channel.say(player, f"{PREFIX}end")
+            elif title == "Session Stats":
+                return
+
+    async def mtk_players(
+        self, channel: FakeChannel, players: list[FakeUser], events: asyncio.Queue
+    ):
+        """Play an mtk session with several players until `--tossups` tossups have been read."""
+        last_reveal = {}
+        reveals = 0
+        plans: dict[int, tuple[int | None, str]] = {}
+        locked_out: set[int] = set()
+        answered_at: dict[int, float] = {}
+        played = 0
+
+        async def buzz(player: FakeUser) -> None:
+            await self._react()
+            channel.say(player, "buzz")
+
+        buzzes: set[asyncio.Task] = set()
+        try:
+            while True:
+                kind, message, title, description, now = await events.get()
+
+                if title == "Tossup" and kind == "send":
+                    reveals = 0
+                    last_reveal = {}
+                    plans.clear()
+                    locked_out.clear()
+                elif title == "Tossup" and kind == "edit":
+                    self._record_reveal(last_reveal, message, description, now)
+                    reveals += 1
+                    if reveals == 1:
+                        plans = {p.id: self._buzz_point(description) for p in players}
+                    for player in players:
+                        if (
+                            player.id not in locked_out
+                            and plans.get(player.id, (None,))[0] == reveals
+                        ):
+                            task = asyncio.create_task(buzz(player))
+                            buzzes.add(task)
+                            task.add_done_callback(buzzes.discard)
+                elif title == "Buzz":
+                    last_reveal = None
+                    player = next(p for p in players if p.mention in description)
+                    await self._react()
+                    answered_at[player.id] = self.loop.time()
+                    channel.say(player, plans[player.id][1])
+                elif title == "Incorrect":
+                    last_reveal = {}
+                    player = next(p for p in players if p.mention in description)
+                    locked_out.add(player.id)
+                    if player.id in answered_at:
+                        self.verdict_latencies.append(now - answered_at.pop(player.id))
+                elif title is not None and title.startswith(FINAL_RESULTS):
+                    if answered_at and title != "Dead Tossup":
+                        self.verdict_latencies.append(now - answered_at.popitem()[1])
+                    answered_at.clear()
+                    self.tossups += 1
+                    played += 1
+                    if played >= self.args.tossups:
+                        channel.say(players[0], f"{PREFIX}end")
+                elif title == "Session Stats":
+                    return
+        finally:  # players still waiting to buzz when the session ends
+            for task in buzzes:
+                task.cancel()
+
+    async def sample_memory(self) -> None:
+        """Sample traced memory once per game second."""
+        while True:
+            self.memory_samples.append(tracemalloc.get_traced_memory()[0])
+            await asyncio.sleep(1)
+
+    async def run(self) -> dict:
+        """Run the simulation and collect its results."""
+        args = self.args
+        stub = StubQBReader(self.rng, args.words)
+        lib.api.QBREADER_API = await stub.start()
+
+        with tempfile.TemporaryDirectory() as tmp:
+            self.bot = Bot(args.speed, os.path.join(tmp, "stats.db"))
+            await self.bot.api.start()
+            await self.bot.stats.start()
+            cog = Tossup(self.bot)
+
+            if args.memory:
+                tracemalloc.start()
+                baseline = tracemalloc.get_traced_memory()[0]
+                sampler = asyncio.create_task(self.sample_memory())
+
+            players = iter(FakeUser(1000 + i) for i in itertools.count())
+            sessions = []
+            for i in range(args.sessions):
+                channel = FakeChannel(self, 10 + i)
+                events = asyncio.Queue()
+                channel.listeners.append(events)
+
+                if args.mode == "tk":
+                    player = next(players)
+                    ctx = FakeContext(channel, player, "tk")
+                    sessions.append(self.tk_player(channel, player, events))
+                    sessions.append(cog.tk.callback(cog, ctx, *self.command_args))
+                else:
+                    group = [next(players) for _ in range(args.players)]
+                    ctx = FakeContext(channel, group[0], "mtk")
+                    sessions.append(self.mtk_players(channel, group, events))
+                    sessions.append(cog.mtk.callback(cog, ctx, *self.command_args))
+
+            wall = time.perf_counter()
+            game = self.loop.time()
+            await asyncio.gather(*sessions)
+            wall = time.perf_counter() - wall
+            game = self.loop.time() - game
+
+            if args.memory:
+                sampler.cancel()
+                peak = max(self.memory_samples, default=baseline)
+                tracemalloc.stop()
+
+            cog.cog_unload()
+            await self.bot.stats.close()
+            await self.bot.api.close()
+        await stub.close()
+
+        def summary(values: list[float]) -> dict:
+            if len(values) < 2:
+                return {"p50": None, "p95": None, "max": max(values, default=None)}
+            cuts = statistics.quantiles(values, n=20, method="inclusive")
+            return {
+                "p50": round(cuts[9], 3),
+                "p95": round(cuts[18], 3),
+                "max": round(max(values), 3),
+            }
+
+        results = {
+            "mode": args.mode,
+            "sessions": args.sessions,
+            "speed": args.speed,
+            "reading_speed": self.speed,
+            "tossups": self.tossups,
+            "wall_seconds": round(wall, 2),
+            "game_seconds": round(game, 2),
+            "tossups_per_wall_second": round(self.tossups / wall, 2),
+            "reveal_interval": summary(self.reveal_intervals),
+            "reveal_jitter": summary(self.reveal_jitter),
+            "buzz_to_verdict": summary(self.verdict_latencies),
+            "api_requests": self.bot.api.requests_sent,
+            "api_coalesced": self.bot.api.requests_coalesced,
+        }
+        if args.memory:
+            results["memory_per_session_kib"] = round((peak - baseline) / args.sessions / 1024, 1)
+        return results
+
+
+def main() -> None:  # noqa: D103
+    parser = argparse.ArgumentParser(description="simulate tk and mtk sessions under load")
+    parser.add_argument("--mode", choices=("tk", "mtk"), default="tk")
+    parser.add_argument("--sessions", type=int, default=20, help="concurrent sessions")
+    parser.add_argument("--players", type=int, default=4, help="players per mtk session")
+    parser.add_argument("--tossups", type=int, default=3, help="tossups per session")
+    parser.add_argument("--words", type=int, default=80, help="words per tossup")
+    parser.add_argument("--speed", type=float, default=10.0, help="game seconds per real second")
+    parser.add_argument(
+        "--reading-speed", type=float, help="words per second (the configured speed by default)"
+    )
+    parser.add_argument("--reaction", type=float, default=0.4, help="player reaction time (s)")
+    parser.add_argument("--accuracy", type=float, default=0.7, help="chance a buzz is correct")
+    parser.add_argument("--dead-rate", type=float, default=0.1, help="chance to never buzz")
+    parser.add_argument("--edit-latency", type=float, default=0.05, help="fake edit time (s)")
+    parser.add_argument("--send-latency", type=float, default=0.05, help="fake send time (s)")
+    parser.add_argument("--memory", action="store_true", help="trace memory per session")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    loop = ScaledLoop(args.speed)
+    try:
+        results = loop.run_until_complete(Simulation(args, loop).run())
+    finally:
+        loop.close()
+
+    if args.json:
+        print(json.dumps(results))
+        return
+
+    for key, value in results.items():
+        if isinstance(value, dict):
+            value = "  ".join(f"{k} {v}" for k, v in value.items())
+        print(f"{key:<26}{value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,34 +7,92 @@ import random
 from datetime import datetime
 
 import discord
-from aiohttp import ClientSession
 from discord.ext import commands, tasks
-from discord.ext.commands import Bot, Context
-from lib.consts import C_ERROR, PREFIX, TOKEN
-
-intents = discord.Intents.default()
+from discord.ext.commands import AutoShardedBot, Context
+from lib.api import APIError, QBReaderClient
+from lib.consts import (
+    C_ERROR,
+    CLIENT_PROFILE,
+    METRICS_PORT,
+    PACKET_CACHE_PATH,
+    PREFIX,
+    PROFILER_THRESHOLD,
+    SET_INDEX_PATH,
+    SHARD_COUNT,
+    SHARD_PROCESSES,
+    STATS_PATH,
+    TOKEN,
+)
+from lib.editor import EditScheduler
+from lib.metrics import LISTENERS, MetricsServer
+from lib.packets import PacketCache
+from lib.profiler import LoopProfiler
+from lib.profiles import client_options
+from lib.router import MessageRouter
+from lib.sets import SetIndex
+from lib.shards import PROCESS_ENV, run_processes, shard_ids
+from lib.stats import StatsStore
+from lib.ticker import RevealTicker
+
+if SHARD_PROCESSES > 1 and PROCESS_ENV not in os.environ:
+    exit(run_processes(SHARD_PROCESSES))  # this process only supervises the shard processes
+
+bot = AutoShardedBot(
+    command_prefix=commands.when_mentioned_or(PREFIX),
+    **client_options(CLIENT_PROFILE),
+    shard_count=SHARD_COUNT,
+    shard_ids=shard_ids(int(os.environ[PROCESS_ENV]), SHARD_COUNT, SHARD_PROCESSES)
+    if PROCESS_ENV in os.environ
+    else None,
+)
+bot.api = QBReaderClient()
+bot.router = MessageRouter()
+bot.editor = EditScheduler()
+bot.ticker = RevealTicker()
+bot.stats = StatsStore(STATS_PATH)
+bot.packets = PacketCache(bot.api, PACKET_CACHE_PATH)
+# one process refreshes the set index for all of them, the others reload the file it saves
+bot.sets = SetIndex(bot.api, SET_INDEX_PATH, refresh=int(os.getenv(PROCESS_ENV, 0)) == 0)
+bot.metrics = (
+    MetricsServer(METRICS_PORT + int(os.getenv(PROCESS_ENV, 0))) if METRICS_PORT else None
+)
+bot.profiler = LoopProfiler(PROFILER_THRESHOLD) if PROFILER_THRESHOLD else None
+LISTENERS.labels().callback = lambda: len(bot.router)
+
+
+async def setup_hook() -> None:  # noqa: D103
+    # runs once before connecting, unlike on_ready which fires again on every reconnect
+    await bot.api.start()
+    print("loaded aiohttp session")
+    await bot.stats.start()
+    print("loaded stats database")
+    await bot.sets.start()
+    print("loaded set index")
+    if bot.metrics is not None:
+        await bot.metrics.start()
+        print(f"serving metrics on port {bot.metrics.port}")
+    if bot.profiler is not None:
+        bot.profiler.start()
+        print(f"watching for event loop stalls over {bot.profiler.threshold}s")
 
-intents.members = True
-intents.message_content = True
-intents.presences = True
 
-bot = Bot(command_prefix=commands.when_mentioned_or(PREFIX), intents=intents)
+bot.setup_hook = setup_hook
 
 
 @bot.event
 async def on_ready() -> None:  # noqa: D103
     # start processes
 
-    bot.session = ClientSession(loop=bot.loop)
     bot.start_time = datetime.utcnow()
-    print("loaded aiohttp session")
     print("-------------------")
     print(f"{bot.user.name}#{bot.user.discriminator}")
     print(f"discord.py {discord.__version__}")
     print(f"Python {platform.python_version()}")
     print(f"{platform.system()} {platform.release()} ({os.name})")
+    print(f"shards {sorted(bot.shards)} of {bot.shard_count}")
     print("-------------------")
-    status_task.start()
+    if not status_task.is_running():
+        status_task.start()
 
 
 @tasks.loop(minutes=1.0)
@@ -47,6 +105,7 @@ async def status_task() -> None:  # noqa: D103
 async def on_message(message: discord.Message) -> None:  # noqa: D103
     if message.author == bot.user or message.author.bot:
         return
+    bot.router.dispatch(message)
     await bot.process_commands(message)
 
 
@@ -72,6 +131,12 @@ async def on_command_error(context: Context, error) -> None:  # noqa: D103
         embed = discord.Embed(title="not owner", description="no", color=C_ERROR)
         await context.send(embed=embed)
 
+    elif isinstance(error, commands.CommandInvokeError) and isinstance(error.original, APIError):
+        embed = discord.Embed(
+            title="qbreader is not responding", description=str(error.original), color=C_ERROR
+        )
+        await context.send(embed=embed)
+
     elif isinstance(error, commands.CommandOnCooldown):
         minutes, seconds = divmod(error.retry_after, 60)
         hours, minutes = divmod(minutes, 60)
@@ -1,11 +1,14 @@
 """Developer commands."""
 
+import io
 import os
 
 import discord
 from discord.ext import commands
 from discord.ext.commands import Bot, Context
-from lib.consts import C_ERROR, C_SUCCESS
+from lib.consts import C_ERROR, C_NEUTRAL, C_SUCCESS
+from lib.profiler import sample
+from lib.utils import answer_cache
 
 
 class Admin(commands.Cog, name="admin and dev commands"):
@@ -20,12 +23,42 @@ class Admin(commands.Cog, name="admin and dev commands"):
     )
     @commands.is_owner()
     async def kill(self, ctx: Context) -> None:
-        """Close all HTTP sessions and end the bot process."""
+        """Close all HTTP sessions, save stats and end the bot process."""
         embed = discord.Embed(description="bot killed by owner", color=C_SUCCESS)
         await ctx.send(embed=embed)
-        await self.bot.session.close()
+        await self.bot.api.close()
+        await self.bot.stats.close()
+        await self.bot.sets.close()
+        answer_cache.close()
+        self.bot.ticker.close()
+        if self.bot.metrics is not None:
+            await self.bot.metrics.close()
+        if self.bot.profiler is not None:
+            self.bot.profiler.stop()
         await self.bot.close()
 
+    @commands.command(
+        name="profile",
+        description="profile the event loop",
+    )
+    @commands.is_owner()
+    async def profile(self, ctx: Context, seconds: float = 10) -> None:
+        """Sample the event loop for a while and send the stacks as a flamegraph-ready file."""
+        embed = discord.Embed(description=f"profiling for {seconds}s", color=C_NEUTRAL)
+        await ctx.send(embed=embed)
+
+        stacks = await sample(seconds)
+
+        embed = discord.Embed(title="Profile", color=C_SUCCESS)
+        embed.description = "collapsed stacks, open with speedscope or `flamegraph.pl`"
+        if (profiler := self.bot.profiler) is not None:
+            embed.add_field(name="Stalls", value=profiler.stalls)
+            embed.add_field(name="Max Lag", value=f"{round(profiler.max_lag * 1000, 1)}ms")
+
+        await ctx.send(
+            embed=embed, file=discord.File(io.BytesIO(stacks.encode()), "profile.folded")
+        )
+
     @commands.group(
         name="ext",
         description="manage extensions",
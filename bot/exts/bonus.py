@@ -3,9 +3,14 @@
 import discord
 from discord.ext import commands
 from discord.ext.commands import Bot, Context
-from lib.consts import C_ERROR, C_NEUTRAL, C_SUCCESS, QBREADER_API
+from lib.consts import C_ERROR, C_NEUTRAL, C_SUCCESS, CORPUS_PATH
+from lib.corpus import CorpusSource
+from lib.metrics import SESSIONS, record_first_question
+from lib.pool import QuestionPool
+from lib.prepared import PreparedBonus
+from lib.render import to_markdown
+from lib.sources import QuestionBuffer, QuestionSource
 from lib.utils import check_answer, generate_params
-from markdownify import markdownify as md
 
 
 class Bonus(commands.Cog, name="bonus commands"):
@@ -13,63 +18,43 @@ class Bonus(commands.Cog, name="bonus commands"):
 
     def __init__(self, bot: Bot):
         self.bot = bot
+        self.source: QuestionSource = (
+            CorpusSource(CORPUS_PATH, "bonuses")
+            if CORPUS_PATH
+            else QuestionPool(bot, "random-bonus", "bonuses")
+        )
+
+    def cog_unload(self) -> None:  # noqa: D102
+        self.source.close()
 
-    async def play_bonus(self, ctx: Context, params: dict) -> str | int:
+    async def play_bonus(self, ctx: Context, bonus: PreparedBonus) -> str | int:
         """Play a bonus question.
 
         Parameters
         ----------
             ctx : `discord.ext.commands.Context`
                 Message context.
-            params : `dict`
-                Parameters for the API request.
+            bonus : `PreparedBonus`
+                The bonus to play.
 
         Returns
         -------
             `str | int`
                 `"ended by user"` if the user ended the game, otherwise the number of points.
         """
-        async with self.bot.session.get(f"{QBREADER_API}/random-bonus", params=params) as r:
-            bonus = (await r.json())["bonuses"][0]
-
         points = 0
 
-        leadin = discord.Embed(
-            title=bonus["category"]
-            if bonus["category"] == bonus["subcategory"]
-            else " | ".join([bonus["category"], bonus["subcategory"]]),
-            description=bonus["leadin"],
-            color=C_NEUTRAL,
-        )
-
-        footer = [
-            bonus["setName"],
-            f"Packet {bonus['packetNumber']}",
-            f"Bonus {bonus['questionNumber']}",
-            f"Difficulty {bonus['difficulty']}",
-        ]
-
-        footer = " | ".join(footer)
-
-        leadin.set_footer(text=footer)
-        await ctx.send(embed=leadin)
-
-        try:
-            enum = enumerate(zip(bonus["parts"], bonus["formatted_answers"]), 1)
-        except KeyError:
-            enum = enumerate(zip(bonus["parts"], bonus["answers"]), 1)
-
-        for i, (q, a) in enum:
-            part = discord.Embed(title=str(i), description=q, color=C_NEUTRAL)
+        message = await ctx.send(embed=bonus.leadin)
+        record_first_question(ctx, message.created_at)
 
+        for part, a, answerline in zip(bonus.parts, bonus.answers, bonus.markdown):
             await ctx.send(embed=part)
 
             answer = (
-                await self.bot.wait_for(
-                    "message",
-                    check=lambda message: message.author == ctx.author
-                    and message.channel == ctx.channel
-                    and not message.content.startswith("_"),
+                await self.bot.router.wait_for(
+                    ctx.channel,
+                    ctx.author,
+                    check=lambda message: not message.content.startswith("_"),
                     timeout=60,
                 )
             ).content
@@ -78,11 +63,11 @@ class Bonus(commands.Cog, name="bonus commands"):
                 if answer.startswith(f"{ctx.prefix}end"):
                     return "ended by user"
 
-                match await check_answer(a, answer, self.bot.session):
+                match await check_answer(a, answer, self.bot.api):
                     case ("accept", _):  # correct
                         await ctx.send(
                             embed=discord.Embed(
-                                title="Correct", description=md(a), color=C_SUCCESS
+                                title="Correct", description=answerline, color=C_SUCCESS
                             )
                         )
                         points += 10
@@ -91,7 +76,7 @@ class Bonus(commands.Cog, name="bonus commands"):
                     case ("reject", _):  # incorrect
                         await ctx.send(
                             embed=discord.Embed(
-                                title="Incorrect", description=md(a), color=C_ERROR
+                                title="Incorrect", description=answerline, color=C_ERROR
                             )
                         )
                         break
@@ -100,16 +85,15 @@ class Bonus(commands.Cog, name="bonus commands"):
                         await ctx.send(
                             embed=discord.Embed(
                                 title="Prompt",
-                                description=md(response) if response else response,
+                                description=await to_markdown(response) if response else response,
                                 color=C_NEUTRAL,
                             )
                         )
                         answer = (
-                            await self.bot.wait_for(
-                                "message",
-                                check=lambda message: message.author == ctx.author
-                                and message.channel == ctx.channel
-                                and not message.content.startswith("_"),
+                            await self.bot.router.wait_for(
+                                ctx.channel,
+                                ctx.author,
+                                check=lambda message: not message.content.startswith("_"),
                                 timeout=60,
                             )
                         ).content
@@ -132,18 +116,20 @@ class Bonus(commands.Cog, name="bonus commands"):
     async def bonus(self, ctx: Context, *argv) -> None:
         """Play a random bonus."""
         try:
-            params = generate_params(argv)
-            params["threePartBonuses"] = "true"
+            filters = generate_params(argv, three_part_bonuses=True)
         except ValueError as e:
             await ctx.send(embed=discord.Embed(title=str(e), color=C_ERROR))
             return
 
-        points = await self.play_bonus(ctx, params)
+        bonus = await PreparedBonus.prepare(await self.source.get(filters))
+        points = await self.play_bonus(ctx, bonus)
 
         if points == "ended by user":
             await ctx.send(embed=discord.Embed(title="ending bonus", color=C_NEUTRAL))
             return
 
+        self.bot.stats.record_bonus(ctx.author.id, bonus.data, points)
+
         await ctx.send(embed=discord.Embed(title=f"{points}/30", color=C_NEUTRAL))
 
     @commands.command(
@@ -153,40 +139,47 @@ class Bonus(commands.Cog, name="bonus commands"):
     async def pk(self, ctx: Context, *argv) -> None:
         """Start a pk session."""
         try:
-            params = generate_params(argv)
-            params["threePartBonuses"] = "true"
+            filters = generate_params(argv, three_part_bonuses=True)
         except ValueError as e:
             await ctx.send(embed=discord.Embed(title=str(e), color=C_ERROR))
             return
 
         total_points = 0
         total_bonuses = 0
+        questions = QuestionBuffer(self.source, filters, prepare=PreparedBonus.prepare)
+        SESSIONS.labels("pk").inc()
 
-        while True:
-            points = await self.play_bonus(ctx, params)
-
-            if points == "ended by user":
-                stats = discord.Embed(title="Session Stats", color=C_NEUTRAL)
-                stats.add_field(name="Bonuses", value=total_bonuses)
-                stats.add_field(name="Points", value=total_points)
-
-                try:
-                    stats.add_field(name="PPB", value=round(total_points / total_bonuses, 2))
-                except ZeroDivisionError:
-                    stats.add_field(
-                        name="PPB",
-                        value="why would you even start a session just to end it?",
-                    )
+        try:
+            while True:
+                bonus = await questions.next()
+                points = await self.play_bonus(ctx, bonus)
+
+                if points == "ended by user":
+                    stats = discord.Embed(title="Session Stats", color=C_NEUTRAL)
+                    stats.add_field(name="Bonuses", value=total_bonuses)
+                    stats.add_field(name="Points", value=total_points)
+
+                    try:
+                        stats.add_field(name="PPB", value=round(total_points / total_bonuses, 2))
+                    except ZeroDivisionError:
+                        stats.add_field(
+                            name="PPB",
+                            value="why would you even start a session just to end it?",
+                        )
 
-                stats.add_field(name="Filters", value=f"`{' '.join(argv)}`")
+                    stats.add_field(name="Filters", value=f"`{' '.join(argv)}`")
 
-                await ctx.send(embed=stats)
-                return
+                    await ctx.send(embed=stats)
+                    return
 
-            total_points += points
-            total_bonuses += 1
+                total_points += points
+                total_bonuses += 1
+                self.bot.stats.record_bonus(ctx.author.id, bonus.data, points)
 
-            await ctx.send(embed=discord.Embed(title=f"{points}/30", color=C_NEUTRAL))
+                await ctx.send(embed=discord.Embed(title=f"{points}/30", color=C_NEUTRAL))
+        finally:
+            questions.close()
+            SESSIONS.labels("pk").dec()
 
 
 async def setup(bot):  # noqa D103
@@ -0,0 +1,206 @@
+"""Packet commands."""
+
+import asyncio
+
+import discord
+from discord.ext import commands
+from discord.ext.commands import Bot, Context
+from lib.consts import C_ERROR, C_NEUTRAL, C_SUCCESS
+from lib.metrics import SESSIONS
+from lib.packets import PacketSource
+from lib.prepared import PreparedBonus, PreparedTossup
+
+RESULTS = {
+    "power": ("Power", C_SUCCESS),
+    "correct": ("Correct", C_SUCCESS),
+    "neg": ("Neg", C_ERROR),
+    "dead": ("Incorrect, DT", C_ERROR),
+}
+
+
+class Packet(commands.Cog, name="packet commands"):
+    """Command class for packet commands."""
+
+    def __init__(self, bot: Bot):
+        self.bot = bot
+
+    async def send_packet_end_stats(
+        self, ctx: Context, tossups: dict[str, int], bonus_points: list[int], packet: str
+    ) -> None:
+        """Send the statistics for a packet game.
+
+        Parameters
+        ----------
+        ctx : `discord.ext.commands.Context`
+            Message context.
+        tossups : dict[str, int]
+            Dictionary of tossup results.
+        bonus_points : list[int]
+            Points scored on each bonus.
+        packet : str
+            Name and number of the packet.
+        """
+        embed = discord.Embed(title="Game Stats", description=packet, color=C_NEUTRAL)
+        embed.add_field(name="Tossups", value=sum(tossups.values()))
+        embed.add_field(
+            name="Powers/10s/Negs",
+            value=f"{tossups['power']}/{tossups['correct']}/{tossups['neg']}",
+        )
+        embed.add_field(name="Dead Tossups", value=str(tossups["dead"]))
+
+        if bonus_points:
+            embed.add_field(name="Bonuses", value=len(bonus_points))
+            embed.add_field(name="PPB", value=round(sum(bonus_points) / len(bonus_points), 2))
+
+        points = (
+            tossups["power"] * 15
+            + tossups["correct"] * 10
+            - tossups["neg"] * 5
+            + sum(bonus_points)
+        )
+        embed.add_field(name="Points", value=points)
+
+        await ctx.send(embed=embed)
+
+    @commands.command(
+        name="packet",
+        description="play a packet in order",
+    )
+    async def packet(self, ctx: Context, *argv) -> None:
+        """Play the tossups and bonuses of a packet in order, e.g. `packet 2023 ACF Regionals 5`.
+
+        Like in a real game, each correctly answered tossup earns the next bonus of the packet.
+        """
+        if len(argv) < 2 or not argv[-1].isdigit():
+            await ctx.send(
+                embed=discord.Embed(
+                    title="usage: packet <set name> <packet number>", color=C_ERROR
+                )
+            )
+            return
+
+        set_name, number = " ".join(argv[:-1]), int(argv[-1])
+
+        if (info := self.bot.sets.get(set_name)) is not None:
+            set_name = info.name
+            if info.packets is not None and not 1 <= number <= info.packets:
+                await ctx.send(
+                    embed=discord.Embed(
+                        title=f"{set_name} only has {info.packets} packets", color=C_ERROR
+                    )
+                )
+                return
+
+        elif self.bot.sets.sets:
+            suggestions = self.bot.sets.search(set_name, limit=5)
+            await ctx.send(
+                embed=discord.Embed(
+                    title=f"no set named {set_name}",
+                    description="did you mean:\n" + "\n".join(s.name for s in suggestions)
+                    if suggestions
+                    else None,
+                    color=C_ERROR,
+                )
+            )
+            return
+
+        try:
+            packet = await self.bot.packets.get(set_name, number)
+        except LookupError as e:
+            await ctx.send(embed=discord.Embed(title=str(e), color=C_ERROR))
+            return
+
+        name = f"{set_name} | Packet {number}"
+        await ctx.send(
+            embed=discord.Embed(
+                title="Starting packet",
+                description=f"{name}\n{len(packet['tossups'])} tossups, "
+                f"{len(packet['bonuses'])} bonuses",
+                color=C_NEUTRAL,
+            )
+        )
+
+        play_tossup = self.bot.get_cog("tossup commands").play_tossup
+        play_bonus = self.bot.get_cog("bonus commands").play_bonus
+
+        tossups = PacketSource(packet["tossups"])
+        bonuses = PacketSource(packet["bonuses"])
+        del packet  # the sources drop questions as they are played
+
+        tossup_stats = {"power": 0, "correct": 0, "neg": 0, "dead": 0}
+        bonus_points = []
+        SESSIONS.labels("packet").inc()
+
+        async def next_tossup() -> PreparedTossup:
+            return await PreparedTossup.prepare(await tossups.get())
+
+        upcoming = asyncio.create_task(next_tossup())
+
+        try:
+            while upcoming is not None:
+                tossup = await upcoming
+                # prepare the next tossup while this one is being read
+                upcoming = asyncio.create_task(next_tossup()) if tossups else None
+
+                _, result = await play_tossup(ctx, tossup)
+                if result == "ended by user":
+                    break
+
+                tossup_stats[result] += 1
+                self.bot.stats.record_tossup(ctx.author.id, tossup.data, result)
+
+                title, color = RESULTS[result]
+                await ctx.send(
+                    embed=discord.Embed(title=title, description=tossup.markdown, color=color)
+                )
+
+                if result in ("power", "correct") and bonuses:
+                    bonus = await PreparedBonus.prepare(await bonuses.get())
+                    points = await play_bonus(ctx, bonus)
+                    if points == "ended by user":
+                        break
+
+                    bonus_points.append(points)
+                    self.bot.stats.record_bonus(ctx.author.id, bonus.data, points)
+
+                try:
+                    await self.bot.router.wait_for(
+                        ctx.channel,
+                        ctx.author,
+                        check=lambda message: message.content == f"{ctx.prefix}end",
+                        timeout=3.2,
+                    )
+                    break
+
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            if upcoming is not None:
+                upcoming.cancel()
+            tossups.close()
+            bonuses.close()
+            SESSIONS.labels("packet").dec()
+
+        await self.send_packet_end_stats(ctx, tossup_stats, bonus_points, name)
+
+    @commands.command(
+        name="sets",
+        description="search for sets to play packets from",
+    )
+    async def sets(self, ctx: Context, *argv) -> None:
+        """Search for sets by name, with or without the year, e.g. `sets acf reg`."""
+        matches = self.bot.sets.search(" ".join(argv))
+
+        embed = discord.Embed(title="Sets", color=C_NEUTRAL)
+        embed.description = (
+            "\n".join(
+                f"{s.name} ({s.packets} packets)" if s.packets is not None else s.name
+                for s in matches
+            )
+            or "no sets found"
+        )
+        await ctx.send(embed=embed)
+
+
+async def setup(bot):  # noqa: D103
+    await bot.add_cog(Packet(bot))
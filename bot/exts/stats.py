@@ -0,0 +1,74 @@
+"""Stats commands."""
+
+import discord
+from discord.ext import commands
+from discord.ext.commands import Bot, Context
+from lib.consts import C_NEUTRAL
+from lib.stats import TOSSUP_RESULTS
+
+
+def pp20tuh(results: dict[str, int]) -> float:
+    """Calculate points per 20 tossups heard from a dictionary of tossup results."""
+    points = results["power"] * 15 + results["correct"] * 10 - results["neg"] * 5
+    return round(points / sum(results.values()) * 20, 2)
+
+
+class Stats(commands.Cog, name="stats commands"):
+    """Command class for lifetime player stats."""
+
+    def __init__(self, bot: Bot):
+        self.bot = bot
+
+    @commands.command(
+        name="stats",
+        description="get lifetime tossup and bonus stats",
+    )
+    async def stats(self, ctx: Context, user: discord.User = None) -> None:
+        """Get lifetime tossup and bonus stats of a user, by category."""
+        user = user or ctx.author
+        tossups, bonuses = await self.bot.stats.user_stats(user.id)
+
+        embed = discord.Embed(title=f"Stats for {user.display_name}", color=C_NEUTRAL)
+
+        if not tossups and not bonuses:
+            embed.description = "no tossups or bonuses played yet"
+            await ctx.send(embed=embed)
+            return
+
+        if tossups:
+            total = {r: sum(c[r] for c in tossups.values()) for r in TOSSUP_RESULTS}
+            embed.add_field(name="Tossups", value=sum(total.values()))
+            embed.add_field(
+                name="Powers/10s/Negs",
+                value=f"{total['power']}/{total['correct']}/{total['neg']}",
+            )
+            embed.add_field(name="PP20TUH", value=pp20tuh(total))
+
+        if bonuses:
+            total_bonuses = sum(c["bonuses"] for c in bonuses.values())
+            total_correct = sum(c["parts_correct"] for c in bonuses.values())
+            embed.add_field(name="Bonuses", value=total_bonuses)
+            embed.add_field(name="PPB", value=round(total_correct * 10 / total_bonuses, 2))
+
+        categories = sorted(tossups.keys() | bonuses.keys())
+        embed.add_field(
+            name="By Category (PP20TUH | PPB)",
+            value="\n".join(
+                f"{category}: "
+                + (f"{pp20tuh(tossups[category])}" if category in tossups else "-")
+                + " | "
+                + (
+                    f"{round(b['parts_correct'] * 10 / b['bonuses'], 2)}"
+                    if (b := bonuses.get(category))
+                    else "-"
+                )
+                for category in categories
+            ),
+            inline=False,
+        )
+
+        await ctx.send(embed=embed)
+
+
+async def setup(bot):  # noqa: D103
+    await bot.add_cog(Stats(bot))
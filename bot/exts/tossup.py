@@ -1,15 +1,21 @@
 """Tossup commands."""
 
 import asyncio
+from collections import defaultdict
 
 import discord
 from discord.ext import commands
 from discord.ext.commands import Bot, Context
-from lib.consts import C_ERROR, C_NEUTRAL, C_SUCCESS, QBREADER_API
-from lib.utils import check_answer, generate_params
-from markdownify import markdownify as md
-
-lock = asyncio.Lock()
+from lib.arbiter import BuzzArbiter
+from lib.consts import C_ERROR, C_NEUTRAL, C_SUCCESS, CORPUS_PATH, READING_SPEED
+from lib.corpus import CorpusSource
+from lib.metrics import SESSIONS, record_first_question
+from lib.pool import QuestionPool
+from lib.prepared import PreparedTossup
+from lib.render import to_markdown
+from lib.sessions import channel_lock
+from lib.sources import QuestionBuffer, QuestionSource
+from lib.utils import check_answer, generate_params, parse_reading_speed
 
 
 class Tossup(commands.Cog, name="tossup commands"):
@@ -17,62 +23,147 @@ class Tossup(commands.Cog, name="tossup commands"):
 
     def __init__(self, bot: Bot):
         self.bot = bot
+        self.source: QuestionSource = (
+            CorpusSource(CORPUS_PATH, "tossups")
+            if CORPUS_PATH
+            else QuestionPool(bot, "random-tossup", "tossups")
+        )
+
+    def cog_unload(self) -> None:  # noqa: D102
+        self.source.close()
+
+    async def read_tossup(
+        self,
+        ctx: Context,
+        tu: discord.Message,
+        tossup: PreparedTossup,
+        can_power: asyncio.Event,
+        lock: asyncio.Lock,
+        speed: float,
+    ) -> None:
+        """Gradually reveal a tossup by editing its message.
 
-    def generate_lines(self, text: str, chunk_size: int, watch_power: bool = True) -> list[str]:
-        """Parse a tossup into a list of strings where the tossup is gradually revealed.
+        Reveals are paced against deadlines on the shared `bot.ticker`, counted from the start of
+        the tossup, so time spent editing doesn't slow reading down. Edits are sent early by the
+        editor's recent latency so words show up on time, and time spent waiting for someone to
+        answer moves every later deadline back.
 
         Parameters
         ----------
-            text : `str`
-                The text to parse.
-            chunk_size : `int`
-                The number of words to include in each chunk.
-            watch_power : `bool`, default = `True`
-                Read carefully around the power mark.
+            ctx : `discord.ext.commands.Context`
+                Message context.
+            tu : `discord.Message`
+                The tossup message to edit.
+            tossup : `PreparedTossup`
+                The tossup to reveal.
+            can_power : `asyncio.Event`
+                Cleared once the power mark has been read.
+            lock : `asyncio.Lock`
+                Held while revealing, so reading pauses while someone is answering.
+            speed : `float`
+                Words revealed per second.
+        """
+        loop = asyncio.get_running_loop()
+        text = tossup.text
+        start = loop.time()
+        for end, words in zip(tossup.reveals, tossup.words):
+            await self.bot.ticker.wait_until(start + words / speed - self.bot.editor.latency)
+
+            paused = loop.time()
+            async with lock:
+                start += loop.time() - paused
+                on_power_mark = text.endswith("(*)", 0, end)
+                if (
+                    not self.bot.editor.saturated(ctx.channel.id)
+                    or on_power_mark
+                    or end == len(text)
+                ):  # skip a chunk while rate limited, the next edit reveals both
+                    self.bot.editor.edit(tu, embed=tossup.show(end))
+                if can_power.is_set() and -1 < tossup.star < end and not on_power_mark:
+                    # include powers right on power mark
+                    can_power.clear()
+
+    async def get_verdict(self, ctx: Context, player: discord.abc.User, answerline: str) -> str:
+        """Wait for a player's answer after a buzz and judge it, prompting if needed.
+
+        Parameters
+        ----------
+            ctx : `discord.ext.commands.Context`
+                Message context.
+            player : `discord.abc.User`
+                The player that buzzed.
+            answerline : `str`
+                The answerline of the tossup.
 
         Returns
         -------
-            `list[str]`
-                A list of strings where each string gradually reveals more of the tossup.
-
-        Examples
-        --------
-        >>> self.generate_lines("In quantum mechanics, the square of this quantity...", 4)
-        [
-            "In quantum mechanics, the",
-            "In quantum mechanics, the square of this quantity",
-            "In quantum mechanics, the square of this quantity is equal to h-bar",
-            "In quantum mechanics, the square of this quantity is equal to h-bar...",
-            ...
-        ]
+            `str`
+                `"accept"`, `"reject"` (including not answering in time), `"ended by user"` or
+                `"error"` if the answer couldn't be checked.
         """
-        words = text.strip().replace("\n", " ").split(" ")
-        chunks = []
-        seen_power = False
+        try:
+            answer = (
+                await self.bot.router.wait_for(
+                    ctx.channel,
+                    player,
+                    timeout=8,  # 8 seconds is the time on protobowl
+                )
+            ).content
 
-        for i in range(0, len(words), chunk_size):
-            next_read = words[: i + chunk_size]
+        except asyncio.TimeoutError:  # no answer on buzz
+            return "reject"
 
-            if watch_power and not seen_power and "(*)" in next_read:
-                if not next_read[-1].endswith("(*)"):
-                    power_chunk = next_read[: next_read.index("(*)") + 1]
-                    chunks.append(" ".join(power_chunk))
+        while True:
+            if answer.startswith(f"{ctx.prefix}end"):
+                return "ended by user"
+
+            match await check_answer(answerline, answer, self.bot.api):
+                case ("accept", _):
+                    return "accept"
+
+                case ("reject", _):
+                    return "reject"
+
+                case ("prompt", response):
+                    await ctx.send(
+                        embed=discord.Embed(
+                            title="prompt",
+                            description=await to_markdown(response) if response else response,
+                            color=C_NEUTRAL,
+                        )
+                    )
 
-                seen_power = True
+                    try:
+                        answer = (
+                            await self.bot.router.wait_for(ctx.channel, player, timeout=8)
+                        ).content
 
-            chunks.append(" ".join(next_read))
+                    except asyncio.TimeoutError:
+                        return "reject"
 
-        return chunks
+                case _:
+                    await ctx.send(
+                        embed=discord.Embed(
+                            title="Error",
+                            description="Something went wrong",
+                            color=C_ERROR,
+                        )
+                    )
+                    return "error"
 
-    async def play_tossup(self, ctx: Context, params: dict) -> tuple[str, str]:
+    async def play_tossup(
+        self, ctx: Context, tossup: PreparedTossup, speed: float = READING_SPEED
+    ) -> tuple[str, str]:
         """Play a tossup question.
 
         Parameters
         ----------
             ctx : `discord.ext.commands.Context`
                 Message context.
-            params : `dict`
-                Parameters for the API request.
+            tossup : `PreparedTossup`
+                The tossup to play.
+            speed : `float`, default = `READING_SPEED`
+                Words revealed per second.
 
         Returns
         -------
@@ -89,47 +180,21 @@ class Tossup(commands.Cog, name="tossup commands"):
                     `"neg"`: user answered incorrectly before the tossup is finished reading
                     `"dead"`: user answered incorrectly after the tossup is finished reading
         """
-        async with self.bot.session.get(f"{QBREADER_API}/random-tossup", params=params) as r:
-            tossup = (await r.json())["tossups"][0]
-
-        tossup_parts = self.generate_lines(tossup["question"], 5)
-
-        footer = [
-            tossup["setName"],
-            f"Packet {tossup['packetNumber']}",
-            f"Tossup {tossup['questionNumber']}",
-            f"Difficulty {tossup['difficulty']}",
-        ]
-
-        footer = " | ".join(footer)
-
         can_power = asyncio.Event()
-        if "*" in tossup["question"]:
+        if tossup.star != -1:
             can_power.set()
 
         tu_finished = asyncio.Event()
 
-        embed = discord.Embed(title="Tossup", description="", color=C_NEUTRAL)
+        lock = channel_lock(ctx.channel.id)
 
-        embed.set_footer(text=footer)
-        tu = await ctx.send(embed=embed)
+        tu = await ctx.send(embed=tossup.show(0))
+        record_first_question(ctx, tu.created_at)
 
-        try:
-            a = tossup["formatted_answer"]
-        except KeyError:
-            a = tossup["answer"]
+        a = tossup.answer
 
         async def edit_tossup():  # reader task
-            for part in tossup_parts:
-                await asyncio.sleep(0.8)
-
-                async with lock:
-                    embed = discord.Embed(title="Tossup", description=part, color=C_NEUTRAL)
-                    embed = embed.set_footer(text=footer)
-                    await tu.edit(embed=embed)
-                    if can_power.is_set() and "*" in part and not part.endswith("(*)"):
-                        # include powers right on power mark
-                        can_power.clear()
+            await self.read_tossup(ctx, tu, tossup, can_power, lock, speed)
 
             tu_finished.set()
 
@@ -140,31 +205,26 @@ class Tossup(commands.Cog, name="tossup commands"):
         reader = asyncio.create_task(edit_tossup())
 
         async def listen_for_answer(timeout: float | None = None):  # buzzer task
-            result = ""
-
             try:
-                buzz = await self.bot.wait_for(
-                    "message",
-                    check=lambda message: message.author == ctx.author
-                    and message.channel == ctx.channel,
+                buzz = await self.bot.router.wait_for(
+                    ctx.channel,
+                    ctx.author,
                     timeout=timeout,
                 )
 
             except asyncio.TimeoutError:
                 reader.cancel()
-                await tu.edit(
-                    embed=discord.Embed(
-                        title="Tossup", description=tossup_parts[-1], color=C_NEUTRAL
-                    ).set_footer(text=footer)
+                await self.bot.editor.edit(
+                    tu,
+                    embed=tossup.show(),
                 )
                 return "dead"
 
             if buzz.content.startswith(f"{ctx.prefix}end"):
                 reader.cancel()
-                await tu.edit(
-                    embed=discord.Embed(
-                        title="Tossup", description=tossup_parts[-1], color=C_NEUTRAL
-                    ).set_footer(text=footer)
+                await self.bot.editor.edit(
+                    tu,
+                    embed=tossup.show(),
                 )
                 return "ended by user"
 
@@ -180,97 +240,26 @@ class Tossup(commands.Cog, name="tossup commands"):
                 if tu_finished.is_set():
                     reader.cancel()
 
-                try:
-                    answer = (
-                        await self.bot.wait_for(
-                            "message",
-                            check=lambda message: message.author == ctx.author
-                            and message.channel == ctx.channel,
-                            timeout=8,  # 8 seconds is the time on protobowl
-                        )
-                    ).content
+                match await self.get_verdict(ctx, ctx.author, a):
+                    case "accept":
+                        if can_power.is_set():
+                            result = "power"
+                        else:
+                            result = "correct"
 
-                except asyncio.TimeoutError:  # no answer on buzz
-                    reader.cancel()
-                    await tu.edit(
-                        embed=discord.Embed(
-                            title="Tossup",
-                            description=tossup_parts[-1],
-                            color=C_NEUTRAL,
-                        ).set_footer(text=footer)
-                    )
-                    if tu_finished.is_set():
-                        return "dead"
-                    return "neg"
-
-                while True:
-                    if answer.startswith(f"{ctx.prefix}end"):
-                        reader.cancel()
-                        await tu.edit(
-                            embed=discord.Embed(
-                                title="Tossup",
-                                description=tossup_parts[-1],
-                                color=C_NEUTRAL,
-                            ).set_footer(text=footer)
-                        )
-                        return "ended by user"
-
-                    match await check_answer(a, answer, self.bot.session):
-                        case ("accept", _):
-                            if can_power.is_set():
-                                result = "power"
-                            else:
-                                result = "correct"
-                            break
-
-                        case ("reject", _):
-                            if tu_finished.is_set():
-                                result = "dead"
-                            else:
-                                result = "neg"
-                            break
-
-                        case ("prompt", response):
-                            await ctx.send(
-                                embed=discord.Embed(
-                                    title="prompt",
-                                    description=md(response) if response else response,
-                                    color=C_NEUTRAL,
-                                )
-                            )
+                    case "reject":
+                        if tu_finished.is_set():
+                            result = "dead"
+                        else:
+                            result = "neg"
 
-                            try:
-                                answer = (
-                                    await self.bot.wait_for(
-                                        "message",
-                                        check=lambda message: message.author == ctx.author
-                                        and message.channel == ctx.channel,
-                                        timeout=8,
-                                    )
-                                ).content
-
-                            except asyncio.TimeoutError:
-                                if tu_finished.is_set():
-                                    result = "dead"
-                                else:
-                                    result = "neg"
-                                break
-
-                        case _:
-                            await ctx.send(
-                                embed=discord.Embed(
-                                    title="Error",
-                                    description="Something went wrong",
-                                    color=C_ERROR,
-                                )
-                            )
-                            return "ended by user"
+                    case _:  # ended, or the answer couldn't be checked
+                        result = "ended by user"
 
                 reader.cancel()
-                await tu.edit(
-                    embed=discord.Embed(
-                        title="Tossup", description=tossup_parts[-1], color=C_NEUTRAL
-                    ).set_footer(text=footer)
+                await self.bot.editor.edit(
+                    tu,
+                    embed=tossup.show(),
                 )
                 return result
 
@@ -285,6 +274,136 @@ class Tossup(commands.Cog, name="tossup commands"):
         except asyncio.CancelledError:  # reader cancelled while being awaited
             return a, await listener
 
+    async def play_multiplayer_tossup(
+        self, ctx: Context, tossup: PreparedTossup, speed: float = READING_SPEED
+    ) -> tuple[str, list[tuple[discord.abc.User | None, str]]]:
+        """Play a tossup question that anyone in the channel can buzz on.
+
+        Simultaneous buzzes are ordered by `BuzzArbiter`, and each buzz is scored by how far the
+        tossup had been read when it arrived. Players that neg are locked out while the tossup
+        keeps being read for everyone else. A buzz whose answer couldn't be checked doesn't count.
+        Messages starting with `_` are never buzzes, so players can still talk.
+
+        Parameters
+        ----------
+            ctx : `discord.ext.commands.Context`
+                Message context.
+            tossup : `PreparedTossup`
+                The tossup to play.
+            speed : `float`, default = `READING_SPEED`
+                Words revealed per second.
+
+        Returns
+        -------
+            answer : `str`
+                The formatted answer to the tossup.
+            results : `list[tuple[discord.abc.User | None, str]]`
+                Results of every answer, in order, using the same results as `play_tossup`.
+
+                Players that answered incorrectly after the tossup finished reading aren't
+                listed. The last result is `"power"` or `"correct"` if someone got the tossup,
+                `(None, "dead")` if nobody did, or `(ctx.author, "ended by user")` if the
+                player who started the game ended it.
+        """
+        can_power = asyncio.Event()
+        if tossup.star != -1:
+            can_power.set()
+
+        lock = channel_lock(ctx.channel.id)
+
+        tu = await ctx.send(embed=tossup.show(0))
+        record_first_question(ctx, tu.created_at)
+
+        a = tossup.answer
+
+        def is_end(message: discord.Message) -> bool:
+            return message.author == ctx.author and message.content.startswith(f"{ctx.prefix}end")
+
+        at_buzz: dict[int, tuple[bool, bool]] = {}  # buzz ID -> (could power, finished reading)
+
+        def on_buzz(message: discord.Message) -> None:
+            at_buzz[message.id] = (can_power.is_set(), reader.done())
+
+        arbiter = BuzzArbiter(
+            self.bot.router,
+            ctx.channel,
+            is_buzz=lambda message: is_end(message)
+            or not message.content.startswith(("_", ctx.prefix)),
+            on_buzz=on_buzz,
+        )
+
+        reader = asyncio.create_task(self.read_tossup(ctx, tu, tossup, can_power, lock, speed))
+        loop = asyncio.get_running_loop()
+        deadline = None  # end of the dead time once the tossup has finished reading
+        results = []
+
+        try:
+            while True:
+                next_buzz = asyncio.create_task(arbiter.next())
+
+                if not reader.done():
+                    await asyncio.wait({next_buzz, reader}, return_when=asyncio.FIRST_COMPLETED)
+
+                if not next_buzz.done():  # finished reading, give everyone 5 seconds to buzz
+                    if deadline is None:
+                        deadline = loop.time() + 5
+                    await asyncio.wait({next_buzz}, timeout=max(0, deadline - loop.time()))
+
+                    if not next_buzz.done():
+                        next_buzz.cancel()
+                        results.append((None, "dead"))
+                        break
+
+                buzz = next_buzz.result()
+                player = buzz.author
+                could_power, finished = at_buzz.pop(buzz.id)
+
+                if is_end(buzz):
+                    results.append((player, "ended by user"))
+                    break
+
+                async with lock:
+                    await ctx.send(
+                        embed=discord.Embed(
+                            title="Buzz",
+                            description=f"from {player.mention}",
+                            color=C_SUCCESS,
+                        )
+                    )
+
+                    verdict = await self.get_verdict(ctx, player, a)
+
+                if verdict == "accept":
+                    results.append((player, "power" if could_power else "correct"))
+                    break
+
+                if verdict == "ended by user" and player == ctx.author:
+                    results.append((player, "ended by user"))
+                    break
+
+                if verdict == "error":  # not the player's fault, let them buzz again
+                    continue
+
+                await ctx.send(
+                    embed=discord.Embed(
+                        title="Incorrect", description=f"{player.mention}", color=C_ERROR
+                    )
+                )
+
+                if not finished:
+                    results.append((player, "neg"))
+                arbiter.lock_out(player)
+                deadline = None
+
+        finally:
+            reader.cancel()
+            await self.bot.editor.edit(
+                tu,
+                embed=tossup.show(),
+            )
+
+        return a, results
+
     @commands.command(
         name="tossup",
         description="returns a random tossup",
@@ -292,37 +411,47 @@ class Tossup(commands.Cog, name="tossup commands"):
     async def tossup(self, ctx: Context, *argv) -> None:
         """Play a random tossup."""
         try:
-            params = generate_params(argv)
+            argv, speed = parse_reading_speed(argv)
+            filters = generate_params(argv)
         except ValueError as e:
             await ctx.send(embed=discord.Embed(title=str(e), color=C_ERROR))
             return
 
-        match await self.play_tossup(ctx, params):
-            case (answer, "ended by user"):
+        tossup = await PreparedTossup.prepare(await self.source.get(filters))
+
+        match await self.play_tossup(ctx, tossup, speed):
+            case (_, "ended by user"):
                 await ctx.send(embed=discord.Embed(title="Ending Tossup", color=C_NEUTRAL))
+                return
 
-            case (answer, "power"):
+            case (_, "power" as result):
                 await ctx.send(
-                    embed=discord.Embed(title="Power", description=md(answer), color=C_SUCCESS)
+                    embed=discord.Embed(
+                        title="Power", description=tossup.markdown, color=C_SUCCESS
+                    )
                 )
 
-            case (answer, "correct"):
+            case (_, "correct" as result):
                 await ctx.send(
-                    embed=discord.Embed(title="Correct", description=md(answer), color=C_SUCCESS)
+                    embed=discord.Embed(
+                        title="Correct", description=tossup.markdown, color=C_SUCCESS
+                    )
                 )
 
-            case (answer, "neg"):
+            case (_, "neg" as result):
                 await ctx.send(
-                    embed=discord.Embed(title="Neg", description=md(answer), color=C_ERROR)
+                    embed=discord.Embed(title="Neg", description=tossup.markdown, color=C_ERROR)
                 )
 
-            case (answer, "dead"):
+            case (_, "dead" as result):
                 await ctx.send(
                     embed=discord.Embed(
-                        title="Incorrect, DT", description=md(answer), color=C_ERROR
+                        title="Incorrect, DT", description=tossup.markdown, color=C_ERROR
                     )
                 )
 
+        self.bot.stats.record_tossup(ctx.author.id, tossup.data, result)
+
     async def send_tk_end_stats(
         self, ctx: Context, stats: dict[str, int], filters: list[str]
     ) -> None:
@@ -368,60 +497,192 @@ class Tossup(commands.Cog, name="tossup commands"):
     async def tk(self, ctx: Context, *argv: list[str]) -> None:
         """Start a tk session."""
         try:
-            params = generate_params(argv)
+            argv, speed = parse_reading_speed(argv)
+            filters = generate_params(argv)
         except ValueError as e:
             await ctx.send(embed=discord.Embed(title=str(e), color=C_ERROR))
             return
 
         tk_stats = {"power": 0, "correct": 0, "neg": 0, "dead": 0}
+        questions = QuestionBuffer(self.source, filters, prepare=PreparedTossup.prepare)
+        SESSIONS.labels("tk").inc()
 
-        while True:
-            match await self.play_tossup(ctx, params):
-                case (answer, "ended by user"):
+        try:
+            while True:
+                tossup = await questions.next()
+
+                match await self.play_tossup(ctx, tossup, speed):
+                    case (_, "ended by user"):
+                        await self.send_tk_end_stats(ctx, tk_stats, argv)
+                        return
+
+                    case (_, "power" as result):
+                        tk_stats["power"] += 1
+                        await ctx.send(
+                            embed=discord.Embed(
+                                title="Power",
+                                description=tossup.markdown,
+                                color=C_SUCCESS,
+                            )
+                        )
+
+                    case (_, "correct" as result):
+                        tk_stats["correct"] += 1
+                        await ctx.send(
+                            embed=discord.Embed(
+                                title="Correct",
+                                description=tossup.markdown,
+                                color=C_SUCCESS,
+                            )
+                        )
+
+                    case (_, "neg" as result):
+                        tk_stats["neg"] += 1
+                        await ctx.send(
+                            embed=discord.Embed(
+                                title="Neg", description=tossup.markdown, color=C_ERROR
+                            )
+                        )
+
+                    case (_, "dead" as result):
+                        tk_stats["dead"] += 1
+                        await ctx.send(
+                            embed=discord.Embed(
+                                title="Incorrect, DT",
+                                description=tossup.markdown,
+                                color=C_ERROR,
+                            )
+                        )
+
+                self.bot.stats.record_tossup(ctx.author.id, tossup.data, result)
+
+                try:
+                    await self.bot.router.wait_for(
+                        ctx.channel,
+                        ctx.author,
+                        check=lambda message: message.content == f"{ctx.prefix}end",
+                        timeout=3.2,
+                    )  # wait 4 (3.2 + 0.8 at the beggining) seconds to give time to read answer
                     await self.send_tk_end_stats(ctx, tk_stats, argv)
                     return
 
-                case (answer, "power"):
-                    tk_stats["power"] += 1
-                    await ctx.send(
-                        embed=discord.Embed(title="Power", description=md(answer), color=C_SUCCESS)
-                    )
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            questions.close()
+            SESSIONS.labels("tk").dec()
+
+    async def send_mtk_end_stats(
+        self,
+        ctx: Context,
+        tossups: int,
+        scores: dict[discord.abc.User, dict[str, int]],
+        filters: list[str],
+    ) -> None:
+        """Send the scoreboard for a multiplayer TK session.
 
-                case (answer, "correct"):
-                    tk_stats["correct"] += 1
-                    await ctx.send(
-                        embed=discord.Embed(
-                            title="Correct", description=md(answer), color=C_SUCCESS
-                        )
-                    )
+        Parameters
+        ----------
+        ctx : `discord.ext.commands.Context`
+            Message context.
+        tossups : int
+            Number of tossups read.
+        scores : dict[discord.abc.User, dict[str, int]]
+            Dictionary of stats per player.
+        filters : list[str]
+            List of filters used for the session.
+        """
+        embed = discord.Embed(title="Session Stats", color=C_NEUTRAL)
+        embed.add_field(name="Tossups", value=tossups)
 
-                case (answer, "neg"):
-                    tk_stats["neg"] += 1
-                    await ctx.send(
-                        embed=discord.Embed(title="Neg", description=md(answer), color=C_ERROR)
-                    )
+        points = {
+            player: stats["power"] * 15 + stats["correct"] * 10 - stats["neg"] * 5
+            for player, stats in scores.items()
+        }
 
-                case (answer, "dead"):
-                    tk_stats["dead"] += 1
-                    await ctx.send(
-                        embed=discord.Embed(
-                            title="Incorrect, DT", description=md(answer), color=C_ERROR
+        scoreboard = [
+            f"{player.mention}: {points[player]} "
+            f"({stats['power']}/{stats['correct']}/{stats['neg']})"
+            for player, stats in sorted(scores.items(), key=lambda s: -points[s[0]])
+        ]
+
+        embed.add_field(
+            name="Points (Powers/10s/Negs)",
+            value="\n".join(scoreboard) or "nobody buzzed",
+            inline=False,
+        )
+        embed.add_field(name="Filters", value=f"`{' '.join(filters)}`", inline=False)
+
+        await ctx.send(embed=embed)
+
+    @commands.command(
+        name="mtk",
+        description="start a multiplayer tk session",
+    )
+    async def mtk(self, ctx: Context, *argv: list[str]) -> None:
+        """Start a multiplayer tk session, anyone in the channel can buzz."""
+        try:
+            argv, speed = parse_reading_speed(argv)
+            filters = generate_params(argv)
+        except ValueError as e:
+            await ctx.send(embed=discord.Embed(title=str(e), color=C_ERROR))
+            return
+
+        tossups = 0
+        scores = defaultdict(lambda: {"power": 0, "correct": 0, "neg": 0})
+        questions = QuestionBuffer(self.source, filters, prepare=PreparedTossup.prepare)
+        SESSIONS.labels("mtk").inc()
+
+        try:
+            while True:
+                tossup = await questions.next()
+                _, results = await self.play_multiplayer_tossup(ctx, tossup, speed)
+
+                for player, result in results:
+                    if result in ("power", "correct", "neg"):
+                        scores[player][result] += 1
+                        self.bot.stats.record_tossup(player.id, tossup.data, result)
+
+                match results[-1]:
+                    case (_, "ended by user"):
+                        await self.send_mtk_end_stats(ctx, tossups, scores, argv)
+                        return
+
+                    case (player, "power" | "correct" as result):
+                        await ctx.send(
+                            embed=discord.Embed(
+                                title=f"{result.capitalize()} by {player.display_name}",
+                                description=tossup.markdown,
+                                color=C_SUCCESS,
+                            )
                         )
-                    )
 
-            try:
-                await self.bot.wait_for(
-                    "message",
-                    check=lambda message: message.author == ctx.author
-                    and message.channel == ctx.channel
-                    and message.content == f"{ctx.prefix}end",
-                    timeout=3.2,
-                )  # wait 4 (3.2 + 0.8 at the beggining) seconds to give time to read answer
-                await self.send_tk_end_stats(ctx, tk_stats, argv)
-                return
+                    case (None, "dead"):
+                        await ctx.send(
+                            embed=discord.Embed(
+                                title="Dead Tossup",
+                                description=tossup.markdown,
+                                color=C_ERROR,
+                            )
+                        )
 
-            except asyncio.TimeoutError:
-                pass
+                tossups += 1
+
+                try:
+                    await self.bot.router.wait_for(
+                        ctx.channel,
+                        ctx.author,
+                        check=lambda message: message.content == f"{ctx.prefix}end",
+                        timeout=3.2,
+                    )
+                    await self.send_mtk_end_stats(ctx, tossups, scores, argv)
+                    return
+
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            questions.close()
+            SESSIONS.labels("mtk").dec()
 
     @commands.command(
         name="tu",
@@ -0,0 +1,130 @@
+"""Local answerline matching."""
+
+import re
+import unicodedata
+from functools import lru_cache
+
+TAG = re.compile(r"<[^>]+>")
+REQUIRED = re.compile(r"<u>(.*?)</u>", re.IGNORECASE | re.DOTALL)
+CLAUSE = re.compile(r"\[(.*?)\]|\((.*?)\)", re.DOTALL)
+ALTERNATIVES = re.compile(r"\s+or\s+")
+PUNCTUATION = re.compile(r"[^\w\s]")
+ARTICLES = re.compile(r"^(the|a|an) ")
+
+DIRECTIVES = [
+    ("reject", ("do not accept or prompt on", "do not accept", "do not prompt on", "reject")),
+    ("prompt", ("prompt on",)),
+    ("accept", ("accept", "or")),
+]
+
+
+def normalize(text: str) -> str:
+    """Normalize a piece of an answerline or a given answer for comparison.
+
+    Strips HTML tags, accents, punctuation, casing and leading articles.
+
+    Parameters
+    ----------
+        text : `str`
+            The text to normalize.
+
+    Returns
+    -------
+        `str`
+            The normalized text.
+    """
+    text = unicodedata.normalize("NFKD", TAG.sub("", text))
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    text = " ".join(PUNCTUATION.sub(" ", text.lower()).split())
+    return ARTICLES.sub("", text)
+
+
+def _forms(text: str, required: bool = True) -> set[str]:
+    """Get every form of an answer: the whole thing and, if `required`, its required portion."""
+    forms = {normalize(text)}
+    if required and (portion := REQUIRED.findall(text)):
+        forms.add(normalize(" ".join(portion)))
+    forms.discard("")
+    return forms
+
+
+@lru_cache(maxsize=1024)
+def parse_answerline(answerline: str) -> dict[str, set[str]] | None:
+    """Parse an answerline into normalized accept, prompt and reject forms.
+
+    Parameters
+    ----------
+        answerline : `str`
+            The answerline, either plain or HTML formatted.
+
+    Returns
+    -------
+        `dict[str, set[str]] | None`
+            Normalized forms for each directive, plus `"unsure"` forms of clauses that can't be
+            split into alternatives reliably, or `None` if the answerline contains a directive
+            that can't be handled locally (e.g. directed prompts). Results are memoized per
+            answerline and must not be mutated.
+    """
+    directives = {"accept": set(), "prompt": set(), "reject": set(), "unsure": set()}
+
+    main = CLAUSE.sub("", answerline)
+    directives["accept"] |= _forms(main)
+
+    for square, round_ in CLAUSE.findall(answerline):
+        for clause in (square or round_).split(";"):
+            clause = clause.strip()
+            plain = TAG.sub("", clause).lower()
+
+            for directive, openers in DIRECTIVES:
+                opener = next((o for o in openers if plain.startswith(o + " ")), None)
+                if opener is not None:
+                    break
+            else:
+                return None  # unknown directive, leave it to qbreader
+
+            if directive == "prompt" and re.search(r"\b(by asking|with)\b", plain):
+                return None  # directed prompts need qbreader's wording
+
+            body = re.sub(rf"^(<[^>]+>|\s)*{re.escape(opener)}", "", clause, flags=re.I)
+            for alternative in ALTERNATIVES.split(body):
+                if "," in alternative:  # could be a list or a single name like "Paris, Texas"
+                    directives["unsure"] |= _forms(alternative, required=False)
+                else:
+                    # only what's accepted is accepted by its underlined portion alone
+                    directives[directive] |= _forms(alternative, directive == "accept")
+
+    return directives
+
+
+def check_answer_locally(answerline: str, answer: str) -> tuple[str, str | None] | None:
+    """Check an answer against an answerline without the qbreader API.
+
+    Only exact matches (after normalization) to a single directive are decided locally, anything
+    else is left to the remote answer checker.
+
+    Parameters
+    ----------
+        answerline : `str`
+            The answerline of the question.
+        answer : `str`
+            The answer to check.
+
+    Returns
+    -------
+        `tuple[str, str | None] | None`
+            A tuple of the directive and prompted response like `check_answer`, or `None` if the
+            answer can't be confidently checked locally.
+    """
+    given = normalize(answer)
+    if not given:
+        return None
+
+    directives = parse_answerline(answerline)
+    if directives is None:
+        return None
+
+    matches = [directive for directive, forms in directives.items() if given in forms]
+    if len(matches) != 1 or matches[0] == "unsure":
+        return None
+
+    return matches[0], None
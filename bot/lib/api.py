@@ -0,0 +1,227 @@
+"""qbreader API client."""
+
+import asyncio
+import random
+import time
+
+import aiohttp
+from lib.consts import QBREADER_API
+from lib.metrics import API_COALESCED, API_ERRORS, API_LATENCY
+
+
+class APIError(Exception):
+    """A request to the qbreader API failed or was refused by the circuit breaker."""
+
+
+class QBReaderClient:
+    """Client for every request the bot makes to the qbreader API.
+
+    Owns a single HTTP session for the lifetime of the bot, with pooled keep-alive connections
+    and cached DNS lookups. Requests have per-endpoint timeouts and are retried with jittered
+    exponential backoff. After `failure_threshold` consecutive failures the circuit breaker opens
+    and requests fail immediately for `cooldown` seconds, so games don't hang on a slow API.
+
+    Concurrent identical requests (same endpoint and parameters) to the endpoints in `COALESCED`
+    are coalesced into one, and every caller gets the same response. Random question endpoints
+    are never coalesced, since every caller should get questions of its own.
+
+    Parameters
+    ----------
+        timeouts : `dict[str, float]`, optional
+            Total timeout in seconds per endpoint, endpoints not listed use `"default"`.
+        retries : `int`, default = `2`
+            Number of times a failed request is retried.
+        limit_per_host : `int`, default = `20`
+            Maximum number of simultaneous connections to the API.
+        failure_threshold : `int`, default = `5`
+            Consecutive failures before the circuit breaker opens.
+        cooldown : `float`, default = `30`
+            Seconds the circuit breaker stays open for.
+    """
+
+    COALESCED = frozenset({"check-answer", "packet", "set-list", "num-packets"})
+
+    def __init__(
+        self,
+        timeouts: dict[str, float] | None = None,
+        retries: int = 2,
+        limit_per_host: int = 20,
+        failure_threshold: int = 5,
+        cooldown: float = 30,
+    ):
+        self.timeouts = {"default": 10, "check-answer": 3} | (timeouts or {})
+        self.retries = retries
+        self.limit_per_host = limit_per_host
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+
+        self.session: aiohttp.ClientSession | None = None
+        self._failures = 0
+        self._open_until = 0.0
+
+        self._in_flight: dict[tuple, asyncio.Future] = {}
+        self.requests_sent = 0
+        self.requests_coalesced = 0
+
+    async def start(self) -> None:
+        """Create the HTTP session, unless one is already open."""
+        if self.session is not None and not self.session.closed:
+            return
+
+        connector = aiohttp.TCPConnector(
+            limit_per_host=self.limit_per_host,
+            ttl_dns_cache=300,
+            keepalive_timeout=60,
+            resolver=aiohttp.AsyncResolver(),
+        )
+        self.session = aiohttp.ClientSession(connector=connector, raise_for_status=True)
+
+    async def close(self) -> None:
+        """Close the HTTP session."""
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    def _record(self, ok: bool) -> None:
+        if ok:
+            self._failures = 0
+            return
+
+        self._failures += 1
+        if self._failures >= self.failure_threshold:
+            self._open_until = time.monotonic() + self.cooldown
+
+    async def get(self, endpoint: str, params: dict | str | None = None) -> dict:
+        """Make a GET request to the API.
+
+        If an identical request to an endpoint in `COALESCED` is already in flight, its response
+        is shared instead.
+
+        Parameters
+        ----------
+            endpoint : `str`
+                Name of the endpoint, e.g. `"random-tossup"`.
+            params : `dict | str | None`, default = `None`
+                Query parameters, either as a mapping or an already encoded query string.
+
+        Returns
+        -------
+            `dict`
+                The decoded JSON response. Coalesced callers share the same object, so it must
+                not be mutated.
+
+        Raises
+        ------
+            `APIError`
+                The request failed after all retries, or the circuit breaker is open.
+        """
+        if endpoint not in self.COALESCED:
+            return (await self._request(endpoint, params))[0]
+
+        if isinstance(params, dict):
+            key = (endpoint, tuple(sorted((k, str(v)) for k, v in params.items())))
+        else:
+            key = (endpoint, params)
+
+        if key in self._in_flight:
+            self.requests_coalesced += 1
+            API_COALESCED.labels(endpoint).inc()
+            return await asyncio.shield(self._in_flight[key])
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            data, _ = await self._request(endpoint, params)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # mark as retrieved in case nobody else was waiting
+            raise
+        else:
+            future.set_result(data)
+            return data
+        finally:
+            del self._in_flight[key]
+
+    async def get_if_modified(
+        self, endpoint: str, params: dict | None = None, validators: dict[str, str] | None = None
+    ) -> tuple[dict | None, dict[str, str]]:
+        """Make a conditional GET request to the API.
+
+        Parameters
+        ----------
+            endpoint : `str`
+                Name of the endpoint, e.g. `"set-list"`.
+            params : `dict | None`, default = `None`
+                Query parameters.
+            validators : `dict[str, str] | None`, default = `None`
+                `ETag` and `Last-Modified` headers of the last response, as returned by a previous
+                call.
+
+        Returns
+        -------
+            data : `dict | None`
+                The decoded JSON response, or `None` if it hasn't changed since `validators`.
+            validators : `dict[str, str]`
+                Validators to pass to the next call.
+
+        Raises
+        ------
+            `APIError`
+                The request failed after all retries, or the circuit breaker is open.
+        """
+        validators = validators or {}
+        headers = {}
+        if "ETag" in validators:
+            headers["If-None-Match"] = validators["ETag"]
+        if "Last-Modified" in validators:
+            headers["If-Modified-Since"] = validators["Last-Modified"]
+
+        data, new_validators = await self._request(endpoint, params, headers)
+        return data, new_validators or validators  # keep the old ones if a 304 didn't repeat them
+
+    async def _request(
+        self,
+        endpoint: str,
+        params: dict | str | None,
+        headers: dict[str, str] | None = None,
+    ) -> tuple[dict | None, dict[str, str]]:
+        if time.monotonic() < self._open_until:
+            raise APIError("qbreader is unavailable, try again later")
+
+        if self.session is None:
+            await self.start()
+
+        timeout = aiohttp.ClientTimeout(
+            total=self.timeouts.get(endpoint, self.timeouts["default"])
+        )
+        latency = API_LATENCY.labels(endpoint)
+
+        for attempt in range(self.retries + 1):
+            self.requests_sent += 1
+            start = time.perf_counter()
+            try:
+                async with self.session.get(
+                    f"{QBREADER_API}/{endpoint}", params=params, headers=headers, timeout=timeout
+                ) as r:
+                    data = None if r.status == 304 else await r.json()
+                    validators = {
+                        k: r.headers[k] for k in ("ETag", "Last-Modified") if k in r.headers
+                    }
+
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                API_ERRORS.labels(endpoint).inc()
+                client_error = isinstance(e, aiohttp.ClientResponseError) and 400 <= e.status < 500
+                if not client_error:  # a bad request says nothing about qbreader's health
+                    self._record(False)
+                if client_error or attempt == self.retries or time.monotonic() < self._open_until:
+                    raise APIError(f"qbreader request to /{endpoint} failed: {e!r}") from e
+
+                await asyncio.sleep(0.25 * 2**attempt * random.uniform(0.5, 1.5))
+
+            else:
+                latency.observe(time.perf_counter() - start)
+                self._record(True)
+                return data, validators
@@ -0,0 +1,101 @@
+"""Buzz arbitration for multiplayer games."""
+
+import asyncio
+import heapq
+from typing import Callable
+
+import discord
+from lib.router import MessageRouter
+
+
+class BuzzArbiter:
+    """Decide who gets to answer when several players in a channel buzz.
+
+    Buzzes that arrive within `grace` seconds of each other are ordered by their message
+    snowflakes, i.e. by when Discord received them, instead of by when the bot got around to
+    handling them. Players that have been locked out (usually after a neg) can't buzz again.
+
+    The arbiter listens for the whole channel through a single router listener, however many
+    players there are.
+
+    Parameters
+    ----------
+        router : `MessageRouter`
+            Router to listen for buzzes with.
+        channel : `discord.abc.Messageable`
+            Channel the game is played in.
+        is_buzz : `Callable[[discord.Message], bool]`
+            Check for whether a message is a buzz.
+        grace : `float`, default = `0.25`
+            Seconds to wait for near-simultaneous buzzes after the first one arrives.
+        on_buzz : `Callable[[discord.Message], None] | None`, default = `None`
+            Called with every buzz as soon as it arrives, before the grace period, e.g. to record
+            how far the question had been read at the buzz.
+    """
+
+    def __init__(
+        self,
+        router: MessageRouter,
+        channel: discord.abc.Messageable,
+        is_buzz: Callable[[discord.Message], bool],
+        grace: float = 0.25,
+        on_buzz: Callable[[discord.Message], None] | None = None,
+    ):
+        self.router = router
+        self.channel = channel
+        self.is_buzz = is_buzz
+        self.grace = grace
+        self.on_buzz = on_buzz
+
+        self.locked_out: set[int] = set()
+        self._queue: list[tuple[int, discord.Message]] = []  # heap ordered by snowflake
+        self._queued: set[int] = set()  # players with a buzz in the queue
+        self._buzzed = asyncio.Event()
+
+    def _collect(self, message: discord.Message) -> bool:
+        if (
+            message.author.id not in self.locked_out
+            and message.author.id not in self._queued
+            and self.is_buzz(message)
+        ):
+            heapq.heappush(self._queue, (message.id, message))
+            self._queued.add(message.author.id)
+            self._buzzed.set()
+            if self.on_buzz is not None:
+                self.on_buzz(message)
+        return False  # keep listening, buzzes are only taken off the queue by `next`
+
+    async def next(self) -> discord.Message:
+        """Wait for the next buzz to be recognized.
+
+        Returns
+        -------
+            `discord.Message`
+                The earliest buzz from a player that isn't locked out.
+        """
+        while True:
+            if not self._queue:
+                self._buzzed.clear()
+                listener = asyncio.create_task(
+                    self.router.wait_for(self.channel, None, check=self._collect)
+                )
+                try:
+                    await self._buzzed.wait()
+                    await asyncio.sleep(self.grace)
+                finally:
+                    listener.cancel()
+
+            _, message = heapq.heappop(self._queue)
+            self._queued.discard(message.author.id)
+            if message.author.id not in self.locked_out:
+                return message
+
+    def lock_out(self, player: discord.abc.User) -> None:
+        """Stop a player from buzzing again.
+
+        Parameters
+        ----------
+            player : `discord.abc.User`
+                The player to lock out.
+        """
+        self.locked_out.add(player.id)
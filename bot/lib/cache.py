@@ -0,0 +1,247 @@
+"""Async memoization caches.
+
+`TTLCache` lives in the bot's own process. `SQLiteCache` keeps its entries in a local SQLite
+file, so every process of a sharded deployment shares them.
+"""
+
+import asyncio
+import json
+import sqlite3
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Awaitable, Callable, Hashable
+
+from lib.metrics import CACHE_EVICTIONS, CACHE_HITS, CACHE_MISSES, CACHE_SIZE
+
+
+class SharedCache:
+    """Base class for caches of computed values.
+
+    Subclasses implement `_lookup` and `_store`. Concurrent lookups of a missing key are
+    coalesced, so only one computation per key is in flight in each process at a time.
+
+    Parameters
+    ----------
+        name : `str`
+            Name of the cache, used as the `cache` label of its metrics.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.hits = CACHE_HITS.labels(name)
+        self.misses = CACHE_MISSES.labels(name)
+        self.evictions = CACHE_EVICTIONS.labels(name)
+        CACHE_SIZE.labels(name).callback = self.__len__
+
+        self._pending: dict[Hashable, asyncio.Future] = {}
+
+    async def _lookup(self, key: Hashable) -> tuple[bool, object]:
+        raise NotImplementedError
+
+    async def _store(self, key: Hashable, value: object) -> None:
+        raise NotImplementedError
+
+    async def get(self, key: Hashable, compute: Callable[[], Awaitable]) -> object:
+        """Get a cached value, computing and storing it if it's missing or expired.
+
+        Parameters
+        ----------
+            key : `Hashable`
+                Cache key.
+            compute : `Callable[[], Awaitable]`
+                Called to compute the value on a miss.
+
+        Returns
+        -------
+            `object`
+                The cached or freshly computed value.
+        """
+        found, value = await self._lookup(key)
+        if found:
+            self.hits.inc()
+            return value
+
+        if key in self._pending:  # someone is already computing it
+            self.hits.inc()
+            return await asyncio.shield(self._pending[key])
+
+        self.misses.inc()
+        future = asyncio.get_running_loop().create_future()
+        self._pending[key] = future
+        try:
+            value = await compute()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # mark as retrieved in case nobody else was waiting
+            raise
+        else:
+            future.set_result(value)
+            await self._store(key, value)
+            return value
+        finally:
+            del self._pending[key]
+
+    def __len__(self) -> int:  # noqa: D105
+        raise NotImplementedError
+
+    def stats(self) -> dict[str, int]:
+        """Get the hit, miss and eviction counters of the cache.
+
+        Returns
+        -------
+            `dict[str, int]`
+                Counters and current size of the cache.
+        """
+        return {
+            "hits": self.hits.value,
+            "misses": self.misses.value,
+            "evictions": self.evictions.value,
+            "size": len(self),
+        }
+
+    def close(self) -> None:
+        """Release any resources held by the cache."""
+
+
+class TTLCache(SharedCache):
+    """Bounded in-process LRU cache whose entries expire after a fixed time to live.
+
+    Parameters
+    ----------
+        name : `str`
+            Name of the cache, used as the `cache` label of its metrics.
+        size : `int`
+            Maximum number of entries, the least recently used entry is evicted past this.
+        ttl : `float`
+            Seconds an entry stays valid for.
+    """
+
+    def __init__(self, name: str, size: int, ttl: float):
+        super().__init__(name)
+        self.size = size
+        self.ttl = ttl
+
+        self._entries: OrderedDict[Hashable, tuple[float, object]] = OrderedDict()
+
+    async def _lookup(self, key: Hashable) -> tuple[bool, object]:
+        try:
+            expires, value = self._entries[key]
+        except KeyError:
+            return False, None
+
+        if expires < time.monotonic():
+            del self._entries[key]
+            self.evictions.inc()
+            return False, None
+
+        self._entries.move_to_end(key)
+        return True, value
+
+    async def _store(self, key: Hashable, value: object) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.size:
+            self._entries.popitem(last=False)
+            self.evictions.inc()
+
+    def __len__(self) -> int:  # noqa: D105
+        return len(self._entries)
+
+
+class SQLiteCache(SharedCache):
+    """Cache stored in a local SQLite database that several processes can share.
+
+    Keys and values have to be JSON serializable, and tuples come back as lists. Past `size`
+    entries, the entries closest to expiring are evicted first.
+
+    Parameters
+    ----------
+        name : `str`
+            Name of the cache, used as the `cache` label of its metrics.
+        path : `str`
+            Path to the SQLite database, created if it doesn't exist.
+        size : `int`
+            Maximum number of entries.
+        ttl : `float`
+            Seconds an entry stays valid for.
+    """
+
+    TRIM_EVERY = 100  # stores between evictions
+
+    def __init__(self, name: str, path: str, size: int, ttl: float):
+        super().__init__(name)
+        self.path = path
+        self.size = size
+        self.ttl = ttl
+
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="cache")
+        self._db: sqlite3.Connection | None = None
+        self._stores = 0
+
+    async def _run(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._db is None:
+            self._db = sqlite3.connect(self.path, timeout=5, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS cache "
+                "(key TEXT PRIMARY KEY, expires REAL NOT NULL, value TEXT NOT NULL)"
+            )
+        return self._db
+
+    def _select(self, key: str) -> tuple[float, str] | None:
+        return (
+            self._connect()
+            .execute("SELECT expires, value FROM cache WHERE key = ?", (key,))
+            .fetchone()
+        )
+
+    def _insert(self, key: str, value: str, trim: bool) -> int:
+        db = self._connect()
+        with db:
+            db.execute(
+                "INSERT OR REPLACE INTO cache VALUES (?, ?, ?)",
+                (key, time.time() + self.ttl, value),
+            )
+            if not trim:
+                return 0
+            (count,) = db.execute("SELECT COUNT(*) FROM cache").fetchone()
+            return db.execute(
+                "DELETE FROM cache WHERE key IN "
+                "(SELECT key FROM cache ORDER BY expires LIMIT ?)",
+                (max(0, count - self.size),),
+            ).rowcount
+
+    async def _lookup(self, key: Hashable) -> tuple[bool, object]:
+        row = await self._run(self._select, json.dumps(key))
+        if row is None or row[0] < time.time():
+            return False, None
+        return True, json.loads(row[1])
+
+    async def _store(self, key: Hashable, value: object) -> None:
+        self._stores += 1
+        self.evictions.inc(
+            await self._run(
+                self._insert,
+                json.dumps(key),
+                json.dumps(value),
+                self._stores % self.TRIM_EVERY == 0,
+            )
+        )
+
+    def __len__(self) -> int:  # noqa: D105
+        (count,) = self._connect().execute("SELECT COUNT(*) FROM cache").fetchone()
+        return count
+
+    def close(self) -> None:  # noqa: D102
+        if self._db is not None:
+            self._executor.submit(self._db.close)  # after any query still queued
+            self._db = None
+        self._executor.shutdown(wait=False)
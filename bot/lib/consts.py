@@ -34,14 +34,48 @@ if not os.path.exists(CONFIG_PATH):
         with open("config_default.json") as default:
             f.write(default.read())
 
-with open(CONFIG_PATH) as f:
+with open("config_default.json") as f:
     config = load(f)
 
+with open(CONFIG_PATH) as f:
+    # fields missing from older config files fall back to the defaults, also inside sections
+    for key, value in load(f).items():
+        if isinstance(value, dict) and isinstance(config.get(key), dict):
+            config[key] |= value
+        else:
+            config[key] = value
+
 PREFIX = config["prefix"]
 C_NEUTRAL = int(config["embed_colors"]["neutral"], 16)
 C_ERROR = int(config["embed_colors"]["error"], 16)
 C_SUCCESS = int(config["embed_colors"]["success"], 16)
 
+READING_SPEED = config["reading_speed"]  # words per second
+
+ANSWER_CACHE_SIZE = config["answer_cache"]["size"]
+ANSWER_CACHE_TTL = config["answer_cache"]["ttl"]
+
+CORPUS_PATH = config["corpus"]
+STATS_PATH = config["stats_db"]
+PACKET_CACHE_PATH = config["packet_cache"]
+SET_INDEX_PATH = config["set_index"]
+SHARED_CACHE_PATH = config["shared_cache"]
+METRICS_PORT = config["metrics_port"]
+PROFILER_THRESHOLD = config["profiler_threshold"]
+
+CLIENT_PROFILE = config["client_profile"]
+
+if CLIENT_PROFILE not in ("minimal", "full"):
+    print("client_profile has to be either 'minimal' or 'full'")
+    exit(1)
+
+SHARD_COUNT = config["sharding"]["shard_count"]
+SHARD_PROCESSES = config["sharding"]["processes"]
+
+if SHARD_PROCESSES > 1 and SHARD_COUNT is None:
+    print("sharding.shard_count has to be set to run the bot in several processes")
+    exit(1)
+
 QBREADER_API = "https://www.qbreader.org/api"
 
 CATEGORIES = [
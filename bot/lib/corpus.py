@@ -0,0 +1,184 @@
+"""Offline question corpus.
+
+A corpus is a SQLite database of tossups and bonuses in the same format as the qbreader API
+returns them. Every question gets a dense rank within its (subcategory, difficulty) group, so a
+random question for any filter is a single indexed lookup.
+
+Build one from qbreader dumps (JSON arrays or JSON lines) by running, from the `bot` directory:
+
+    python -m lib.corpus corpus.db --tossups tossups.json --bonuses bonuses.json
+"""
+
+import argparse
+import json
+import random
+import sqlite3
+from collections import defaultdict
+from functools import cache
+
+from lib.filters import QuestionFilter
+from lib.sources import QuestionSource
+
+TABLES = ("tossups", "bonuses")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS {table} (
+    subcategory TEXT NOT NULL,
+    difficulty INTEGER NOT NULL,
+    three_part INTEGER NOT NULL,
+    rank INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (subcategory, difficulty, three_part, rank)
+) WITHOUT ROWID
+"""
+
+
+class Corpus:
+    """Read-only handle to a question corpus.
+
+    Parameters
+    ----------
+        path : `str`
+            Path to the SQLite database.
+    """
+
+    def __init__(self, path: str):
+        self.db = sqlite3.connect(f"file:{path}?mode=ro", uri=True, check_same_thread=False)
+
+        # (subcategory, difficulty, three_part) -> number of questions, per table
+        self.groups: dict[str, dict[tuple[str, int, int], int]] = {}
+        for table in TABLES:
+            self.groups[table] = {
+                (subcategory, difficulty, three_part): count
+                for subcategory, difficulty, three_part, count in self.db.execute(
+                    f"SELECT subcategory, difficulty, three_part, COUNT(*) FROM {table} "
+                    "GROUP BY subcategory, difficulty, three_part"
+                )
+            }
+
+    def random(self, table: str, filters: QuestionFilter) -> dict:
+        """Get a random question matching the given filter.
+
+        Parameters
+        ----------
+            table : `str`
+                Either `"tossups"` or `"bonuses"`.
+            filters : `QuestionFilter`
+                Filter the question has to match.
+
+        Returns
+        -------
+            `dict`
+                A question in the same format as returned by the qbreader API.
+
+        Raises
+        ------
+            `LookupError`
+                No question in the corpus matches the filter.
+        """
+        groups = [
+            (group, count)
+            for group, count in self.groups[table].items()
+            if (not filters.subcategories or group[0] in filters.subcategories)
+            and (not filters.difficulties or group[1] in filters.difficulties)
+            and (not filters.three_part_bonuses or group[2])
+        ]
+        if not groups:
+            raise LookupError("No questions match the given filters")
+
+        # pick a group weighted by size, then a uniformly random question inside it
+        index = random.randrange(sum(count for _, count in groups))
+        for group, count in groups:
+            if index < count:
+                break
+            index -= count
+
+        (data,) = self.db.execute(
+            f"SELECT data FROM {table} "
+            "WHERE subcategory = ? AND difficulty = ? AND three_part = ? AND rank = ?",
+            (*group, index),
+        ).fetchone()
+        return json.loads(data)
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self.db.close()
+
+
+@cache
+def open_corpus(path: str) -> Corpus:
+    """Open a corpus, sharing the handle between everything that uses the same path."""
+    return Corpus(path)
+
+
+class CorpusSource(QuestionSource):
+    """Question source backed by a local corpus.
+
+    Parameters
+    ----------
+        path : `str`
+            Path to the SQLite database.
+        table : `str`
+            Either `"tossups"` or `"bonuses"`.
+    """
+
+    def __init__(self, path: str, table: str):
+        self.corpus = open_corpus(path)
+        self.table = table
+
+    async def get(self, filters: QuestionFilter) -> dict:  # noqa: D102
+        return self.corpus.random(self.table, filters)
+
+
+def build_corpus(path: str, dumps: dict[str, str]) -> None:
+    """Build a corpus from qbreader question dumps.
+
+    Parameters
+    ----------
+        path : `str`
+            Path to write the SQLite database to, existing questions are replaced.
+        dumps : `dict[str, str]`
+            Paths to JSON or JSON lines files of questions, keyed by table.
+    """
+    db = sqlite3.connect(path)
+
+    for table, dump in dumps.items():
+        with open(dump) as f:
+            text = f.read()
+
+        try:
+            questions = json.loads(text)
+        except json.JSONDecodeError:
+            questions = [json.loads(line) for line in text.splitlines() if line.strip()]
+
+        ranks = defaultdict(int)
+        rows = []
+        for question in questions:
+            group = (
+                question.get("subcategory") or question["category"],
+                int(question.get("difficulty") or 0),
+                int(table == "bonuses" and len(question["parts"]) == 3),
+            )
+            rows.append((*group, ranks[group], json.dumps(question)))
+            ranks[group] += 1
+
+        db.execute(f"DROP TABLE IF EXISTS {table}")
+        db.execute(SCHEMA.format(table=table))
+        db.executemany(f"INSERT INTO {table} VALUES (?, ?, ?, ?, ?)", rows)
+        db.commit()
+        print(f"imported {len(rows)} {table}")
+
+    for table in TABLES:  # make sure both tables exist even if only one dump was given
+        db.execute(SCHEMA.format(table=table))
+    db.commit()
+    db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="build a question corpus from qbreader dumps")
+    parser.add_argument("path", help="path to the corpus database")
+    parser.add_argument("--tossups", help="tossup dump (JSON or JSON lines)")
+    parser.add_argument("--bonuses", help="bonus dump (JSON or JSON lines)")
+    args = parser.parse_args()
+
+    build_corpus(args.path, {t: d for t in TABLES if (d := getattr(args, t)) is not None})
@@ -0,0 +1,163 @@
+"""Rate limit aware message edit scheduling."""
+
+import asyncio
+import time
+from collections import OrderedDict
+
+import discord
+from lib.metrics import EDIT_LATENCY, EDIT_RATE_LIMITS
+
+
+class _Bucket:
+    """Token bucket mirroring Discord's per-channel message edit rate limit."""
+
+    def __init__(self, rate: int, per: float):
+        self.rate = rate
+        self.per = per
+        self.tokens = float(rate)
+        self.updated = time.monotonic()
+
+    def refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.rate, self.tokens + (now - self.updated) * self.rate / self.per)
+        self.updated = now
+
+    async def acquire(self) -> None:
+        self.refill()
+        if self.tokens < 1:
+            await asyncio.sleep((1 - self.tokens) * self.per / self.rate)
+            self.refill()
+        self.tokens -= 1
+
+    def drain(self) -> None:
+        self.tokens = 0
+        self.updated = time.monotonic()
+
+
+class EditScheduler:
+    """Schedule message edits per channel within Discord's rate limits.
+
+    Edits are sent one at a time per channel, paced by a token bucket so discord.py never has to
+    sit out a 429. If several edits to the same message are waiting, only the latest one is sent.
+
+    Parameters
+    ----------
+        rate : `int`, default = `5`
+            Number of edits allowed per channel in each `per` second window.
+        per : `float`, default = `5`
+            Length of the rate limit window in seconds.
+
+    Attributes
+    ----------
+        latency : `float`
+            Moving average of how long an edit takes to show up, leaving out rate limited ones.
+    """
+
+    def __init__(self, rate: int = 5, per: float = 5):
+        self.rate = rate
+        self.per = per
+        self.latency = 0.0
+
+        self._buckets: dict[int, _Bucket] = {}
+        self._pending: dict[int, OrderedDict[int, tuple[discord.Message, dict, list]]] = {}
+        self._workers: dict[int, asyncio.Task] = {}
+
+    def edit(self, message: discord.Message, **fields) -> asyncio.Future:
+        """Schedule an edit of a message.
+
+        Parameters
+        ----------
+            message : `discord.Message`
+                The message to edit.
+            **fields
+                Keyword arguments for `discord.Message.edit`.
+
+        Returns
+        -------
+            `asyncio.Future`
+                Resolves once the message shows this edit or a later one. It doesn't need to be
+                awaited.
+        """
+        future = asyncio.get_running_loop().create_future()
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())  # never unretrieved
+
+        channel_id = message.channel.id
+        pending = self._pending.setdefault(channel_id, OrderedDict())
+
+        if message.id in pending:  # coalesce into the edit that's already waiting
+            futures = pending[message.id][2]
+            futures.append(future)
+            pending[message.id] = (message, fields, futures)
+        else:
+            pending[message.id] = (message, fields, [future])
+
+        if channel_id not in self._workers:
+            self._workers[channel_id] = asyncio.create_task(self._work(channel_id))
+
+        return future
+
+    def saturated(self, channel_id: int) -> bool:
+        """Check whether a channel has used up its edits for now.
+
+        Parameters
+        ----------
+            channel_id : `int`
+                ID of the channel.
+
+        Returns
+        -------
+            `bool`
+                `True` if a new edit in the channel would have to wait for the rate limit.
+        """
+        bucket = self._buckets.get(channel_id)
+        if bucket is None:
+            return False
+        bucket.refill()
+        return bucket.tokens < 1
+
+    async def _work(self, channel_id: int) -> None:
+        bucket = self._buckets.setdefault(channel_id, _Bucket(self.rate, self.per))
+        pending = self._pending[channel_id]
+
+        try:
+            while pending:
+                await bucket.acquire()
+                message, fields, futures = pending.popitem(last=False)[1]
+
+                start = time.monotonic()
+                try:
+                    await message.edit(**fields)
+                except Exception as e:
+                    if isinstance(e, discord.HTTPException) and e.status == 429:
+                        EDIT_RATE_LIMITS.inc()
+                        bucket.drain()
+                    for future in futures:
+                        if not future.done():  # the caller may have been cancelled
+                            future.set_exception(e)
+                else:
+                    for future in futures:
+                        if not future.done():
+                            future.set_result(None)
+
+                elapsed = time.monotonic() - start
+                EDIT_LATENCY.observe(elapsed)
+                if elapsed > self.per / self.rate:
+                    # discord.py waited out a rate limit we didn't know about
+                    EDIT_RATE_LIMITS.inc()
+                    bucket.drain()
+                else:
+                    self.latency += (elapsed - self.latency) * 0.2
+
+        finally:
+            del self._workers[channel_id]
+            if not pending:
+                del self._pending[channel_id]
+            # the bucket is full again after one window, forget it then unless the channel is busy
+            asyncio.get_running_loop().call_later(self.per, self._forget, channel_id)
+
+    def _forget(self, channel_id: int) -> None:
+        bucket = self._buckets.get(channel_id)
+        if channel_id not in self._workers and bucket is not None:
+            bucket.refill()
+            if bucket.tokens >= self.rate:
+                del self._buckets[channel_id]
@@ -0,0 +1,48 @@
+"""Question filters."""
+
+from dataclasses import dataclass, field
+from functools import cached_property
+from urllib.parse import urlencode
+
+
+@dataclass(frozen=True)
+class QuestionFilter:
+    """Immutable, hashable filter for random questions.
+
+    Difficulties and subcategories are kept sorted, so equal filters always compare and hash
+    equal. This makes a filter usable as a key for request caches, question pools and metrics.
+
+    Attributes
+    ----------
+        difficulties : `tuple[int, ...]`
+            Allowed difficulties, any difficulty if empty.
+        subcategories : `tuple[str, ...]`
+            Allowed subcategories, any subcategory if empty.
+        three_part_bonuses : `bool`
+            Only allow bonuses with exactly three parts.
+    """
+
+    difficulties: tuple[int, ...] = ()
+    subcategories: tuple[str, ...] = ()
+    three_part_bonuses: bool = field(default=False, kw_only=True)
+
+    def __post_init__(self):  # noqa: D105
+        object.__setattr__(self, "difficulties", tuple(sorted(set(self.difficulties))))
+        object.__setattr__(self, "subcategories", tuple(sorted(set(self.subcategories))))
+
+    @cached_property
+    def params(self) -> dict:
+        """Parameters for a request to the random question API."""
+        params = {}
+        if self.difficulties:
+            params["difficulties"] = list(self.difficulties)
+        if self.subcategories:
+            params["subcategories"] = list(self.subcategories)
+        if self.three_part_bonuses:
+            params["threePartBonuses"] = "true"
+        return params
+
+    @cached_property
+    def query(self) -> str:
+        """URL encoded query string of `params`, encoded once per filter."""
+        return urlencode(self.params, doseq=True)
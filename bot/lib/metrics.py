@@ -0,0 +1,293 @@
+"""In-process metrics, exposed in the Prometheus text format.
+
+Metrics are module level, so any module can record to them without a reference to the bot.
+Every label combination used on a hot path is created up front, so recording a value is a dict
+lookup and an integer increment.
+"""
+
+import asyncio
+import bisect
+import time
+from datetime import datetime
+from typing import Callable
+
+from aiohttp import web
+from discord.ext.commands import Context
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+
+class Counter:
+    """Monotonically increasing count."""
+
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, amount: int = 1) -> None:
+        """Increase the count."""
+        self.value += amount
+
+    def samples(self, name: str, labels: str) -> list[str]:  # noqa: D102
+        return [f"{name}{labels} {self.value}"]
+
+
+class Gauge:
+    """Value that goes up and down, or is read from a callback when scraped."""
+
+    __slots__ = ("value", "callback")
+
+    def __init__(self):
+        self.value = 0
+        self.callback: Callable[[], float] | None = None
+
+    def set(self, value: float) -> None:
+        """Set the value."""
+        self.value = value
+
+    def inc(self, amount: float = 1) -> None:
+        """Increase the value."""
+        self.value += amount
+
+    def dec(self, amount: float = 1) -> None:
+        """Decrease the value."""
+        self.value -= amount
+
+    def samples(self, name: str, labels: str) -> list[str]:  # noqa: D102
+        value = self.callback() if self.callback is not None else self.value
+        return [f"{name}{labels} {value}"]
+
+
+class Histogram:
+    """Distribution of observed values over fixed buckets."""
+
+    __slots__ = ("buckets", "counts", "sum")
+
+    def __init__(self, buckets: tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # the last one is +Inf
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        """Record a value."""
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+    def samples(self, name: str, labels: str) -> list[str]:  # noqa: D102
+        inner = labels[1:-1] + "," if labels else ""
+        lines = []
+        total = 0
+        for bound, count in zip((*self.buckets, "+Inf"), self.counts):
+            total += count
+            lines.append(f'{name}_bucket{{{inner}le="{bound}"}} {total}')
+        lines.append(f"{name}_sum{labels} {self.sum}")
+        lines.append(f"{name}_count{labels} {total}")
+        return lines
+
+
+class Family:
+    """A metric and its children, one per combination of label values.
+
+    Parameters
+    ----------
+        kind : `type`
+            `Counter`, `Gauge` or `Histogram`.
+        name : `str`
+            Name of the metric.
+        description : `str`
+            Help text of the metric.
+        labelnames : `tuple[str, ...]`, default = `()`
+            Names of the labels, a metric without labels has a single child.
+        preallocate : `tuple[tuple[str, ...], ...]`, default = `()`
+            Label values to create children for up front.
+    """
+
+    TYPES = {Counter: "counter", Gauge: "gauge", Histogram: "histogram"}
+
+    def __init__(
+        self,
+        kind: type,
+        name: str,
+        description: str,
+        labelnames: tuple[str, ...] = (),
+        preallocate: tuple[tuple[str, ...], ...] = (),
+    ):
+        self.kind = kind
+        self.name = name
+        self.description = description
+        self.labelnames = labelnames
+
+        self.children: dict[tuple[str, ...], Counter | Gauge | Histogram] = {}
+        for values in preallocate if labelnames else ((),):
+            self.labels(*values)
+
+    def labels(self, *values: str) -> Counter | Gauge | Histogram:
+        """Get the child for some label values, creating it on first use."""
+        child = self.children.get(values)
+        if child is None:
+            child = self.children[values] = self.kind()
+        return child
+
+    def __getattr__(self, attr: str):  # noqa: D105
+        # forward inc, observe... on metrics without labels
+        if attr.startswith("_") or "children" not in self.__dict__:
+            raise AttributeError(attr)
+        return getattr(self.children[()], attr)
+
+    def render(self) -> list[str]:
+        """Render every child in the Prometheus text format."""
+        lines = [
+            f"# HELP {self.name} {self.description}",
+            f"# TYPE {self.name} {self.TYPES[self.kind]}",
+        ]
+        for values, child in self.children.items():
+            labels = ",".join(f'{k}="{v}"' for k, v in zip(self.labelnames, values))
+            lines.extend(child.samples(self.name, f"{{{labels}}}" if labels else ""))
+        return lines
+
+
+ENDPOINTS = (
+    ("random-tossup",),
+    ("random-bonus",),
+    ("check-answer",),
+    ("packet",),
+    ("set-list",),
+    ("num-packets",),
+)
+SESSION_KINDS = (("tk",), ("pk",), ("mtk",), ("packet",))
+
+API_LATENCY = Family(
+    Histogram,
+    "qbreader_request_seconds",
+    "Latency of requests to the qbreader API.",
+    ("endpoint",),
+    ENDPOINTS,
+)
+API_ERRORS = Family(
+    Counter,
+    "qbreader_request_errors_total",
+    "Failed requests to the qbreader API.",
+    ("endpoint",),
+    ENDPOINTS,
+)
+API_COALESCED = Family(
+    Counter,
+    "qbreader_requests_coalesced_total",
+    "Requests to the qbreader API answered by an identical request already in flight.",
+    ("endpoint",),
+    ENDPOINTS,
+)
+CHECK_ANSWER_LATENCY = Family(
+    Histogram,
+    "check_answer_seconds",
+    "Latency of answer checks.",
+    ("checked",),
+    (("local",), ("remote",)),
+)
+EDIT_LATENCY = Family(Histogram, "discord_edit_seconds", "Latency of message edits.")
+EDIT_RATE_LIMITS = Family(
+    Counter, "discord_edit_rate_limited_total", "Message edits that hit a rate limit."
+)
+FIRST_QUESTION = Family(
+    Histogram,
+    "first_question_seconds",
+    "Time from a command to the first question it shows.",
+)
+SESSIONS = Family(Gauge, "sessions_active", "Running game sessions.", ("kind",), SESSION_KINDS)
+LISTENERS = Family(Gauge, "router_listeners", "Pending message listeners.")
+LOOP_LAG = Family(Gauge, "event_loop_lag_seconds", "How late the event loop last woke up.")
+CACHE_HITS = Family(Counter, "cache_hits_total", "Cache lookups found in the cache.", ("cache",))
+CACHE_MISSES = Family(
+    Counter, "cache_misses_total", "Cache lookups that had to be computed.", ("cache",)
+)
+CACHE_EVICTIONS = Family(
+    Counter, "cache_evictions_total", "Cache entries evicted or expired.", ("cache",)
+)
+CACHE_SIZE = Family(Gauge, "cache_entries", "Entries in a cache.", ("cache",))
+
+REGISTRY = (
+    API_LATENCY,
+    API_ERRORS,
+    API_COALESCED,
+    CHECK_ANSWER_LATENCY,
+    EDIT_LATENCY,
+    EDIT_RATE_LIMITS,
+    FIRST_QUESTION,
+    SESSIONS,
+    LISTENERS,
+    LOOP_LAG,
+    CACHE_HITS,
+    CACHE_MISSES,
+    CACHE_EVICTIONS,
+    CACHE_SIZE,
+)
+
+
+def record_first_question(ctx: Context, shown_at: datetime) -> None:
+    """Record the time from a command to the first question it shows, once per command.
+
+    Both times are Discord timestamps, so the bot's clock doesn't matter.
+
+    Parameters
+    ----------
+        ctx : `discord.ext.commands.Context`
+            Context of the command.
+        shown_at : `datetime.datetime`
+            Creation time of the question's message.
+    """
+    if getattr(ctx, "first_question_shown", False):
+        return
+    ctx.first_question_shown = True
+    FIRST_QUESTION.observe((shown_at - ctx.message.created_at).total_seconds())
+
+
+def render() -> str:
+    """Render every metric in the Prometheus text format."""
+    return "\n".join(line for family in REGISTRY for line in family.render()) + "\n"
+
+
+class MetricsServer:
+    """Serve the metrics over HTTP and sample the event loop lag.
+
+    Parameters
+    ----------
+        port : `int`
+            Port to listen on, only on localhost.
+        interval : `float`, default = `1`
+            Seconds between event loop lag samples.
+    """
+
+    def __init__(self, port: int, interval: float = 1):
+        self.port = port
+        self.interval = interval
+
+        self._runner: web.AppRunner | None = None
+        self._sampler: asyncio.Task | None = None
+
+    async def _serve(self, request: web.Request) -> web.Response:
+        return web.Response(text=render(), content_type="text/plain", charset="utf-8")
+
+    async def _sample_lag(self) -> None:
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            LOOP_LAG.set(max(0.0, time.perf_counter() - start - self.interval))
+
+    async def start(self) -> None:
+        """Start serving on `/metrics`."""
+        app = web.Application()
+        app.router.add_get("/metrics", self._serve)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, "127.0.0.1", self.port).start()
+        self._sampler = asyncio.create_task(self._sample_lag())
+
+    async def close(self) -> None:
+        """Stop serving."""
+        if self._sampler is not None:
+            self._sampler.cancel()
+            self._sampler = None
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
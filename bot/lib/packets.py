@@ -0,0 +1,125 @@
+"""Packet playback."""
+
+import asyncio
+import json
+import os
+import re
+import tempfile
+from collections import deque
+
+from lib.api import QBReaderClient
+from lib.filters import QuestionFilter
+from lib.sources import QuestionSource
+
+
+class PacketCache:
+    """Fetch whole packets from the qbreader API, keeping a copy of each on disk.
+
+    A packet is only ever requested once. Later games read it back from `directory`, and
+    nothing is kept in memory between games.
+
+    Parameters
+    ----------
+        client : `QBReaderClient`
+            Client to make requests with.
+        directory : `str`
+            Directory to store packets in, created if it doesn't exist.
+    """
+
+    def __init__(self, client: QBReaderClient, directory: str):
+        self.client = client
+        self.directory = directory
+
+    def _path(self, set_name: str, number: int) -> str:
+        slug = re.sub(r"[^\w-]+", "_", set_name.lower()).strip("_")
+        return os.path.join(self.directory, f"{slug}-{number}.json")
+
+    def _read(self, path: str) -> dict | None:
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def _write(self, path: str, packet: dict) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        # every writer gets its own temporary file, so concurrent writes of a packet from
+        # several processes can't truncate each other's
+        fd, tmp = tempfile.mkstemp(
+            prefix=f"{os.path.basename(path)}.", suffix=".tmp", dir=self.directory
+        )
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(packet, f)
+            os.replace(tmp, path)  # a half written file is never read
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    async def get(self, set_name: str, number: int) -> dict:
+        """Get the tossups and bonuses of a packet.
+
+        Parameters
+        ----------
+            set_name : `str`
+                Name of the set, e.g. `"2023 ACF Regionals"`.
+            number : `int`
+                Number of the packet within the set.
+
+        Returns
+        -------
+            `dict`
+                The packet, with `"tossups"` and `"bonuses"` lists in reading order.
+
+        Raises
+        ------
+            `LookupError`
+                The set or packet doesn't exist.
+        """
+        path = self._path(set_name, number)
+
+        packet = await asyncio.to_thread(self._read, path)
+        if packet is not None:
+            return packet
+
+        data = await self.client.get("packet", {"setName": set_name, "packetNumber": number})
+        packet = {"tossups": data.get("tossups", []), "bonuses": data.get("bonuses", [])}
+        if not packet["tossups"]:
+            raise LookupError(f"Packet {number} of {set_name} not found")
+
+        await asyncio.to_thread(self._write, path, packet)
+        return packet
+
+
+class PacketSource(QuestionSource):
+    """Question source that hands out the questions of a packet in reading order.
+
+    Filters are ignored. Questions are dropped once they have been handed out, so a game only
+    holds on to what's left of its packet.
+
+    Parameters
+    ----------
+        questions : `list[dict]`
+            Tossups or bonuses of the packet, in reading order.
+    """
+
+    def __init__(self, questions: list[dict]):
+        self._questions = deque(questions)
+
+    def __len__(self) -> int:  # noqa: D105
+        return len(self._questions)
+
+    async def get(self, filters: QuestionFilter | None = None) -> dict:
+        """Get the next question of the packet.
+
+        Raises
+        ------
+            `LookupError`
+                Every question of the packet has been handed out.
+        """
+        if not self._questions:
+            raise LookupError("No questions left in the packet")
+        return self._questions.popleft()
+
+    def close(self) -> None:  # noqa: D102
+        self._questions.clear()
@@ -0,0 +1,112 @@
+"""Prefetched question pool."""
+
+import asyncio
+import time
+from collections import deque
+
+from discord.ext.commands import Bot
+from lib.filters import QuestionFilter
+from lib.sources import QuestionSource
+
+
+class QuestionPool(QuestionSource):
+    """Pool of questions fetched ahead of time from a random question endpoint.
+
+    A few questions are kept ready for every filter that has been used recently, and the pool is
+    refilled in the background in a single bulk request whenever it runs low. Filters that have
+    not been used for `idle_timeout` seconds are dropped.
+
+    Parameters
+    ----------
+        bot : `discord.ext.commands.Bot`
+            Bot instance, used for its API client.
+        endpoint : `str`
+            Name of the API endpoint, e.g. `"random-tossup"`.
+        field : `str`
+            Key of the question list in the API response, e.g. `"tossups"`.
+        size : `int`, default = `5`
+            Number of questions to keep ready per filter.
+        idle_timeout : `float`, default = `600`
+            Seconds a filter can go unused before it is evicted.
+    """
+
+    def __init__(
+        self, bot: Bot, endpoint: str, field: str, size: int = 5, idle_timeout: float = 600
+    ):
+        self.bot = bot
+        self.endpoint = endpoint
+        self.field = field
+        self.size = size
+        self.idle_timeout = idle_timeout
+
+        self._questions: dict[QuestionFilter, deque] = {}
+        self._last_used: dict[QuestionFilter, float] = {}
+        self._refills: dict[QuestionFilter, asyncio.Task] = {}
+
+    async def _fetch(self, filters: QuestionFilter, number: int) -> list[dict]:
+        query = f"{filters.query}&number={number}" if filters.query else f"number={number}"
+        return (await self.bot.api.get(self.endpoint, query))[self.field]
+
+    async def _refill(self, filters: QuestionFilter) -> None:
+        try:
+            questions = self._questions.setdefault(filters, deque())
+            missing = self.size - len(questions)
+            if missing > 0:
+                questions.extend(await self._fetch(filters, missing))
+        finally:
+            del self._refills[filters]
+
+    def _schedule_refill(self, filters: QuestionFilter) -> asyncio.Task:
+        if filters not in self._refills:
+            task = self._refills[filters] = asyncio.create_task(self._refill(filters))
+            # nobody waits on a refill started in the background, and if it fails `get` fetches
+            # again once the pool is empty
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        return self._refills[filters]
+
+    def _evict(self, now: float) -> None:
+        for filters, last_used in list(self._last_used.items()):
+            if now - last_used > self.idle_timeout and filters not in self._refills:
+                del self._last_used[filters]
+                self._questions.pop(filters, None)
+
+    async def get(self, filters: QuestionFilter) -> dict:
+        """Get a question matching the given filter.
+
+        Parameters
+        ----------
+            filters : `QuestionFilter`
+                Filter the question has to match.
+
+        Returns
+        -------
+            `dict`
+                A question as returned by the API.
+        """
+        now = time.monotonic()
+        self._evict(now)
+        self._last_used[filters] = now
+
+        questions = self._questions.get(filters)
+        if not questions:
+            await asyncio.shield(self._schedule_refill(filters))
+            questions = self._questions.get(filters)
+
+        if not questions:  # refill came back empty, ask for a single question instead
+            return (await self._fetch(filters, 1))[0]
+
+        question = questions.popleft()
+        if len(questions) <= self.size // 2:
+            self._schedule_refill(filters)
+        return question
+
+    async def get_many(self, filters: QuestionFilter, number: int) -> list[dict]:  # noqa: D102
+        # bulk requests for sessions skip the pool, it only holds a few questions per filter
+        return await self._fetch(filters, number)
+
+    def close(self) -> None:
+        """Cancel all pending refills and drop every pooled question."""
+        for task in self._refills.values():
+            task.cancel()
+        self._questions.clear()
+        self._last_used.clear()
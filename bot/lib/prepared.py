@@ -0,0 +1,229 @@
+"""Questions prepared for playing.
+
+Everything about a question that doesn't depend on how the game goes is worked out once, when
+the question is fetched, instead of on every reveal.
+"""
+
+from dataclasses import dataclass, field
+
+import discord
+from lib.consts import C_NEUTRAL
+from lib.render import to_markdown
+
+
+def reveal_offsets(text: str, chunk_size: int, watch_power: bool = True) -> list[int]:
+    """Find where each reveal of a tossup ends.
+
+    Word offsets are found in a single pass.
+
+    Parameters
+    ----------
+        text : `str`
+            The tossup text, stripped and on a single line.
+        chunk_size : `int`
+            The number of words to include in each reveal.
+        watch_power : `bool`, default = `True`
+            Stop an extra time right on the power mark.
+
+    Returns
+    -------
+        `list[int]`
+            Offsets of the end of each reveal, so `text[:offset]` is what has been read. The last
+            one is the end of the text.
+
+    Examples
+    --------
+    >>> text = "In quantum mechanics, the square of this quantity is equal to h-bar..."
+    >>> [text[:end] for end in reveal_offsets(text, 4)]
+    [
+        "In quantum mechanics, the",
+        "In quantum mechanics, the square of this quantity",
+        "In quantum mechanics, the square of this quantity is equal to h-bar...",
+    ]
+    """
+    ends = []  # offset of the end of each word
+    power = None  # index of the first "(*)" word
+    start = 0
+    while (end := text.find(" ", start)) != -1:
+        if power is None and end - start == 3 and text.startswith("(*)", start):
+            power = len(ends)
+        ends.append(end)
+        start = end + 1
+    if power is None and len(text) - start == 3 and text.startswith("(*)", start):
+        power = len(ends)
+    ends.append(len(text))
+
+    if not watch_power:
+        power = None
+
+    offsets = []
+    for i in range(0, len(ends), chunk_size):
+        end = ends[min(i + chunk_size, len(ends)) - 1]
+
+        if power is not None and power < i + chunk_size:
+            if not text.endswith("(*)", 0, end):
+                offsets.append(ends[power])
+
+            power = None
+
+        offsets.append(end)
+
+    return offsets
+
+
+def _footer(question: dict, kind: str) -> str:
+    return " | ".join(
+        [
+            question["setName"],
+            f"Packet {question['packetNumber']}",
+            f"{kind} {question['questionNumber']}",
+            f"Difficulty {question['difficulty']}",
+        ]
+    )
+
+
+@dataclass
+class PreparedTossup:
+    """A tossup ready to be read.
+
+    Attributes
+    ----------
+        data : `dict`
+            The tossup, as returned by the API.
+        text : `str`
+            The tossup text on a single line.
+        reveals : `list[int]`
+            Offsets of the end of each reveal, see `reveal_offsets`.
+        words : `list[int]`
+            Number of words read by the end of each reveal, for pacing them.
+        star : `int`
+            Offset of the first `*`, usually the power mark, or `-1` if there is none.
+        footer : `str`
+            Footer of the tossup embed.
+        answer : `str`
+            The formatted answerline.
+        markdown : `str`
+            The answerline as markdown.
+        embed : `discord.Embed`
+            The tossup embed. Every reveal patches its description in place, so all edits of the
+            tossup share a single embed.
+    """
+
+    data: dict
+    text: str
+    reveals: list[int]
+    words: list[int]
+    star: int
+    footer: str
+    answer: str
+    markdown: str
+    embed: discord.Embed = field(repr=False)
+
+    @classmethod
+    async def prepare(cls, tossup: dict) -> "PreparedTossup":
+        """Prepare a tossup.
+
+        Parameters
+        ----------
+            tossup : `dict`
+                The tossup, as returned by the API.
+        """
+        text = tossup["question"].strip().replace("\n", " ")
+        footer = _footer(tossup, "Tossup")
+        answer = tossup.get("formatted_answer", tossup["answer"])
+
+        reveals = reveal_offsets(text, 5)
+        words = []
+        read = 1
+        start = 0
+        for end in reveals:
+            read += text.count(" ", start, end)
+            words.append(read)
+            start = end
+
+        embed = discord.Embed(title="Tossup", description="", color=C_NEUTRAL)
+        embed.set_footer(text=footer)
+
+        return cls(
+            data=tossup,
+            text=text,
+            reveals=reveals,
+            words=words,
+            star=text.find("*"),
+            footer=footer,
+            answer=answer,
+            markdown=await to_markdown(answer),
+            embed=embed,
+        )
+
+    def show(self, end: int | None = None) -> discord.Embed:
+        """Get the tossup embed revealed up to an offset.
+
+        Parameters
+        ----------
+            end : `int | None`, default = `None`
+                Offset to reveal up to, the whole tossup if `None`.
+
+        Returns
+        -------
+            `discord.Embed`
+                The shared tossup embed.
+        """
+        self.embed.description = self.text if end is None else self.text[:end]
+        return self.embed
+
+
+@dataclass(frozen=True)
+class PreparedBonus:
+    """A bonus ready to be read.
+
+    Attributes
+    ----------
+        data : `dict`
+            The bonus, as returned by the API.
+        leadin : `discord.Embed`
+            The leadin embed, with the category and footer.
+        parts : `list[discord.Embed]`
+            An embed for each part.
+        answers : `list[str]`
+            The formatted answerline of each part.
+        markdown : `list[str]`
+            The answerline of each part as markdown.
+    """
+
+    data: dict
+    leadin: discord.Embed = field(repr=False)
+    parts: list[discord.Embed] = field(repr=False)
+    answers: list[str]
+    markdown: list[str]
+
+    @classmethod
+    async def prepare(cls, bonus: dict) -> "PreparedBonus":
+        """Prepare a bonus.
+
+        Parameters
+        ----------
+            bonus : `dict`
+                The bonus, as returned by the API.
+        """
+        leadin = discord.Embed(
+            title=bonus["category"]
+            if bonus["category"] == bonus["subcategory"]
+            else " | ".join([bonus["category"], bonus["subcategory"]]),
+            description=bonus["leadin"],
+            color=C_NEUTRAL,
+        )
+        leadin.set_footer(text=_footer(bonus, "Bonus"))
+
+        answers = bonus.get("formatted_answers", bonus["answers"])
+
+        return cls(
+            data=bonus,
+            leadin=leadin,
+            parts=[
+                discord.Embed(title=str(i), description=part, color=C_NEUTRAL)
+                for i, part in enumerate(bonus["parts"], 1)
+            ],
+            answers=answers,
+            markdown=[await to_markdown(answer) for answer in answers],
+        )
@@ -0,0 +1,127 @@
+"""Event loop stall detection and sampling profiler.
+
+Both run on a separate thread and read the event loop thread's stack from the outside, so the
+loop itself does no extra work besides a heartbeat, and nothing at all unless enabled.
+"""
+
+import asyncio
+import sys
+import threading
+import time
+import traceback
+from collections import Counter
+from types import FrameType
+
+
+def _collapse(frame: FrameType | None) -> str:
+    # one line of the collapsed stack format read by flamegraph.pl and speedscope, root first
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{code.co_name} ({code.co_filename}:{code.co_firstlineno})")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+class LoopProfiler:
+    """Watch the event loop for callbacks that block it.
+
+    The loop bumps a heartbeat every `interval` seconds. If a heartbeat is more than `threshold`
+    seconds late, a watchdog thread prints the stack the loop thread is stuck in, once per stall.
+
+    Parameters
+    ----------
+        threshold : `float`, default = `0.1`
+            Seconds the loop can be blocked for before the stall is reported.
+        interval : `float`, default = `0.05`
+            Seconds between heartbeats.
+    """
+
+    def __init__(self, threshold: float = 0.1, interval: float = 0.05):
+        self.threshold = threshold
+        self.interval = interval
+
+        self.stalls = 0
+        self.max_lag = 0.0
+
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread_id: int | None = None
+        self._heartbeat = 0.0
+        self._stopped = threading.Event()
+        self._watchdog: threading.Thread | None = None
+        self._beat: asyncio.TimerHandle | None = None
+
+    def _stack(self) -> FrameType | None:
+        return sys._current_frames().get(self._thread_id)
+
+    def _on_beat(self) -> None:
+        now = time.monotonic()
+        self.max_lag = max(self.max_lag, now - self._heartbeat - self.interval)
+        self._heartbeat = now
+        self._beat = self._loop.call_later(self.interval, self._on_beat)
+
+    def _watch(self) -> None:
+        reported = 0.0
+        while not self._stopped.wait(self.threshold / 2):
+            heartbeat = self._heartbeat
+            if heartbeat == reported or time.monotonic() - heartbeat < self.threshold:
+                continue
+
+            reported = heartbeat
+            self.stalls += 1
+            stack = "".join(traceback.format_stack(self._stack()))
+            print(f"event loop blocked for over {self.threshold}s in:\n{stack}", end="")
+
+    def start(self) -> None:
+        """Start watching the running event loop."""
+        if self._watchdog is not None:
+            return
+
+        self._loop = asyncio.get_running_loop()
+        self._thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._beat = self._loop.call_later(self.interval, self._on_beat)
+
+        self._stopped.clear()
+        self._watchdog = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._watchdog.start()
+
+    def stop(self) -> None:
+        """Stop watching the event loop."""
+        if self._watchdog is None:
+            return
+
+        self._beat.cancel()
+        self._stopped.set()
+        self._watchdog.join()
+        self._watchdog = None
+
+
+async def sample(duration: float, interval: float = 0.005) -> str:
+    """Sample the stack of the event loop thread.
+
+    Parameters
+    ----------
+        duration : `float`
+            Seconds to sample for.
+        interval : `float`, default = `0.005`
+            Seconds between samples.
+
+    Returns
+    -------
+        `str`
+            The samples in the collapsed stack format, one stack per line followed by its count,
+            ready for `flamegraph.pl` or speedscope.
+    """
+    thread_id = threading.get_ident()
+
+    def run() -> Counter:
+        samples = Counter()
+        deadline = time.monotonic() + duration
+        while time.monotonic() < deadline:
+            samples[_collapse(sys._current_frames().get(thread_id))] += 1
+            time.sleep(interval)
+        return samples
+
+    samples = await asyncio.to_thread(run)
+    return "".join(f"{stack} {count}\n" for stack, count in samples.most_common())
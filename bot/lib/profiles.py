@@ -0,0 +1,50 @@
+"""Gateway intent and cache profiles."""
+
+import discord
+
+
+def _minimal() -> dict:
+    # games only read messages in the channel they run in, the bot never looks at members,
+    # presences or past messages
+    intents = discord.Intents.none()
+    intents.guilds = True
+    intents.guild_messages = True
+    intents.dm_messages = True
+    intents.message_content = True
+
+    return {
+        "intents": intents,
+        "member_cache_flags": discord.MemberCacheFlags.none(),
+        "chunk_guilds_at_startup": False,
+        "max_messages": None,
+    }
+
+
+def _full() -> dict:
+    # what the bot used to run with, for cogs that need members or presences
+    intents = discord.Intents.default()
+    intents.members = True
+    intents.message_content = True
+    intents.presences = True
+
+    return {"intents": intents}
+
+
+PROFILES = {"minimal": _minimal, "full": _full}
+
+
+def client_options(profile: str) -> dict:
+    """Get the intents and cache options of a profile.
+
+    Parameters
+    ----------
+        profile : `str`
+            Either `"minimal"`, which only receives and caches what the games need, or `"full"`,
+            which receives everything and caches members and the last 1000 messages.
+
+    Returns
+    -------
+        `dict`
+            Keyword arguments for the bot's constructor.
+    """
+    return PROFILES[profile]()
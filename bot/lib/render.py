@@ -0,0 +1,33 @@
+"""Rendering of question HTML off the event loop."""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from lib.cache import TTLCache
+from markdownify import markdownify as md
+
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="render")
+
+# answerlines are shown several times per question (prompts, results, session recaps), and
+# concurrent conversions of the same answerline share one run
+markdown_cache = TTLCache("markdown", 1024, 3600)
+
+
+async def to_markdown(html: str) -> str:
+    """Convert question HTML to Discord markdown on a worker thread.
+
+    Parameters
+    ----------
+        html : `str`
+            HTML formatted text, e.g. a formatted answerline.
+
+    Returns
+    -------
+        `str`
+            The text as markdown.
+    """
+
+    async def convert() -> str:
+        return await asyncio.get_running_loop().run_in_executor(_executor, md, html)
+
+    return await markdown_cache.get(html, convert)
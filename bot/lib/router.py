@@ -0,0 +1,96 @@
+"""Message routing for games waiting on player messages."""
+
+import asyncio
+from collections import defaultdict
+from typing import Callable
+
+import discord
+
+
+class MessageRouter:
+    """Dispatch incoming messages to the games waiting on them.
+
+    Replaces `bot.wait_for("message", ...)` for games. discord.py runs the check of every pending
+    listener on every message, while the router only looks at the listeners waiting on the
+    message's channel and author (or on anyone in the channel), so dispatching costs the same
+    however many games and players there are.
+    """
+
+    def __init__(self):
+        self._waiters: defaultdict[
+            tuple[int, int], list[tuple[asyncio.Future, Callable[[discord.Message], bool]]]
+        ] = defaultdict(list)
+
+    def __len__(self) -> int:
+        """Get the number of pending listeners."""
+        return sum(len(waiters) for waiters in self._waiters.values())
+
+    def dispatch(self, message: discord.Message) -> None:
+        """Resolve every listener waiting on the message's channel and author that accepts it.
+
+        Parameters
+        ----------
+            message : `discord.Message`
+                The incoming message.
+        """
+        for key in ((message.channel.id, message.author.id), (message.channel.id, None)):
+            waiters = self._waiters.get(key)
+            if not waiters:
+                continue
+
+            remaining = []
+            for future, check in waiters:
+                if future.done():
+                    continue
+                try:
+                    accepted = check(message)
+                except Exception as e:
+                    future.set_exception(e)
+                    continue
+                if accepted:
+                    future.set_result(message)
+                else:
+                    remaining.append((future, check))
+
+            if remaining:
+                self._waiters[key] = remaining
+            else:
+                del self._waiters[key]
+
+    async def wait_for(
+        self,
+        channel: discord.abc.Messageable,
+        author: discord.abc.User | None,
+        check: Callable[[discord.Message], bool] = lambda _: True,
+        timeout: float | None = None,
+    ) -> discord.Message:
+        """Wait for the next message from an author, or anyone, in a channel.
+
+        Parameters
+        ----------
+            channel : `discord.abc.Messageable`
+                Channel to listen in.
+            author : `discord.abc.User | None`
+                Author to listen for, or `None` to listen for anyone in the channel.
+            check : `Callable[[discord.Message], bool]`, optional
+                Additional check the message has to pass.
+            timeout : `float | None`, default = `None`
+                Seconds to wait for before raising `asyncio.TimeoutError`.
+
+        Returns
+        -------
+            `discord.Message`
+                The first message that passed the check.
+        """
+        key = (channel.id, author.id if author is not None else None)
+        future = asyncio.get_running_loop().create_future()
+        self._waiters[key].append((future, check))
+
+        try:
+            return await asyncio.wait_for(future, timeout)
+        finally:
+            if future.cancelled():  # timed out, nothing dispatched it
+                waiters = self._waiters.get(key, [])
+                self._waiters[key] = [w for w in waiters if w[0] is not future]
+                if not self._waiters[key]:
+                    del self._waiters[key]
@@ -0,0 +1,29 @@
+"""Per-channel session coordination."""
+
+import asyncio
+from weakref import WeakValueDictionary
+
+_channel_locks: "WeakValueDictionary[int, asyncio.Lock]" = WeakValueDictionary()
+
+
+def channel_lock(channel_id: int) -> asyncio.Lock:
+    """Get the lock coordinating the reader and buzzer of games in a channel.
+
+    Locks are created on first use and dropped once no game in the channel holds a reference to
+    them, so games in different channels never contend with each other.
+
+    Parameters
+    ----------
+        channel_id : `int`
+            ID of the channel the game is being played in.
+
+    Returns
+    -------
+        `asyncio.Lock`
+            The lock shared by every game currently running in the channel.
+    """
+    lock = _channel_locks.get(channel_id)
+    if lock is None:
+        lock = asyncio.Lock()
+        _channel_locks[channel_id] = lock
+    return lock
@@ -0,0 +1,224 @@
+"""Index of question sets."""
+
+import asyncio
+import bisect
+import json
+import os
+import re
+import tempfile
+import traceback
+from dataclasses import asdict, dataclass
+
+from lib.api import APIError, QBReaderClient
+
+
+@dataclass(frozen=True)
+class SetInfo:
+    """Metadata of a question set.
+
+    Attributes
+    ----------
+        name : `str`
+            Name of the set, e.g. `"2023 ACF Regionals"`.
+        year : `int | None`
+            Year the set was written in, taken from the name.
+        packets : `int | None`
+            Number of packets in the set, `None` until it has been looked up.
+    """
+
+    name: str
+    year: int | None = None
+    packets: int | None = None
+
+
+class SetIndex:
+    """In-memory index of every qbreader set, saved to disk and refreshed in the background.
+
+    The set list is re-requested every `refresh_interval` seconds with `If-None-Match` and
+    `If-Modified-Since`, so an unchanged list costs an empty response. Packet counts are only
+    looked up for sets that are new since the last refresh. Lookups never touch the network.
+
+    When several processes share `path`, only one of them should refresh it. The others reload
+    the file whenever it changes, checking every `reload_interval` seconds.
+
+    Parameters
+    ----------
+        client : `QBReaderClient`
+            Client to make requests with.
+        path : `str`
+            Path to the JSON file the index is saved to.
+        refresh_interval : `float`, default = `86400`
+            Seconds between refreshes.
+        refresh : `bool`, default = `True`
+            Whether this process refreshes the index, or only reloads it from `path`.
+        reload_interval : `float`, default = `60`
+            Seconds between checks for changes to `path`, when not refreshing.
+    """
+
+    def __init__(
+        self,
+        client: QBReaderClient,
+        path: str,
+        refresh_interval: float = 86400,
+        refresh: bool = True,
+        reload_interval: float = 60,
+    ):
+        self.client = client
+        self.path = path
+        self.refresh_interval = refresh_interval
+        self.refresh_enabled = refresh
+        self.reload_interval = reload_interval
+
+        self.sets: dict[str, SetInfo] = {}  # lowercase name -> set
+        self._validators: dict[str, str] = {}
+        self._keys: list[tuple[str, str]] = []  # sorted (search key, lowercase name)
+        self._refresher: asyncio.Task | None = None
+        self._loaded_mtime: int | None = None
+
+    def _load(self) -> None:
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+            if mtime == self._loaded_mtime:
+                return
+            with open(self.path) as f:
+                saved = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return
+
+        self._loaded_mtime = mtime
+        self._validators = saved["validators"]
+        self._update([SetInfo(**s) for s in saved["sets"]])
+
+    def _save(self) -> None:
+        saved = {
+            "validators": self._validators,
+            "sets": [asdict(s) for s in self.sets.values()],
+        }
+        # a temporary file of its own, so processes saving at the same time can't clobber it
+        fd, tmp = tempfile.mkstemp(
+            prefix=f"{os.path.basename(self.path)}.",
+            suffix=".tmp",
+            dir=os.path.dirname(self.path) or ".",
+        )
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(saved, f)
+            os.replace(tmp, self.path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    def _update(self, sets: list[SetInfo]) -> None:
+        self.sets = {s.name.lower(): s for s in sets}
+
+        # sets can be searched by their full name or by their name without the year
+        keys = []
+        for name in self.sets:
+            keys.append((name, name))
+            if (short := re.sub(r"^\d{4} ", "", name)) != name:
+                keys.append((short, name))
+        self._keys = sorted(keys)
+
+    async def start(self) -> None:
+        """Load the saved index and start refreshing or reloading it periodically."""
+        await asyncio.to_thread(self._load)
+        if self._refresher is None:
+            if self.refresh_enabled:
+                self._refresher = asyncio.create_task(self._refresh_periodically())
+            else:
+                self._refresher = asyncio.create_task(self._reload_periodically())
+
+    async def _refresh_periodically(self) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except APIError as e:
+                print(f"failed to refresh set index: {e}")
+            except Exception:  # keep the old index and try again next time, whatever went wrong
+                print("failed to refresh set index:")
+                traceback.print_exc()
+            await asyncio.sleep(self.refresh_interval)
+
+    async def _reload_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.reload_interval)
+            try:
+                await asyncio.to_thread(self._load)
+            except Exception:
+                print("failed to reload set index:")
+                traceback.print_exc()
+
+    async def refresh(self) -> None:
+        """Fetch the set list if it has changed, and packet counts of any new sets."""
+        data, self._validators = await self.client.get_if_modified(
+            "set-list", validators=self._validators
+        )
+        if data is None and all(s.packets is not None for s in self.sets.values()):
+            return
+
+        names = data["setList"] if data is not None else [s.name for s in self.sets.values()]
+
+        sets = []
+        for name in names:
+            known = self.sets.get(name.lower())
+            if known is None or known.packets is None:
+                try:
+                    response = await self.client.get("num-packets", {"setName": name})
+                    packets = response["numPackets"]
+                except APIError:
+                    packets = None  # try again on the next refresh
+            else:
+                packets = known.packets
+
+            year = re.match(r"\d{4}", name)
+            sets.append(SetInfo(name, int(year[0]) if year else None, packets))
+
+        self._update(sets)
+        await asyncio.to_thread(self._save)
+
+    def get(self, name: str) -> SetInfo | None:
+        """Look up a set by name, ignoring case.
+
+        Parameters
+        ----------
+            name : `str`
+                Name of the set.
+
+        Returns
+        -------
+            `SetInfo | None`
+                The set, or `None` if there is no set with that name.
+        """
+        return self.sets.get(name.lower())
+
+    def search(self, prefix: str, limit: int = 25) -> list[SetInfo]:
+        """Find sets whose name, with or without the year, starts with a prefix.
+
+        Parameters
+        ----------
+            prefix : `str`
+                Start of the set name, case insensitive.
+            limit : `int`, default = `25`
+                Maximum number of sets to return.
+
+        Returns
+        -------
+            `list[SetInfo]`
+                Matching sets, newest first.
+        """
+        prefix = prefix.lower()
+        start = bisect.bisect_left(self._keys, (prefix,))
+
+        matches = {}
+        for key, name in self._keys[start:]:
+            if not key.startswith(prefix):
+                break
+            matches[name] = self.sets[name]
+
+        return sorted(matches.values(), key=lambda s: (-(s.year or 0), s.name))[:limit]
+
+    async def close(self) -> None:
+        """Stop refreshing or reloading the index."""
+        if self._refresher is not None:
+            self._refresher.cancel()
+            self._refresher = None
@@ -0,0 +1,61 @@
+"""Multi-process sharding."""
+
+import os
+import signal
+import subprocess
+import sys
+
+PROCESS_ENV = "SHARD_PROCESS"
+
+
+def shard_ids(process: int, shard_count: int, processes: int) -> list[int]:
+    """Get the contiguous range of shards a process owns.
+
+    Parameters
+    ----------
+        process : `int`
+            Index of the process, from `0` to `processes - 1`.
+        shard_count : `int`
+            Total number of shards.
+        processes : `int`
+            Total number of processes.
+
+    Returns
+    -------
+        `list[int]`
+            IDs of the shards the process should connect.
+    """
+    return list(
+        range(process * shard_count // processes, (process + 1) * shard_count // processes)
+    )
+
+
+def run_processes(processes: int) -> int:
+    """Run the bot in several processes and wait for all of them to exit.
+
+    Every process runs the same entry point with `SHARD_PROCESS` set to its index, and connects
+    only the shards returned by `shard_ids` for it.
+
+    Parameters
+    ----------
+        processes : `int`
+            Number of processes to run.
+
+    Returns
+    -------
+        `int`
+            Exit code, non-zero if any process failed.
+    """
+    children = [
+        subprocess.Popen([sys.executable, *sys.argv], env=os.environ | {PROCESS_ENV: str(i)})
+        for i in range(processes)
+    ]
+
+    try:
+        codes = [child.wait() for child in children]
+    except KeyboardInterrupt:
+        for child in children:
+            child.send_signal(signal.SIGINT)
+        codes = [child.wait() for child in children]
+
+    return int(any(codes))
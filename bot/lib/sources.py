@@ -0,0 +1,131 @@
+"""Question source interface."""
+
+import asyncio
+from collections import deque
+from typing import Awaitable, Callable
+
+from lib.filters import QuestionFilter
+
+
+class QuestionSource:
+    """Base class for anything that can supply random questions for a filter.
+
+    Cogs only talk to a question source, so questions can come from the qbreader API, a local
+    corpus or anything else that implements `get`.
+    """
+
+    async def get(self, filters: QuestionFilter) -> dict:
+        """Get a random question matching the given filter.
+
+        Parameters
+        ----------
+            filters : `QuestionFilter`
+                Filter the question has to match.
+
+        Returns
+        -------
+            `dict`
+                A question in the same format as returned by the qbreader API.
+        """
+        raise NotImplementedError
+
+    async def get_many(self, filters: QuestionFilter, number: int) -> list[dict]:
+        """Get several random questions matching the given filter.
+
+        Sources that can fetch questions in bulk should override this, by default it just calls
+        `get` repeatedly.
+
+        Parameters
+        ----------
+            filters : `QuestionFilter`
+                Filter the questions have to match.
+            number : `int`
+                Number of questions to get.
+
+        Returns
+        -------
+            `list[dict]`
+                Questions in the same format as returned by the qbreader API.
+        """
+        return [await self.get(filters) for _ in range(number)]
+
+    def close(self) -> None:
+        """Release any resources held by the source."""
+
+
+class QuestionBuffer:
+    """Bounded buffer of questions for a single session.
+
+    Questions are fetched from the source in batches, and the next batch is fetched in the
+    background once the buffer runs low, so a session only makes a request every few questions.
+    Close the buffer when the session ends to drop whatever is left.
+
+    Parameters
+    ----------
+        source : `QuestionSource`
+            Source to fetch questions from.
+        filters : `QuestionFilter`
+            Filter the questions have to match.
+        size : `int`, default = `10`
+            Number of questions fetched per batch, and the most the buffer holds.
+        prepare : `Callable[[dict], Awaitable] | None`, default = `None`
+            Called on every question as soon as it's fetched, `next` returns its result instead
+            of the question.
+    """
+
+    def __init__(
+        self,
+        source: QuestionSource,
+        filters: QuestionFilter,
+        size: int = 10,
+        prepare: Callable[[dict], Awaitable] | None = None,
+    ):
+        self.source = source
+        self.filters = filters
+        self.size = size
+        self.prepare = prepare
+
+        self._questions: deque[dict] = deque(maxlen=size)
+        self._refill: asyncio.Task | None = None
+
+    async def _fill(self) -> None:
+        try:
+            missing = self.size - len(self._questions)
+            if missing > 0:
+                questions = await self.source.get_many(self.filters, missing)
+                if self.prepare is not None:
+                    questions = await asyncio.gather(*map(self.prepare, questions))
+                self._questions.extend(questions)
+        finally:
+            self._refill = None
+
+    def _schedule_fill(self) -> asyncio.Task:
+        if self._refill is None:
+            self._refill = asyncio.create_task(self._fill())
+            # nobody waits on a refill started in the background, and if it fails `next` fetches
+            # again once the buffer is empty
+            self._refill.add_done_callback(lambda t: t.cancelled() or t.exception())
+        return self._refill
+
+    async def next(self) -> dict:
+        """Get the next question of the session.
+
+        Returns
+        -------
+            `dict`
+                A question in the same format as returned by the qbreader API, or the prepared
+                question if the buffer has a `prepare` function.
+        """
+        if not self._questions:
+            await asyncio.shield(self._schedule_fill())
+
+        question = self._questions.popleft()
+        if len(self._questions) <= self.size // 2:
+            self._schedule_fill()
+        return question
+
+    def close(self) -> None:
+        """Cancel any pending fetch and drop the buffered questions."""
+        if self._refill is not None:
+            self._refill.cancel()
+        self._questions.clear()
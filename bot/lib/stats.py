@@ -0,0 +1,188 @@
+"""Persistent player statistics."""
+
+import asyncio
+import sqlite3
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tossup_stats (
+    user_id INTEGER NOT NULL,
+    category TEXT NOT NULL,
+    subcategory TEXT NOT NULL,
+    difficulty INTEGER NOT NULL,
+    power INTEGER NOT NULL DEFAULT 0,
+    correct INTEGER NOT NULL DEFAULT 0,
+    neg INTEGER NOT NULL DEFAULT 0,
+    dead INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (user_id, category, subcategory, difficulty)
+);
+CREATE TABLE IF NOT EXISTS bonus_stats (
+    user_id INTEGER NOT NULL,
+    category TEXT NOT NULL,
+    subcategory TEXT NOT NULL,
+    difficulty INTEGER NOT NULL,
+    bonuses INTEGER NOT NULL DEFAULT 0,
+    parts INTEGER NOT NULL DEFAULT 0,
+    parts_correct INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (user_id, category, subcategory, difficulty)
+);
+"""
+
+KEY = "user_id, category, subcategory, difficulty"
+TOSSUP_RESULTS = ("power", "correct", "neg", "dead")
+BONUS_COUNTS = ("bonuses", "parts", "parts_correct")
+
+
+def _group(user_id: int, question: dict) -> tuple[int, str, str, int]:
+    return (
+        user_id,
+        question["category"],
+        question.get("subcategory") or question["category"],
+        int(question.get("difficulty") or 0),
+    )
+
+
+class StatsStore:
+    """SQLite store of lifetime tossup and bonus results per user, category and difficulty.
+
+    Results are only kept as running totals per (user, category, subcategory, difficulty), so
+    aggregate queries read a handful of rows per user instead of every result. New results are
+    tallied in memory and flushed in batches on a dedicated thread, so recording a result never
+    touches the disk from the event loop.
+
+    Parameters
+    ----------
+        path : `str`
+            Path to the SQLite database, created if it doesn't exist.
+        flush_interval : `float`, default = `10`
+            Seconds between flushes to disk.
+    """
+
+    def __init__(self, path: str, flush_interval: float = 10):
+        self.path = path
+        self.flush_interval = flush_interval
+
+        self._tossups: defaultdict[tuple, Counter] = defaultdict(Counter)
+        self._bonuses: defaultdict[tuple, Counter] = defaultdict(Counter)
+
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="stats")
+        self._db: sqlite3.Connection | None = None
+        self._flusher: asyncio.Task | None = None
+
+    async def _run(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._db is None:
+            self._db = sqlite3.connect(self.path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.executescript(SCHEMA)
+        return self._db
+
+    async def start(self) -> None:
+        """Open the database and start flushing periodically."""
+        await self._run(self._connect)
+        if self._flusher is None:
+            self._flusher = asyncio.create_task(self._flush_periodically())
+
+    async def _flush_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    def record_tossup(self, user_id: int, tossup: dict, result: str) -> None:
+        """Record the result of a tossup.
+
+        Parameters
+        ----------
+            user_id : `int`
+                ID of the player.
+            tossup : `dict`
+                The tossup, as returned by the API.
+            result : `str`
+                One of `"power"`, `"correct"`, `"neg"` or `"dead"`.
+        """
+        self._tossups[_group(user_id, tossup)][result] += 1
+
+    def record_bonus(self, user_id: int, bonus: dict, points: int) -> None:
+        """Record the result of a bonus.
+
+        Parameters
+        ----------
+            user_id : `int`
+                ID of the player.
+            bonus : `dict`
+                The bonus, as returned by the API.
+            points : `int`
+                Points scored on the bonus, 10 per part.
+        """
+        counts = self._bonuses[_group(user_id, bonus)]
+        counts["bonuses"] += 1
+        counts["parts"] += len(bonus["parts"])
+        counts["parts_correct"] += points // 10
+
+    def _write(self, tossups: dict, bonuses: dict) -> None:
+        db = self._connect()
+        with db:
+            db.executemany(
+                "INSERT INTO tossup_stats VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+                f"ON CONFLICT ({KEY}) DO UPDATE SET power = power + excluded.power, "
+                "correct = correct + excluded.correct, neg = neg + excluded.neg, "
+                "dead = dead + excluded.dead",
+                [(*group, *(c[r] for r in TOSSUP_RESULTS)) for group, c in tossups.items()],
+            )
+            db.executemany(
+                "INSERT INTO bonus_stats VALUES (?, ?, ?, ?, ?, ?, ?) "
+                f"ON CONFLICT ({KEY}) DO UPDATE SET bonuses = bonuses + excluded.bonuses, "
+                "parts = parts + excluded.parts, "
+                "parts_correct = parts_correct + excluded.parts_correct",
+                [(*group, *(c[k] for k in BONUS_COUNTS)) for group, c in bonuses.items()],
+            )
+
+    async def flush(self) -> None:
+        """Write all results recorded since the last flush to disk."""
+        if not self._tossups and not self._bonuses:
+            return
+
+        tossups, self._tossups = self._tossups, defaultdict(Counter)
+        bonuses, self._bonuses = self._bonuses, defaultdict(Counter)
+        await self._run(self._write, tossups, bonuses)
+
+    def _query(self, table: str, columns: tuple[str, ...], user_id: int) -> dict:
+        sums = ", ".join(f"SUM({column})" for column in columns)
+        rows = self._connect().execute(
+            f"SELECT category, {sums} FROM {table} WHERE user_id = ? GROUP BY category",
+            (user_id,),
+        )
+        return {category: dict(zip(columns, counts)) for category, *counts in rows}
+
+    async def user_stats(self, user_id: int) -> tuple[dict, dict]:
+        """Get the lifetime stats of a user, by category.
+
+        Parameters
+        ----------
+            user_id : `int`
+                ID of the player.
+
+        Returns
+        -------
+            `tuple[dict, dict]`
+                Tossup results and bonus counts of the user, keyed by category.
+        """
+        await self.flush()
+        tossups = await self._run(self._query, "tossup_stats", TOSSUP_RESULTS, user_id)
+        bonuses = await self._run(self._query, "bonus_stats", BONUS_COUNTS, user_id)
+        return tossups, bonuses
+
+    async def close(self) -> None:
+        """Flush remaining results and close the database."""
+        if self._flusher is not None:
+            self._flusher.cancel()
+            self._flusher = None
+        await self.flush()
+        if self._db is not None:
+            await self._run(self._db.close)
+            self._db = None
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,84 @@
+"""Shared clock for pacing tossup reveals."""
+
+import asyncio
+import heapq
+import itertools
+import math
+
+
+class RevealTicker:
+    """Wake up readers at deadlines on the event loop clock, all from a single timer.
+
+    Deadlines are kept in a heap and rounded up to `resolution`, so every reader due in the same
+    window is woken by one callback instead of each reader keeping a timer of its own.
+
+    Parameters
+    ----------
+        resolution : `float`, default = `0.05`
+            Length of the window deadlines are batched in, in seconds. Readers are woken at most
+            this late.
+    """
+
+    def __init__(self, resolution: float = 0.05):
+        self.resolution = resolution
+
+        self._heap: list[tuple[float, int, asyncio.Future]] = []
+        self._order = itertools.count()  # keeps equal deadlines from comparing futures
+        self._timer: asyncio.TimerHandle | None = None
+
+    def __len__(self) -> int:
+        """Get the number of pending waits, including cancelled ones not yet due."""
+        return len(self._heap)
+
+    def wait_until(self, deadline: float) -> asyncio.Future:
+        """Wait until a deadline.
+
+        Parameters
+        ----------
+            deadline : `float`
+                Time to wake up at, on the event loop clock (`loop.time()`).
+
+        Returns
+        -------
+            `asyncio.Future`
+                Resolves once the deadline has passed. Cancelling it is enough to stop waiting.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        heapq.heappush(self._heap, (deadline, next(self._order), future))
+        self._schedule(loop)
+        return future
+
+    def _window(self, deadline: float) -> int:
+        return math.ceil(deadline / self.resolution)
+
+    def _schedule(self, loop: asyncio.AbstractEventLoop) -> None:
+        if not self._heap:
+            return
+
+        when = self._window(self._heap[0][0]) * self.resolution
+        if self._timer is not None:
+            if self._timer.when() <= when:
+                return
+            self._timer.cancel()
+        self._timer = loop.call_at(when, self._tick, loop)
+
+    def _tick(self, loop: asyncio.AbstractEventLoop) -> None:
+        self._timer = None
+        # everything in the window that just ended, or in later ones if the timer fired late
+        window = max(self._window(self._heap[0][0]), math.floor(loop.time() / self.resolution))
+        while self._heap and self._window(self._heap[0][0]) <= window:
+            future = heapq.heappop(self._heap)[2]
+            if not future.done():
+                future.set_result(None)
+        self._schedule(loop)
+
+    def close(self) -> None:
+        """Stop the timer and cancel every wait."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        for _, _, future in self._heap:
+            if not future.done():
+                future.cancel()
+        self._heap.clear()
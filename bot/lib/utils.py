@@ -1,7 +1,48 @@
 """Helper functions."""
 
-import aiohttp
-from lib.consts import ALIASES, ALL_ALIASES, CATEGORIES, QBREADER_API, SUBCATEGORIES
+import time
+from functools import lru_cache
+
+from lib.answers import check_answer_locally
+from lib.api import APIError, QBReaderClient
+from lib.cache import SharedCache, SQLiteCache, TTLCache
+from lib.consts import (
+    ALIASES,
+    ANSWER_CACHE_SIZE,
+    ANSWER_CACHE_TTL,
+    CATEGORIES,
+    READING_SPEED,
+    SHARED_CACHE_PATH,
+    SUBCATEGORIES,
+)
+from lib.filters import QuestionFilter
+from lib.metrics import CHECK_ANSWER_LATENCY
+
+answer_cache: SharedCache = (
+    SQLiteCache("answers", SHARED_CACHE_PATH, ANSWER_CACHE_SIZE, ANSWER_CACHE_TTL)
+    if SHARED_CACHE_PATH
+    else TTLCache("answers", ANSWER_CACHE_SIZE, ANSWER_CACHE_TTL)
+)
+
+
+def _build_alias_index() -> tuple[dict[str, tuple[str, ...]], dict]:
+    alias_map = {}  # category names and aliases -> subcategories, ignoring spaces and casing
+    alias_trie = {}  # word by word trie of category names and aliases, `None` marks an end
+
+    for cat, aliases in ALIASES.items():
+        subcats = tuple(SUBCATEGORIES[cat]) if cat in CATEGORIES else (cat,)
+        for name in [cat] + aliases:
+            alias_map.setdefault(name.lower().replace(" ", ""), subcats)
+
+            node = alias_trie
+            for word in name.lower().split():
+                node = node.setdefault(word, {})
+            node.setdefault(None, subcats)
+
+    return alias_map, alias_trie
+
+
+ALIAS_MAP, ALIAS_TRIE = _build_alias_index()
 
 
 def parse_int_range(int_ranges: list[str]) -> list[int]:
@@ -104,47 +145,94 @@ def parse_subcats(subcats: list[str]) -> list[str]:
     >>> parse_subcats(["sci", "us", "hist"])
     ["American History", "Biology", "Chemistry", ...]
     """
-    for index, cat in enumerate(subcats):  # join together strings that are aliases
-        try:
-            while (
-                expanded_cat := " ".join([cat] + subcats[index + 1 : index + 2])  # noqa: E203
-            ) in ALL_ALIASES:
-                cat = expanded_cat
-                subcats.pop(index + 1)
-        except IndexError:
-            pass
-        subcats[index] = cat
-
-    def parse(s: str) -> list[str]:  # replace aliases with actual names
-        for cat, aliases in ALIASES.items():
-            if s.lower().replace(" ", "") == cat.lower().replace(" ", "") or s.lower().replace(
-                " ", ""
-            ) in [alias.lower().replace(" ", "") for alias in aliases]:
-                # maximum matching, ignores spaces and casing
-                if cat in CATEGORIES:
-                    return SUBCATEGORIES[cat]
-                else:
-                    return [cat]
-        raise ValueError(f"Invalid category: {s}")
-
-    return sorted(set(sum(map(parse, subcats), [])))
-
-
-def generate_params(argv: list[str]) -> dict:
-    """Generate paramenters for a request to the random question API.
+    return list(_resolve_subcats(tuple(subcats)))
+
+
+@lru_cache(maxsize=1024)
+def _resolve_subcats(subcats: tuple[str, ...]) -> tuple[str, ...]:
+    resolved = set()
+    index = 0
+
+    while index < len(subcats):
+        # greedily match the longest run of words that spells out an alias
+        node, match = ALIAS_TRIE, None
+        for end in range(index, len(subcats)):
+            node = node.get(subcats[end].lower())
+            if node is None:
+                break
+            if None in node:
+                match = end + 1, node[None]
+
+        if match is None:  # single word, maybe with the spaces left out
+            cat = subcats[index]
+            try:
+                match = index + 1, ALIAS_MAP[cat.lower().replace(" ", "")]
+            except KeyError:
+                raise ValueError(f"Invalid category: {cat}") from None
+
+        index, found = match
+        resolved.update(found)
+
+    return tuple(sorted(resolved))
+
+
+def parse_reading_speed(argv: tuple[str, ...]) -> tuple[tuple[str, ...], float]:
+    """Take the reading speed out of a command's arguments.
 
     Parameters
     ----------
-        argv : `list[str]`
-            A list of arguments to parse, straight from user input.
+        argv : `tuple[str, ...]`
+            A tuple of arguments to parse, straight from user input.
 
     Returns
     -------
-        `dict`
-            A dictionary of parameters to pass to the API.
+        argv : `tuple[str, ...]`
+            The rest of the arguments.
+        speed : `float`
+            Words per second from an argument like `8wps`, or `READING_SPEED` if there is none.
+
+    Examples
+    --------
+    >>> parse_reading_speed(("lit", "8wps", "3-5"))
+    (("lit", "3-5"), 8.0)
     """
-    params = {}
+    speed = READING_SPEED
+    rest = []
 
+    for arg in argv:
+        if not arg.lower().endswith("wps"):
+            rest.append(arg)
+            continue
+
+        try:
+            speed = float(arg[:-3])
+        except ValueError:
+            raise ValueError(f"Invalid reading speed: {arg}") from None
+
+        if not 1 <= speed <= 50:
+            raise ValueError("Reading speed has to be between 1 and 50 words per second")
+
+    return tuple(rest), speed
+
+
+@lru_cache(maxsize=1024)
+def generate_params(argv: tuple[str, ...], three_part_bonuses: bool = False) -> QuestionFilter:
+    """Generate a filter for requests to the random question API.
+
+    Results are memoized, so repeated commands with the same arguments skip parsing entirely.
+
+    Parameters
+    ----------
+        argv : `tuple[str, ...]`
+            A tuple of arguments to parse, straight from user input.
+        three_part_bonuses : `bool`, default = `False`
+            Only allow bonuses with exactly three parts.
+
+    Returns
+    -------
+        `QuestionFilter`
+            A filter whose `params` can be passed to the API.
+    """
     diffs = []
     cats = []
 
@@ -159,40 +247,53 @@ def generate_params(argv: list[str]) -> dict:
             raise ValueError("Invalid argument")
 
     try:
-        if diffs:
-            params["difficulties"] = parse_int_range(diffs)
-
-        if cats:
-            params["subcategories"] = parse_subcats(cats)
+        return QuestionFilter(
+            parse_int_range(diffs) if diffs else (),
+            parse_subcats(cats) if cats else (),
+            three_part_bonuses=three_part_bonuses,
+        )
 
     except ValueError as e:
         raise ValueError(e)
 
-    return params
-
 
 async def check_answer(
-    answerline: str, answer: str, client: aiohttp.ClientSession
+    answerline: str, answer: str, client: QBReaderClient
 ) -> tuple[str, str | None]:
     """Check if an answer is correct using the qbreader API.
 
+    Exact matches against the answerline are checked locally first, only answers that can't be
+    confidently checked locally are sent to the API. API results are cached in `answer_cache`.
+
     Parameters
     ----------
         answerline : `str`
             The answerline of the question.
         answer : `str`
             The answer to check.
-        client : `aiohttp.ClientSession`
-            `aiohttp` client session.
+        client : `QBReaderClient`
+            qbreader API client.
 
     Returns
     -------
         `tuple[str, str | None]`
-            A tuple of the directive and prompted responses, if any.
+            A tuple of the directive and prompted responses, if any. The directive is `"error"`
+            if the API couldn't be reached.
     """
-    async with client.get(
-        f"{QBREADER_API}/check-answer",
-        params={"answerline": answerline, "givenAnswer": answer},
-    ) as r:
-        data = await r.json()
+    start = time.perf_counter()
+    if (local := check_answer_locally(answerline, answer)) is not None:
+        CHECK_ANSWER_LATENCY.labels("local").observe(time.perf_counter() - start)
+        return local
+
+    async def fetch() -> tuple[str, str | None]:
+        data = await client.get(
+            "check-answer", params={"answerline": answerline, "givenAnswer": answer}
+        )
         return data["directive"], data["directedPrompt"]
+
+    try:
+        return tuple(await answer_cache.get((answerline, answer), fetch))
+    except APIError:
+        return "error", None
+    finally:
+        CHECK_ANSWER_LATENCY.labels("remote").observe(time.perf_counter() - start)
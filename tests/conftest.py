@@ -0,0 +1,7 @@
+"""Shared test setup: import the bot's modules the way `bot/__main__.py` does."""
+
+import os
+import sys
+
+os.environ.setdefault("TOKEN", "tests")  # lib.consts exits without one
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "bot"))
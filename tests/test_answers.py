@@ -0,0 +1,100 @@
+"""Parity of the local answer checker with qbreader's `/check-answer`."""
+
+import pytest
+from lib.answers import check_answer_locally
+
+# (answerline, given answer, directive returned by qbreader)
+RECORDED = [
+    ("<b><u>Paris</u></b>", "Paris", "accept"),
+    ("<b><u>Paris</u></b>", "paris", "accept"),
+    ("<b><u>Paris</u></b>", "London", "reject"),
+    ("<b><u>Paris</u></b> [accept Paris, Texas]", "Paris", "accept"),
+    ("<b><u>Paris</u></b> [accept Paris, Texas]", "texas", "reject"),
+    ("<b><u>Paris</u></b> [accept Paris, Texas]", "Paris, Texas", "accept"),
+    ("<b><u>Martin Luther King</u></b> [accept Martin Luther King, Jr.]", "jr", "reject"),
+    ("<b><u>Martin Luther King</u></b> [accept Martin Luther King, Jr.]", "MLK", "reject"),
+    (
+        "<b><u>Martin Luther King</u></b> [accept Martin Luther King, Jr.]",
+        "Martin Luther King",
+        "accept",
+    ),
+    (
+        "<b><u>Adams</u></b> [accept John <u>Adams</u>; do not accept John Quincy <u>Adams</u>]",
+        "Adams",
+        "accept",
+    ),
+    (
+        "<b><u>Adams</u></b> [accept John <u>Adams</u>; do not accept John Quincy <u>Adams</u>]",
+        "John Adams",
+        "accept",
+    ),
+    (
+        "<b><u>Adams</u></b> [accept John <u>Adams</u>; do not accept John Quincy <u>Adams</u>]",
+        "John Quincy Adams",
+        "reject",
+    ),
+    ("<b>Franz <u>Kafka</u></b>", "Kafka", "accept"),
+    ("<b>Franz <u>Kafka</u></b>", "Franz Kafka", "accept"),
+    ("<b>Franz <u>Kafka</u></b>", "Kafká", "accept"),
+    ("<b><u>The Great Gatsby</u></b>", "great gatsby", "accept"),
+    ("<b><u>mitochondria</u></b> [or <u>mitochondrion</u>]", "mitochondrion", "accept"),
+    ("<b><u>oxygen</u></b> [or O]", "O", "accept"),
+    (
+        "<b><u>electron</u></b> [prompt on <u>lepton</u>; do not accept or prompt on positron]",
+        "lepton",
+        "prompt",
+    ),
+    (
+        "<b><u>electron</u></b> [prompt on <u>lepton</u>; do not accept or prompt on positron]",
+        "positron",
+        "reject",
+    ),
+    ("<b><u>Iliad</u></b> [prompt on Homer's epic by asking “which one?”]", "Homer", "prompt"),
+    ("<b><u>water</u></b> [accept H<sub>2</sub>O]", "H2O", "accept"),
+    (
+        "<b><u>Washington</u></b> [accept Washington state or Washington, D.C.]",
+        "Washington state",
+        "accept",
+    ),
+    ("<b><u>Washington</u></b> [accept Washington state or Washington, D.C.]", "DC", "reject"),
+]
+
+
+@pytest.mark.parametrize("answerline, answer, remote", RECORDED)
+def test_matches_remote(answerline: str, answer: str, remote: str):
+    """Answers decided locally get the same directive as from qbreader."""
+    local = check_answer_locally(answerline, answer)
+    assert local is None or local == (remote, None)
+
+
+@pytest.mark.parametrize(
+    "answerline, answer",
+    [
+        ("<b><u>Paris</u></b>", "Paris"),
+        ("<b>Franz <u>Kafka</u></b>", "Kafka"),
+        ("<b><u>The Great Gatsby</u></b>", "great gatsby"),
+        ("<b><u>oxygen</u></b> [or O]", "O"),
+        (
+            "<b><u>Adams</u></b> [accept John <u>Adams</u>; "
+            "do not accept John Quincy <u>Adams</u>]",
+            "John Quincy Adams",
+        ),
+    ],
+)
+def test_decides_exact_matches(answerline: str, answer: str):
+    """Exact matches don't need qbreader."""
+    assert check_answer_locally(answerline, answer) is not None
+
+
+@pytest.mark.parametrize(
+    "answerline, answer",
+    [
+        ("<b><u>Paris</u></b> [accept Paris, Texas]", "Paris, Texas"),
+        ("<b><u>Paris</u></b> [prompt on Paris; do not accept Paris]", "Paris"),
+        ("<b><u>Iliad</u></b> [prompt on Homer's epic by asking “which one?”]", "Homer"),
+        ("<b><u>Paris</u></b>", "London"),
+    ],
+)
+def test_leaves_unsure_answers_to_qbreader(answerline: str, answer: str):
+    """Answers that are ambiguous or don't match exactly are checked remotely."""
+    assert check_answer_locally(answerline, answer) is None
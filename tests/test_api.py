@@ -0,0 +1,106 @@
+"""qbreader API client against a local stand-in for qbreader."""
+
+import asyncio
+
+import lib.api
+import pytest
+from aiohttp import web
+from lib.api import APIError, QBReaderClient
+
+
+async def serve(monkeypatch: pytest.MonkeyPatch, routes: dict) -> web.AppRunner:
+    """Serve handlers on localhost and point the client at them."""
+    app = web.Application()
+    for endpoint, handler in routes.items():
+        app.router.add_get(f"/{endpoint}", handler)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", 0).start()
+    host, port = runner.addresses[0][:2]
+    monkeypatch.setattr(lib.api, "QBREADER_API", f"http://{host}:{port}")  # undone after the test
+    return runner
+
+
+def test_client_errors_dont_open_the_circuit_breaker(monkeypatch):
+    """Bad requests fail on their own without blocking qbreader for everyone."""
+
+    async def not_found(request):
+        raise web.HTTPNotFound()
+
+    async def main():
+        runner = await serve(monkeypatch, {"packet": not_found})
+        client = QBReaderClient(failure_threshold=2)
+        try:
+            for _ in range(5):
+                with pytest.raises(APIError, match="failed"):
+                    await client.get("packet", {"setName": "nope", "packetNumber": 1})
+            return client.requests_sent
+        finally:
+            await client.close()
+            await runner.cleanup()
+
+    assert asyncio.run(main()) == 5  # not retried either
+
+
+def test_server_errors_open_the_circuit_breaker(monkeypatch):
+    """Consecutive server errors stop requests from being sent."""
+
+    async def broken(request):
+        raise web.HTTPInternalServerError()
+
+    async def main():
+        runner = await serve(monkeypatch, {"packet": broken})
+        client = QBReaderClient(retries=0, failure_threshold=2)
+        try:
+            for _ in range(2):
+                with pytest.raises(APIError, match="failed"):
+                    await client.get("packet", {"setName": "broken", "packetNumber": 1})
+            with pytest.raises(APIError, match="unavailable"):
+                await client.get("packet", {"setName": "broken", "packetNumber": 1})
+            return client.requests_sent
+        finally:
+            await client.close()
+            await runner.cleanup()
+
+    assert asyncio.run(main()) == 2
+
+
+def test_only_idempotent_requests_are_coalesced(monkeypatch):
+    """Identical answer checks share a request, identical random questions don't."""
+    served = {"random-tossup": 0, "check-answer": 0}
+
+    async def random_tossup(request):
+        served["random-tossup"] += 1
+        tossup = {"id": served["random-tossup"]}
+        await asyncio.sleep(0.05)
+        return web.json_response({"tossups": [tossup]})
+
+    async def check_answer(request):
+        served["check-answer"] += 1
+        await asyncio.sleep(0.05)
+        return web.json_response({"directive": "accept", "directedPrompt": None})
+
+    async def main():
+        runner = await serve(
+            monkeypatch, {"random-tossup": random_tossup, "check-answer": check_answer}
+        )
+        client = QBReaderClient()
+        try:
+            tossups = await asyncio.gather(
+                *(client.get("random-tossup", "categories=Science") for _ in range(5))
+            )
+            await asyncio.gather(
+                *(
+                    client.get("check-answer", {"answerline": "Paris", "givenAnswer": "paris"})
+                    for _ in range(5)
+                )
+            )
+            return tossups, client.requests_coalesced
+        finally:
+            await client.close()
+            await runner.cleanup()
+
+    tossups, coalesced = asyncio.run(main())
+    assert len({tossup["tossups"][0]["id"] for tossup in tossups}) == 5
+    assert served == {"random-tossup": 5, "check-answer": 1}
+    assert coalesced == 4
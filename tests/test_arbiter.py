@@ -0,0 +1,76 @@
+"""Buzz arbitration between players in the same channel."""
+
+import asyncio
+
+from lib.arbiter import BuzzArbiter
+from lib.router import MessageRouter
+
+
+class Channel:
+    """Stand-in for a text channel."""
+
+    id = 1
+
+
+class User:
+    """Stand-in for `discord.User`."""
+
+    def __init__(self, id: int):
+        self.id = id
+
+
+class Message:
+    """Stand-in for `discord.Message`."""
+
+    def __init__(self, id: int, author: User, content: str = "buzz"):
+        self.id = id
+        self.channel = Channel
+        self.author = author
+        self.content = content
+
+
+def test_orders_buzzes_by_snowflake_and_reports_them_on_arrival():
+    """The earliest buzz wins, and every buzz is seen before the grace period ends."""
+
+    async def main():
+        router = MessageRouter()
+        seen = []
+        arbiter = BuzzArbiter(
+            router, Channel, is_buzz=lambda _: True, grace=0.05, on_buzz=seen.append
+        )
+        first = asyncio.create_task(arbiter.next())
+        await asyncio.sleep(0.01)  # let the arbiter start listening
+
+        late, early = Message(20, User(2)), Message(10, User(1))
+        router.dispatch(late)
+        assert seen == [late]  # not after the grace period
+        router.dispatch(early)
+
+        winner = await first
+        arbiter.lock_out(winner.author)
+        return winner, await arbiter.next(), seen
+
+    winner, runner_up, seen = asyncio.run(main())
+    assert (winner.id, runner_up.id) == (10, 20)
+    assert [message.id for message in seen] == [20, 10]
+
+
+def test_locked_out_players_cant_buzz():
+    """Buzzes from locked out players are ignored."""
+
+    async def main():
+        router = MessageRouter()
+        seen = []
+        arbiter = BuzzArbiter(
+            router, Channel, is_buzz=lambda _: True, grace=0.01, on_buzz=seen.append
+        )
+        arbiter.lock_out(User(1))
+        buzz = asyncio.create_task(arbiter.next())
+        await asyncio.sleep(0.01)  # let the arbiter start listening
+        router.dispatch(Message(10, User(1)))
+        router.dispatch(Message(20, User(2)))
+        return await buzz, seen
+
+    buzz, seen = asyncio.run(main())
+    assert buzz.id == 20
+    assert [message.id for message in seen] == [20]
@@ -0,0 +1,85 @@
+"""Message edit scheduling under simulated load."""
+
+import asyncio
+import time
+
+from lib.editor import EditScheduler
+
+RATE = 5
+PER = 0.25  # seconds, 20 times shorter than Discord's window to keep the test quick
+
+
+class Channel:
+    """Stand-in for a text channel."""
+
+    def __init__(self, id: int):
+        self.id = id
+
+
+class Message:
+    """Stand-in for `discord.Message`, recording every edit that reaches the fake HTTP layer."""
+
+    def __init__(self, channel: Channel, id: int, latency: float = 0.005):
+        self.channel = channel
+        self.id = id
+        self.latency = latency
+        self.edits: list[tuple[float, str]] = []
+
+    async def edit(self, content: str) -> None:  # noqa: D102
+        self.edits.append((time.monotonic(), content))
+        await asyncio.sleep(self.latency)
+
+
+def test_coalesces_and_paces_edits_under_load():
+    """Reveals faster than the rate limit are coalesced and sent at a steady pace."""
+
+    async def main():
+        editor = EditScheduler(RATE, PER)
+        messages = [Message(Channel(i), 100 + i) for i in range(20)]
+        futures = []
+
+        for reveal in range(40):  # 4 times faster than the rate limit allows
+            for message in messages:
+                futures.append(editor.edit(message, content=str(reveal)))
+            await asyncio.sleep(PER / RATE / 4)
+
+        await asyncio.gather(*futures)
+        return messages
+
+    messages = asyncio.run(main())
+
+    for message in messages:
+        assert message.edits[-1][1] == "39"  # the latest reveal always makes it
+        assert len(message.edits) < 40 / 2
+
+        contents = [int(content) for _, content in message.edits]
+        assert contents == sorted(contents)
+
+        # once the bucket's initial burst has been used up, edits go out at the rate limit
+        burst = RATE + 1
+        times = [at for at, _ in message.edits[burst:]]
+        gaps = [b - a for a, b in zip(times, times[1:])]
+        assert min(gaps) > PER / RATE * 0.8
+        assert max(gaps) < PER / RATE * 3
+
+
+def test_cancelled_caller_does_not_break_coalesced_edits():
+    """Cancelling one caller's edit leaves the worker and the other coalesced edits running."""
+
+    async def main():
+        editor = EditScheduler(RATE, PER)
+        message = Message(Channel(1), 1, latency=0.05)
+
+        editor.edit(message, content="0")  # being sent while the next two wait
+        await asyncio.sleep(0)
+        cancelled = asyncio.ensure_future(editor.edit(message, content="1"))
+        coalesced = editor.edit(message, content="2")
+        await asyncio.sleep(0)
+        cancelled.cancel()
+
+        await asyncio.wait_for(coalesced, 1)
+        await asyncio.wait_for(editor.edit(message, content="3"), 1)
+        return message
+
+    message = asyncio.run(main())
+    assert [content for _, content in message.edits] == ["0", "2", "3"]
@@ -0,0 +1,54 @@
+"""Question pool refilling in the background."""
+
+import asyncio
+import gc
+
+from lib.api import APIError
+from lib.filters import QuestionFilter
+from lib.pool import QuestionPool
+
+
+class API:
+    """Stand-in for `QBReaderClient` serving numbered tossups, failing on the calls in `fail`."""
+
+    def __init__(self, fail: set[int]):
+        self.fail = fail
+        self.calls = 0
+        self.served = 0
+
+    async def get(self, endpoint, params=None):  # noqa: D102
+        self.calls += 1
+        if self.calls in self.fail:
+            raise APIError("qbreader is unavailable, try again later")
+        number = int(params.rpartition("number=")[2])
+        self.served += number
+        return {"tossups": [{"n": n} for n in range(self.served - number, self.served)]}
+
+
+class Bot:
+    """Stand-in for the bot, only holding its API client."""
+
+    def __init__(self, api: API):
+        self.api = api
+
+
+def test_failed_background_refill_is_retried():
+    """A refill that fails in the background is dropped quietly and retried when needed."""
+
+    async def main():
+        unretrieved = []
+        asyncio.get_running_loop().set_exception_handler(lambda _, c: unretrieved.append(c))
+
+        pool = QuestionPool(Bot(API(fail={2})), "random-tossup", "tossups", size=4)
+        questions = []
+        for _ in range(6):
+            questions.append((await pool.get(QuestionFilter()))["n"])
+            await asyncio.sleep(0.01)  # a question being read
+        pool.close()
+        gc.collect()  # unretrieved exceptions are reported when their task is collected
+        await asyncio.sleep(0)
+        return questions, unretrieved
+
+    questions, unretrieved = asyncio.run(main())
+    assert questions == [0, 1, 2, 3, 4, 5]
+    assert unretrieved == []
@@ -0,0 +1,62 @@
+"""Tossup reveals, checked against the lines the reader used to generate."""
+
+import random
+
+import pytest
+from lib.prepared import reveal_offsets
+
+WORDS = "the this author novel (*) element war king's composer, painting equation".split()
+
+
+def generate_lines(text: str, chunk_size: int, watch_power: bool = True) -> list[str]:
+    """Reveal a tossup the way `Tossup.generate_lines` did before `reveal_offsets`."""
+    words = text.strip().replace("\n", " ").split(" ")
+    chunks = []
+    seen_power = False
+
+    for i in range(0, len(words), chunk_size):
+        next_read = words[: i + chunk_size]
+
+        if watch_power and not seen_power and "(*)" in next_read:
+            if not next_read[-1].endswith("(*)"):
+                power_chunk = next_read[: next_read.index("(*)") + 1]
+                chunks.append(" ".join(power_chunk))
+
+            seen_power = True
+
+        chunks.append(" ".join(next_read))
+
+    return chunks
+
+
+def texts() -> list[str]:
+    """Tossups with the power mark at every position around a chunk boundary, and random ones."""
+    cases = [
+        "In quantum mechanics, the square of this quantity is equal to h-bar...",
+        "no power mark in this one at all",
+        "(*) starts with the power mark",
+        "ends with the power mark (*)",
+        "one",
+        "(*)",
+        "a (*) twice (*) here",
+        "power mark attached like this(*) isn't a word of its own",
+        "double  spaces  stay  as  empty  words (*) too",
+    ]
+    base = [f"w{i}" for i in range(14)]
+    for at in range(len(base) + 1):
+        cases.append(" ".join(base[:at] + ["(*)"] + base[at:]))
+
+    rng = random.Random(0)
+    for _ in range(200):
+        cases.append(" ".join(rng.choices(WORDS, k=rng.randint(1, 60))))
+    return cases
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 5, 7])
+@pytest.mark.parametrize("watch_power", [True, False])
+def test_matches_generate_lines(chunk_size: int, watch_power: bool):
+    """Every reveal is the same line `generate_lines` produced."""
+    for text in texts():
+        expected = generate_lines(text, chunk_size, watch_power)
+        offsets = reveal_offsets(text, chunk_size, watch_power)
+        assert [text[:end] for end in offsets] == expected, text
@@ -0,0 +1,83 @@
+"""Set index shared between processes through its file."""
+
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+from lib.sets import SetIndex, SetInfo
+
+
+class Client:
+    """Stand-in for `QBReaderClient`, counting the requests made through it."""
+
+    def __init__(self, sets: list[str]):
+        self.sets = sets
+        self.requests = 0
+
+    async def get_if_modified(self, endpoint, params=None, validators=None):  # noqa: D102
+        self.requests += 1
+        return {"setList": self.sets}, {"ETag": str(len(self.sets))}
+
+    async def get(self, endpoint, params=None):  # noqa: D102
+        self.requests += 1
+        return {"numPackets": 12}
+
+
+def test_only_the_refreshing_process_makes_requests(tmp_path):
+    """Other processes pick up the index the refreshing one saved without asking qbreader."""
+    path = str(tmp_path / "sets.json")
+
+    async def main():
+        leader_client, follower_client = Client(["2023 ACF Regionals"]), Client([])
+        leader = SetIndex(leader_client, path)
+        follower = SetIndex(follower_client, path, refresh=False, reload_interval=0.01)
+        await follower.start()
+        assert follower.get("2023 ACF Regionals") is None
+
+        await leader.refresh()
+        await asyncio.sleep(0.1)
+        await follower.close()
+        return leader_client.requests, follower_client.requests, follower.get("2023 acf regionals")
+
+    leader_requests, follower_requests, found = asyncio.run(main())
+    assert leader_requests == 2  # the set list and one packet count
+    assert follower_requests == 0
+    assert found == SetInfo("2023 ACF Regionals", 2023, 12)
+
+
+def test_concurrent_saves_dont_clobber_each_other(tmp_path):
+    """Processes saving the index at the same time each write a whole file."""
+    path = tmp_path / "sets.json"
+    indexes = []
+    for n in range(4):
+        index = SetIndex(Client([]), str(path))
+        index._update([SetInfo(f"Set {n} {i}", None, i) for i in range(500)])
+        indexes.append(index)
+
+    with ThreadPoolExecutor(len(indexes)) as pool:
+        for _ in pool.map(lambda index: [index._save() for _ in range(20)], indexes):
+            pass
+
+    assert len(json.loads(path.read_text())["sets"]) == 500
+    assert [p.name for p in tmp_path.iterdir()] == ["sets.json"]  # no temporary files left
+
+
+def test_refresh_errors_dont_stop_refreshing(tmp_path, capsys):
+    """A refresh that fails in an unexpected way is logged and tried again later."""
+
+    class Changed(Client):
+        async def get_if_modified(self, endpoint, params=None, validators=None):  # noqa: D102
+            if self.requests == 0:
+                self.requests += 1
+                return {"sets": self.sets}, {}  # the response changed shape
+            return await super().get_if_modified(endpoint, params, validators)
+
+    async def main():
+        index = SetIndex(Changed(["2023 ACF Regionals"]), str(tmp_path / "sets.json"), 0.01)
+        await index.start()
+        await asyncio.sleep(0.1)
+        await index.close()
+        return index.get("2023 ACF Regionals")
+
+    assert asyncio.run(main()) is not None
+    assert "KeyError: 'setList'" in capsys.readouterr().err
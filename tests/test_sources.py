@@ -0,0 +1,46 @@
+"""Question buffers refilling in the background."""
+
+import asyncio
+import gc
+
+from lib.api import APIError
+from lib.filters import QuestionFilter
+from lib.sources import QuestionBuffer, QuestionSource
+
+
+class Source(QuestionSource):
+    """Numbered questions, failing on the calls listed in `fail`."""
+
+    def __init__(self, fail: set[int]):
+        self.fail = fail
+        self.calls = 0
+        self.served = 0
+
+    async def get_many(self, filters, number):  # noqa: D102
+        self.calls += 1
+        if self.calls in self.fail:
+            raise APIError("qbreader is unavailable, try again later")
+        self.served += number
+        return [{"n": n} for n in range(self.served - number, self.served)]
+
+
+def test_failed_background_fill_is_retried():
+    """A refill that fails in the background is dropped quietly and retried when needed."""
+
+    async def main():
+        unretrieved = []
+        asyncio.get_running_loop().set_exception_handler(lambda _, c: unretrieved.append(c))
+
+        buffer = QuestionBuffer(Source(fail={2}), QuestionFilter(), size=4)
+        questions = []
+        for _ in range(6):
+            questions.append((await buffer.next())["n"])
+            await asyncio.sleep(0.01)  # a question being read
+        buffer.close()
+        gc.collect()  # unretrieved exceptions are reported when their task is collected
+        await asyncio.sleep(0)
+        return questions, unretrieved
+
+    questions, unretrieved = asyncio.run(main())
+    assert questions == [0, 1, 2, 3, 4, 5]
+    assert unretrieved == []